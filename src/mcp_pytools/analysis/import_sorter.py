@@ -0,0 +1,320 @@
+# src/mcp_pytools/analysis/import_sorter.py
+
+import ast
+import dataclasses
+import re
+import sys
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from mcp_pytools.astutils.parser import ParsedModule
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+# Import sections, in output order.
+FUTURE, STDLIB, THIRD_PARTY, FIRST_PARTY, LOCAL = range(5)
+
+_SKIP_FILE_DIRECTIVES = ("isort: skip_file", "isort: off")
+
+
+@dataclasses.dataclass
+class SortSettings:
+    """Settings of the import sorter, matching ruff's isort defaults."""
+
+    line_length: int = 88
+    # Directories whose modules and packages are first-party
+    source_roots: Tuple[Path, ...] = ()
+    known_first_party: FrozenSet[str] = frozenset()
+    known_third_party: FrozenSet[str] = frozenset()
+    _source_matches: Dict[str, bool] = dataclasses.field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_project(cls, root: Path) -> "SortSettings":
+        """Reads the settings from the ruff configuration in pyproject.toml.
+
+        Args:
+            root: The project root directory.
+
+        Returns:
+            The settings, with ruff's defaults for anything not configured.
+        """
+        ruff: dict = {}
+        config_path = root / "pyproject.toml"
+        if tomllib is not None and config_path.is_file():
+            try:
+                with open(config_path, "rb") as f:
+                    ruff = tomllib.load(f).get("tool", {}).get("ruff", {})
+            except (OSError, tomllib.TOMLDecodeError):
+                ruff = {}
+        isort = ruff.get("lint", {}).get("isort", ruff.get("isort", {}))
+        return cls(
+            line_length=ruff.get("line-length", 88),
+            source_roots=tuple(root / src for src in ruff.get("src", [".", "src"])),
+            known_first_party=frozenset(isort.get("known-first-party", [])),
+            known_third_party=frozenset(isort.get("known-third-party", [])),
+        )
+
+    def section(self, module: str, level: int, package: Optional[str] = None) -> int:
+        """Classifies an imported module into its section.
+
+        Args:
+            module: The dotted module name, without leading dots.
+            level: The number of leading dots of a relative import.
+            package: The top-level package of the importing file, if any.
+
+        Returns:
+            One of the section constants.
+        """
+        if level:
+            return LOCAL
+        top = module.split(".")[0]
+        if top == "__future__":
+            return FUTURE
+        if _matches_known(module, self.known_first_party):
+            return FIRST_PARTY
+        if _matches_known(module, self.known_third_party):
+            return THIRD_PARTY
+        if top in sys.stdlib_module_names:
+            return STDLIB
+        if top == package or self._in_sources(module):
+            return FIRST_PARTY
+        return THIRD_PARTY
+
+    def _in_sources(self, module: str) -> bool:
+        matched = self._source_matches.get(module)
+        if matched is None:
+            parts = module.split(".")
+            matched = any(
+                root.joinpath(*parts).is_dir()
+                or root.joinpath(*parts[:-1], parts[-1] + ".py").is_file()
+                for root in self.source_roots
+            )
+            self._source_matches[module] = matched
+        return matched
+
+
+def sort_imports(module: ParsedModule, settings: Optional[SortSettings] = None) -> str:
+    """Sorts the import blocks of a module like isort, as configured in ruff.
+
+    Every run of consecutive import statements is sorted on its own: imports
+    are grouped into future, standard library, third-party, first-party and
+    relative sections, `import a, b` is split, duplicates are dropped and
+    `from` imports of the same module are merged and wrapped to the line
+    length. Blocks that contain comments, or share lines with other
+    statements, are left as they are; that includes imports joined by
+    semicolons, which ruff reports but does not fix either. A semicolon
+    ending an import is dropped, and a block ending the file gets a final
+    newline.
+
+    Args:
+        module: The parsed module.
+        settings: The sorter settings. Defaults to ruff's defaults.
+
+    Returns:
+        The text of the module with sorted imports.
+    """
+    settings = settings or SortSettings()
+    text = module.text
+    if "\r" in text.replace("\r\n", "") or any(d in text for d in _SKIP_FILE_DIRECTIVES):
+        return text
+
+    lines = text.split("\n")
+    eol = "\r" if lines[0].endswith("\r") else ""
+    package = _top_level_package(module.uri)
+
+    replacements = []
+    for body, top_level in _statement_lists(module.tree):
+        for start, end in _import_runs(body):
+            block = body[start:end]
+            first, last = block[0].lineno - 1, block[-1].end_lineno - 1
+            indent = lines[first][: block[0].col_offset]
+            if not _is_plain_block(block, lines, indent):
+                continue
+            new_lines = _render_block(block, lines, indent, settings, package)
+            if top_level and end < len(body):
+                # Normalize the blank lines between the block and the next statement
+                next_line = last + 1
+                while next_line < len(lines) and not lines[next_line].strip():
+                    next_line += 1
+                blank = 2 if isinstance(body[end], _DEFINITIONS) else 1
+                new_lines += [""] * blank
+                last = next_line - 1
+            replacements.append((first, last, new_lines))
+
+    # Like isort, the last line of a rewritten block ends with a line break
+    ends_file = lines[-1] != "" and any(last == len(lines) - 1 for _, last, _ in replacements)
+    for first, last, new_lines in sorted(replacements, reverse=True):
+        lines[first:last + 1] = [line + eol for line in new_lines]
+    if ends_file:
+        lines.append("")
+    return "\n".join(lines)
+
+
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _statement_lists(tree: ast.AST):
+    """Yields every list of statements in a tree, and whether it is the module's."""
+    yield tree.body, True
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            value = getattr(node, field, None)
+            if node is not tree and isinstance(value, list) and value:
+                if isinstance(value[0], ast.stmt):
+                    yield value, False
+
+
+def _import_runs(body: List[ast.stmt]):
+    """Yields the (start, end) slices of consecutive import statements."""
+    start = None
+    for i, stmt in enumerate(body + [None]):
+        if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            if start is None:
+                start = i
+        elif start is not None:
+            yield start, i
+            start = None
+
+
+def _is_plain_block(block: List[ast.stmt], lines: List[str], indent: str) -> bool:
+    """Checks that a block has no comments and no statements sharing its lines."""
+    if indent.strip():
+        return False
+    covered = set()
+    for stmt in block:
+        first, last = stmt.lineno - 1, stmt.end_lineno - 1
+        if first in covered:
+            # Joined to the previous import by a semicolon
+            return False
+        if lines[first][: stmt.col_offset] != indent:
+            return False
+        # Import statements contain no strings, so any '#' starts a comment
+        if any("#" in lines[i] for i in range(first, last + 1)):
+            return False
+        rest = lines[last].encode("utf-8")[stmt.end_col_offset:]
+        if rest.strip() not in (b"", b";"):
+            return False
+        covered.update(range(first, last + 1))
+    start, end = block[0].lineno - 1, block[-1].end_lineno - 1
+    return all(lines[i].strip() == "" for i in range(start, end + 1) if i not in covered)
+
+
+@dataclasses.dataclass
+class _FromImport:
+    names: Set[Tuple[str, Optional[str]]] = dataclasses.field(default_factory=set)
+    # Names from statements ending with a trailing comma, which stay wrapped
+    wrapped: Set[Tuple[str, Optional[str]]] = dataclasses.field(default_factory=set)
+
+
+def _render_block(
+    block: List[ast.stmt],
+    lines: List[str],
+    indent: str,
+    settings: SortSettings,
+    package: Optional[str],
+) -> List[str]:
+    straight: Dict[int, Set[Tuple[str, Optional[str]]]] = {}
+    from_imports: Dict[int, Dict[Tuple[int, str], _FromImport]] = {}
+    for stmt in block:
+        if isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                section = settings.section(alias.name, 0, package)
+                straight.setdefault(section, set()).add((alias.name, alias.asname))
+            continue
+        module = stmt.module or ""
+        section = settings.section(module, stmt.level, package)
+        entry = from_imports.setdefault(section, {}).setdefault(
+            (stmt.level, module), _FromImport()
+        )
+        names = [(alias.name, alias.asname) for alias in stmt.names]
+        entry.names.update(names)
+        source = "".join(lines[stmt.lineno - 1: stmt.end_lineno])
+        if re.search(r",\s*\)\s*$", source):
+            entry.wrapped.update(names)
+
+    output: List[str] = []
+    for section in sorted(set(straight) | set(from_imports)):
+        if output:
+            output.append("")
+        for name, asname in sorted(straight.get(section, ()), key=_straight_key):
+            output.append(f"{indent}import {_alias(name, asname)}")
+
+        statements = []
+        for (level, module), entry in from_imports.get(section, {}).items():
+            prefix = "." * level + module
+            plain = sorted(
+                (n for n in entry.names if n[1] is None and n[0] != "*"), key=_member_key
+            )
+            groups = [[n] for n in entry.names if n[1] is not None or n[0] == "*"]
+            if plain:
+                groups.append(plain)
+            for names in groups:
+                wrap = not entry.wrapped.isdisjoint(names)
+                module_key = (-level, _natural(module.lower()), _natural(module))
+                statements.append(
+                    ((module_key, _member_key(names[0])), prefix, names, wrap)
+                )
+        for _, prefix, names, wrap in sorted(statements, key=lambda s: s[0]):
+            output.extend(_format_from(indent, prefix, names, wrap, settings.line_length))
+    return output
+
+
+def _format_from(
+    indent: str, prefix: str, names: List[Tuple[str, Optional[str]]], wrap: bool, line_length: int
+) -> List[str]:
+    aliases = [_alias(name, asname) for name, asname in names]
+    line = f"{indent}from {prefix} import {', '.join(aliases)}"
+    if not wrap and len(line) <= line_length:
+        return [line]
+    return (
+        [f"{indent}from {prefix} import ("]
+        + [f"{indent}    {alias}," for alias in aliases]
+        + [f"{indent})"]
+    )
+
+
+def _alias(name: str, asname: Optional[str]) -> str:
+    return f"{name} as {asname}" if asname else name
+
+
+def _natural(value: str) -> list:
+    """A sort key comparing runs of digits by their numeric value."""
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", value)]
+
+
+def _straight_key(name: Tuple[str, Optional[str]]):
+    module, asname = name
+    return _natural(module.lower()), _natural(module), asname or ""
+
+
+def _member_key(name: Tuple[str, Optional[str]]):
+    """Orders constants, then classes, then other names, case-insensitively."""
+    member, asname = name
+    if member == "*":
+        member_type = 0
+    elif len(member) > 1 and member.isupper():
+        member_type = 1
+    elif member[:1].isupper():
+        member_type = 2
+    else:
+        member_type = 3
+    return member_type, _natural(member.lower()), _natural(member), asname or ""
+
+
+def _matches_known(module: str, known: FrozenSet[str]) -> bool:
+    return any(module == name or module.startswith(name + ".") for name in known)
+
+
+def _top_level_package(uri: str) -> Optional[str]:
+    """Returns the name of the outermost package containing a file, if any."""
+    if not uri.startswith("file://"):
+        return None
+    package = None
+    directory = Path(uri[7:]).parent
+    while (directory / "__init__.py").is_file():
+        package = directory.name
+        directory = directory.parent
+    return package
@@ -0,0 +1,450 @@
+# src/mcp_pytools/analysis/rename.py
+
+import ast
+import dataclasses
+import keyword
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from mcp_pytools.analysis.scopes import BindingKey, ModuleScopes, Scope, analyze_scopes
+from mcp_pytools.astutils.incremental import TextEdit
+from mcp_pytools.astutils.parser import Position, Range
+
+# A definition: the URI of a module and the binding in it.
+Definition = Tuple[str, BindingKey]
+
+# What an expression refers to: ("def", uri, binding) or ("module", dotted name).
+Resolved = Tuple[Any, ...]
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+_MAX_IMPORT_DEPTH = 16
+
+
+class RenameError(Exception):
+    """Raised when a rename cannot be planned."""
+
+
+@dataclasses.dataclass
+class WorkspaceEdit:
+    """Text edits to several documents, like an LSP WorkspaceEdit.
+
+    Positions are 0-indexed lines and character offsets within the line.
+    """
+
+    changes: Dict[str, List[TextEdit]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "changes": {
+                uri: [{"range": e.range.to_dict(), "newText": e.new_text} for e in edits]
+                for uri, edits in sorted(self.changes.items())
+            }
+        }
+
+    def apply(self, uri: str, text: str) -> str:
+        """Applies the edits of one document to its text."""
+        line_starts = [0] + [m.end() for m in _LINE_BREAK.finditer(text)]
+
+        def offset(position: Position) -> int:
+            if position.line >= len(line_starts):
+                return len(text)
+            return line_starts[position.line] + position.column
+
+        for edit in sorted(
+            self.changes.get(uri, []),
+            key=lambda e: (e.range.start.line, e.range.start.column),
+            reverse=True,
+        ):
+            start, end = offset(edit.range.start), offset(edit.range.end)
+            text = text[:start] + edit.new_text + text[end:]
+        return text
+
+
+@dataclasses.dataclass
+class RenamePlan:
+    """The edits of a rename and the references that could not be resolved."""
+
+    definition: Definition
+    edit: WorkspaceEdit
+    # Attribute accesses with the old name on receivers of unknown type.
+    unresolved: List[Tuple[str, Range]]
+    # The analyzed text of each edited document, which its edits apply to.
+    texts: Dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+class RenameEngine:
+    """Plans scope-aware renames across an indexed project.
+
+    Names are resolved to the binding they refer to with `analyze_scopes`,
+    and followed across modules through imports, re-exports and attribute
+    accesses on imported modules. Class members are renamed where the
+    receiver is known to be the class, a subclass, or an instance created
+    in the same scope; other accesses with the same name are reported as
+    unresolved instead of being edited. Only files whose text contains the
+    name, according to the index's identifier postings, are analyzed.
+    """
+
+    def __init__(self, index: Any):
+        self.index = index
+        self._analyses: Dict[str, Optional[ModuleScopes]] = {}
+        self._module_uris: Dict[str, str] = {}
+        self._module_names: Dict[str, Tuple[str, bool]] = {}
+        for uri in index.get_all_uris():
+            self._add_module(uri)
+
+    def analysis(self, uri: str) -> Optional[ModuleScopes]:
+        """Returns the scope analysis of an indexed module."""
+        if uri not in self._analyses:
+            module = self.index.modules.get(uri)
+            self._analyses[uri] = analyze_scopes(module) if module is not None else None
+        return self._analyses[uri]
+
+    def definition_at(self, uri: str, position: Position) -> Definition:
+        """Finds the definition of the name at a position.
+
+        Raises:
+            RenameError: If there is no name at the position, or it does not
+                refer to a definition in the project.
+        """
+        analysis = self._require_analysis(uri)
+        for binding_import in analysis.imports.values():
+            if binding_import.member_range and _contains(binding_import.member_range, position):
+                return self._definition_of(uri, binding_import.binding)
+        for occurrence in analysis.occurrences:
+            if _contains(occurrence.range, position):
+                return self._definition_of(uri, occurrence.binding)
+        for attribute in analysis.attributes:
+            if _contains(attribute.range, position):
+                return self._attribute_definition(uri, analysis, attribute.node, attribute.scope)
+        raise RenameError(f"No symbol found at {position.line}:{position.column} in {uri}")
+
+    def definition_named(self, name: str, uri: Optional[str] = None) -> Definition:
+        """Finds the definition of a name, preferring one in the given module.
+
+        Raises:
+            RenameError: If the name is not defined in the project, or is
+                defined in several places and no module was given.
+        """
+        if uri is not None:
+            analysis = self._require_analysis(uri)
+            definitions = sorted(
+                (o for o in analysis.occurrences if o.name == name and o.is_definition),
+                key=lambda o: (len(o.binding.scope), o.range.start.line, o.range.start.column),
+            )
+            if definitions:
+                return self._definition_of(uri, definitions[0].binding)
+
+        found = set()
+        for candidate in self.index.uris_with_identifier(name):
+            analysis = self.analysis(candidate)
+            if analysis is None:
+                continue
+            for occurrence in analysis.occurrences:
+                binding = occurrence.binding
+                if (
+                    occurrence.name == name
+                    and occurrence.is_definition
+                    and binding not in analysis.imports
+                    and (not binding.scope or binding.scope in analysis.class_bindings)
+                ):
+                    found.add((candidate, binding))
+        if not found:
+            raise RenameError(f"No definition found for '{name}'")
+        if len(found) > 1:
+            uris = ", ".join(sorted({u for u, _ in found}))
+            raise RenameError(
+                f"'{name}' is defined in several places ({uris}); pass a URI and a position"
+            )
+        return found.pop()
+
+    def plan(self, definition: Definition, new_name: str) -> RenamePlan:
+        """Computes the edits renaming a definition and all its references.
+
+        Raises:
+            RenameError: If the new name is not a valid identifier.
+        """
+        if not new_name.isidentifier() or keyword.iskeyword(new_name):
+            raise RenameError(f"'{new_name}' is not a valid identifier")
+
+        uri, binding = definition
+        name = binding.name
+        edits: Dict[str, Dict[Tuple[int, int], TextEdit]] = {}
+        unresolved: List[Tuple[str, Range]] = []
+
+        def add(edit_uri: str, range_: Range):
+            key = (range_.start.line, range_.start.column)
+            edits.setdefault(edit_uri, {})[key] = TextEdit(range=range_, new_text=new_name)
+
+        target = ("def", uri, binding)
+        analysis = self._require_analysis(uri)
+        for occurrence in analysis.occurrences_of(binding):
+            add(uri, occurrence.range)
+
+        candidates = self.index.uris_with_identifier(name)
+        if not binding.scope:
+            for candidate in candidates:
+                self._add_module_references(candidate, name, target, add)
+        elif binding.scope in analysis.class_bindings:
+            class_def = ("def", uri, analysis.class_bindings[binding.scope])
+            for candidate in candidates:
+                self._add_member_references(candidate, name, class_def, add, unresolved)
+
+        changes = {
+            edit_uri: sorted(
+                by_position.values(), key=lambda e: (e.range.start.line, e.range.start.column)
+            )
+            for edit_uri, by_position in edits.items()
+        }
+        texts = {edit_uri: self.index.modules.text(edit_uri) for edit_uri in changes}
+        return RenamePlan(
+            definition=definition,
+            edit=WorkspaceEdit(changes),
+            unresolved=unresolved,
+            texts=texts,
+        )
+
+    # References
+
+    def _add_module_references(self, uri: str, name: str, target: Resolved, add):
+        """Adds the references to a module-level definition made from a module."""
+        analysis = self.analysis(uri)
+        if analysis is None:
+            return
+        for binding_import in analysis.imports.values():
+            if binding_import.member != name:
+                continue
+            if self.resolve_binding(uri, binding_import.binding) != target:
+                continue
+            add(uri, binding_import.member_range)
+            if binding_import.binding.name == name:
+                for occurrence in analysis.occurrences_of(binding_import.binding):
+                    add(uri, occurrence.range)
+
+        module_binding = BindingKey((), name)
+        if (
+            (uri, module_binding) != target[1:]
+            and analysis.star_imports
+            and not analysis.binds_at_module_level(name)
+            and self.resolve_binding(uri, module_binding) == target
+        ):
+            for occurrence in analysis.occurrences_of(module_binding):
+                add(uri, occurrence.range)
+
+        for attribute in analysis.attributes:
+            if attribute.node.attr == name:
+                if self.resolve_expr(uri, attribute.node, attribute.scope) == target:
+                    add(uri, attribute.range)
+
+    def _add_member_references(
+        self, uri: str, name: str, class_def: Resolved, add, unresolved: List
+    ):
+        """Adds the references to a class member made from a module."""
+        analysis = self.analysis(uri)
+        if analysis is None:
+            return
+        # Overrides in subclasses are renamed with the member
+        for class_binding, class_scope in analysis.class_scopes.items():
+            if ("def", uri, class_binding) != class_def and self._is_subclass(
+                ("def", uri, class_binding), class_def
+            ):
+                for occurrence in analysis.occurrences_of(BindingKey(class_scope, name)):
+                    add(uri, occurrence.range)
+
+        for attribute in analysis.attributes:
+            if attribute.node.attr != name:
+                continue
+            receiver = self.receiver_type(uri, attribute.node.value, attribute.scope)
+            if receiver is None:
+                unresolved.append((uri, attribute.range))
+            elif receiver[0] == "def" and self._is_subclass(receiver, class_def):
+                add(uri, attribute.range)
+
+    # Resolution
+
+    def resolve_binding(self, uri: str, binding: BindingKey, depth: int = 0) -> Optional[Resolved]:
+        """Follows a binding through imports to what it refers to.
+
+        Returns:
+            ("def", uri, binding) for a definition in the project,
+            ("module", name) for a module, or None for builtins and names
+            defined outside the project.
+        """
+        analysis = self.analysis(uri)
+        if analysis is None or depth > _MAX_IMPORT_DEPTH:
+            return None
+        binding_import = analysis.imports.get(binding)
+        if binding_import is None:
+            if binding.scope or analysis.binds_at_module_level(binding.name):
+                return ("def", uri, binding)
+            for module, level in analysis.star_imports:
+                star_uri = self._module_uris.get(self._absolute(uri, module, level) or "")
+                if star_uri is not None:
+                    resolved = self.resolve_binding(star_uri, binding, depth + 1)
+                    if resolved is not None:
+                        return resolved
+            return None
+
+        module = self._absolute(uri, binding_import.module, binding_import.level)
+        if module is None:
+            return None
+        if binding_import.member is None:
+            return ("module", module)
+        submodule = f"{module}.{binding_import.member}" if module else binding_import.member
+        if submodule in self._module_uris:
+            return ("module", submodule)
+        module_uri = self._module_uris.get(module)
+        if module_uri is None:
+            return None
+        return self.resolve_binding(module_uri, BindingKey((), binding_import.member), depth + 1)
+
+    def resolve_expr(self, uri: str, expr: ast.expr, scope: Scope) -> Optional[Resolved]:
+        """Resolves a name or a dotted attribute chain on modules."""
+        if isinstance(expr, ast.Name):
+            return self.resolve_binding(uri, scope.resolve(expr.id))
+        if isinstance(expr, ast.Attribute):
+            base = self.resolve_expr(uri, expr.value, scope)
+            if base is not None and base[0] == "module":
+                submodule = f"{base[1]}.{expr.attr}"
+                if submodule in self._module_uris:
+                    return ("module", submodule)
+                module_uri = self._module_uris.get(base[1])
+                if module_uri is not None:
+                    return self.resolve_binding(module_uri, BindingKey((), expr.attr))
+        return None
+
+    def receiver_type(self, uri: str, expr: ast.expr, scope: Scope) -> Optional[Resolved]:
+        """Determines the class or module an attribute is accessed on.
+
+        Returns:
+            ("def", uri, binding) of the class, for the class itself or an
+            instance of it, ("module", name) for a module, ("other",) for
+            anything else known, or None if unknown.
+        """
+        analysis = self.analysis(uri)
+        if isinstance(expr, ast.Name):
+            binding = scope.resolve(expr.id)
+            class_scope = analysis.self_bindings.get(binding)
+            if class_scope is not None:
+                return ("def", uri, analysis.class_bindings[class_scope])
+            resolved = self.resolve_binding(uri, binding)
+            if resolved is not None and (resolved[0] == "module" or self._is_class(resolved)):
+                return resolved
+            calls = analysis.call_assignments.get(binding, [])
+            if calls and len(calls) == analysis.stores.get(binding, 0):
+                classes = {self.resolve_expr(uri, func, call_scope) for func, call_scope in calls}
+                if len(classes) == 1:
+                    resolved = classes.pop()
+                    if resolved is not None and self._is_class(resolved):
+                        return resolved
+            return None
+        resolved = self.resolve_expr(uri, expr, scope)
+        if resolved is not None and (resolved[0] == "module" or self._is_class(resolved)):
+            return resolved
+        if isinstance(expr, (ast.Constant, ast.JoinedStr, ast.List, ast.Dict, ast.Set, ast.Tuple)):
+            return ("other",)
+        return None
+
+    # Helpers
+
+    def _definition_of(self, uri: str, binding: BindingKey) -> Definition:
+        resolved = self.resolve_binding(uri, binding)
+        if resolved is None:
+            raise RenameError(f"'{binding.name}' is not defined in the project")
+        if resolved[0] == "module":
+            raise RenameError(f"Renaming modules is not supported: '{resolved[1]}'")
+        return resolved[1], resolved[2]
+
+    def _attribute_definition(
+        self, uri: str, analysis: ModuleScopes, node: ast.Attribute, scope: Scope
+    ) -> Definition:
+        resolved = self.resolve_expr(uri, node, scope)
+        if resolved is not None and resolved[0] == "def":
+            return resolved[1], resolved[2]
+        receiver = self.receiver_type(uri, node.value, scope)
+        if receiver is None or receiver[0] != "def":
+            raise RenameError(f"Cannot determine what '{node.attr}' refers to")
+        # The member may be defined in a base class
+        class_def = receiver
+        for _ in range(_MAX_IMPORT_DEPTH):
+            class_uri, class_binding = class_def[1], class_def[2]
+            class_analysis = self.analysis(class_uri)
+            class_scope = class_analysis.class_scopes[class_binding]
+            member = BindingKey(class_scope, node.attr)
+            if class_analysis.occurrences_of(member):
+                return class_uri, member
+            bases = [b for b in self._bases(class_def) if b is not None]
+            if not bases:
+                break
+            class_def = bases[0]
+        class_analysis = self.analysis(receiver[1])
+        return receiver[1], BindingKey(class_analysis.class_scopes[receiver[2]], node.attr)
+
+    def _is_class(self, resolved: Resolved) -> bool:
+        if resolved[0] != "def":
+            return False
+        analysis = self.analysis(resolved[1])
+        return analysis is not None and resolved[2] in analysis.class_scopes
+
+    def _bases(self, class_def: Resolved) -> List[Optional[Resolved]]:
+        uri, binding = class_def[1], class_def[2]
+        analysis = self.analysis(uri)
+        class_scope = analysis.class_scopes[binding]
+        node = analysis.class_nodes[class_scope]
+        enclosing = analysis.scopes[class_scope[:-1]]
+        bases = [self.resolve_expr(uri, base, enclosing) for base in node.bases]
+        return [b if b is not None and self._is_class(b) else None for b in bases]
+
+    def _is_subclass(self, class_def: Resolved, base: Resolved, depth: int = 0) -> bool:
+        if class_def == base:
+            return True
+        if depth > _MAX_IMPORT_DEPTH or not self._is_class(class_def):
+            return False
+        return any(
+            parent is not None and self._is_subclass(parent, base, depth + 1)
+            for parent in self._bases(class_def)
+        )
+
+    def _require_analysis(self, uri: str) -> ModuleScopes:
+        analysis = self.analysis(uri)
+        if analysis is None:
+            raise RenameError(f"Module not indexed: {uri}")
+        return analysis
+
+    def _add_module(self, uri: str):
+        if not uri.startswith("file://") or not uri.endswith(".py"):
+            return
+        path = Path(uri[7:])
+        for root in (self.index.root / "src", self.index.root):
+            try:
+                relative = path.relative_to(root)
+            except ValueError:
+                continue
+            parts = list(relative.with_suffix("").parts)
+            is_package = parts[-1] == "__init__"
+            if is_package:
+                parts.pop()
+            if parts:
+                dotted = ".".join(parts)
+                self._module_uris.setdefault(dotted, uri)
+                self._module_names.setdefault(uri, (dotted, is_package))
+
+    def _absolute(self, uri: str, module: str, level: int) -> Optional[str]:
+        """Resolves a relative import to an absolute module name."""
+        if not level:
+            return module
+        name, is_package = self._module_names.get(uri, ("", False))
+        parts = name.split(".") if name else []
+        if not is_package:
+            parts = parts[:-1]
+        if level - 1 > len(parts):
+            return None
+        parts = parts[: len(parts) - (level - 1)]
+        if module:
+            parts.append(module)
+        return ".".join(parts)
+
+
+def _contains(range_: Range, position: Position) -> bool:
+    start, end = range_.start, range_.end
+    return (start.line, start.column) <= (position.line, position.column) <= (end.line, end.column)
@@ -0,0 +1,443 @@
+# src/mcp_pytools/analysis/scopes.py
+
+import ast
+import dataclasses
+import io
+import re
+import symtable
+import tokenize
+from typing import Dict, List, Optional, Tuple
+
+from mcp_pytools.astutils.parser import ParsedModule, Position, Range
+
+# The path of a scope from the module scope, which is ().
+ScopeKey = Tuple[str, ...]
+
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+_COMPREHENSIONS = {
+    ast.ListComp: "listcomp",
+    ast.SetComp: "setcomp",
+    ast.DictComp: "dictcomp",
+    ast.GeneratorExp: "genexpr",
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class BindingKey:
+    """Identifies a name bound in one scope of a module."""
+
+    scope: ScopeKey
+    name: str
+
+
+@dataclasses.dataclass
+class Occurrence:
+    """A use or definition of a name, with the exact range of its token.
+
+    Ranges of occurrences use character columns, not UTF-8 byte offsets.
+    """
+
+    name: str
+    range: Range
+    binding: BindingKey
+    is_definition: bool = False
+
+
+@dataclasses.dataclass
+class AttributeOccurrence:
+    """An `obj.attr` expression, with the range of the attribute name token."""
+
+    node: ast.Attribute
+    range: Range
+    scope: "Scope"
+
+
+@dataclasses.dataclass
+class ImportBinding:
+    """A name bound by an import statement."""
+
+    binding: BindingKey
+    # The imported module, without the leading dots of relative imports.
+    module: str
+    level: int
+    # The imported name and its token, for `from` imports.
+    member: Optional[str] = None
+    member_range: Optional[Range] = None
+
+
+class Scope:
+    """A scope of a module, backed by its `symtable` entry."""
+
+    def __init__(
+        self,
+        key: ScopeKey,
+        kind: str,
+        table: Optional[symtable.SymbolTable],
+        parent: Optional["Scope"],
+    ):
+        self.key = key
+        # "module", "class" or "function" (which includes lambdas and comprehensions)
+        self.kind = kind
+        self.table = table
+        self.parent = parent
+        self._children: Dict[Tuple[str, int], List[symtable.SymbolTable]] = {}
+        if table is not None:
+            for child in table.get_children():
+                child_key = (child.get_name().strip("<>"), child.get_lineno())
+                self._children.setdefault(child_key, []).append(child)
+
+    def resolve(self, name: str) -> BindingKey:
+        """Finds the binding a name refers to from this scope.
+
+        Names that are not bound in any enclosing function scope resolve to
+        the module scope, even if the module does not bind them (builtins).
+        """
+        if self.table is None:
+            return self.parent.resolve(name) if self.parent else BindingKey((), name)
+        symbol = self._lookup(name)
+        if self.kind == "module" or symbol is None or symbol.is_global():
+            return BindingKey((), name)
+        if symbol.is_free():
+            scope = self.parent
+            while scope is not None and scope.kind != "module":
+                if scope.kind != "class" and scope.table is not None:
+                    enclosing = scope._lookup(name)
+                    if enclosing is not None and enclosing.is_local() and not enclosing.is_free():
+                        return BindingKey(scope.key, name)
+                scope = scope.parent
+            return BindingKey((), name)
+        return BindingKey(self.key, name)
+
+    def take_child(self, name: str, lineno: int) -> Optional[symtable.SymbolTable]:
+        """Returns the next unclaimed child table with a name and line."""
+        children = self._children.get((name, lineno))
+        return children.pop(0) if children else None
+
+    def _lookup(self, name: str) -> Optional[symtable.Symbol]:
+        try:
+            return self.table.lookup(name)
+        except KeyError:
+            return None
+
+
+@dataclasses.dataclass
+class ModuleScopes:
+    """The scopes of a module and every name occurrence resolved to its binding."""
+
+    module: ParsedModule
+    scopes: Dict[ScopeKey, Scope]
+    occurrences: List[Occurrence]
+    attributes: List[AttributeOccurrence]
+    imports: Dict[BindingKey, ImportBinding]
+    # (module, level) of `from module import *` statements
+    star_imports: List[Tuple[str, int]]
+    # The binding of each class to the key of its body scope, and back
+    class_scopes: Dict[BindingKey, ScopeKey]
+    class_bindings: Dict[ScopeKey, BindingKey]
+    class_nodes: Dict[ScopeKey, ast.ClassDef]
+    # The first parameter of methods (`self` or `cls`) to their class scope
+    self_bindings: Dict[BindingKey, ScopeKey]
+    # The callee of every `name = callee(...)` assignment, with its scope
+    call_assignments: Dict[BindingKey, List[Tuple[ast.expr, Scope]]]
+    # The number of assignments to each binding
+    stores: Dict[BindingKey, int]
+
+    def occurrences_of(self, binding: BindingKey) -> List[Occurrence]:
+        """Returns the occurrences of a binding."""
+        return [o for o in self.occurrences if o.binding == binding]
+
+    def binds_at_module_level(self, name: str) -> bool:
+        """Whether the module itself defines or imports a name."""
+        key = BindingKey((), name)
+        return any(o.binding == key and o.is_definition for o in self.occurrences)
+
+
+def analyze_scopes(module: ParsedModule) -> ModuleScopes:
+    """Resolves every name in a module to the scope that binds it.
+
+    Scopes are classified with the standard library's `symtable`, so the
+    result follows Python's own rules for locals, globals, closures, class
+    bodies and comprehensions. Token ranges are found with `tokenize`.
+
+    Args:
+        module: The parsed module.
+
+    Returns:
+        The scopes and occurrences of the module.
+    """
+    try:
+        table = symtable.symtable(module.text, module.uri, "exec")
+    except SyntaxError:
+        table = None
+    walker = _ScopeWalker(module, table)
+    walker.visit(module.tree)
+    return walker.result
+
+
+class _ScopeWalker(ast.NodeVisitor):
+    """Visits a module in the order `symtable` creates scopes."""
+
+    def __init__(self, module: ParsedModule, table: Optional[symtable.SymbolTable]):
+        self.scope = Scope((), "module", table, None)
+        self.lines = _LINE_BREAK.split(module.text)
+        self.names = _name_tokens(module.text)
+        self.result = ModuleScopes(
+            module=module,
+            scopes={(): self.scope},
+            occurrences=[],
+            attributes=[],
+            imports={},
+            star_imports=[],
+            class_scopes={},
+            class_bindings={},
+            class_nodes={},
+            self_bindings={},
+            call_assignments={},
+            stores={},
+        )
+
+    # Scopes
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        args = node.args
+        self._visit_all(args.defaults)
+        self._visit_all([d for d in args.kw_defaults if d is not None])
+        for arg in _all_args(args):
+            if arg.annotation is not None:
+                self.visit(arg.annotation)
+        if node.returns is not None:
+            self.visit(node.returns)
+        self._visit_all(node.decorator_list)
+        self._define(node.name, self._token_in(node, node.name))
+
+        parent = self.scope
+        scope = self._enter(node, node.name)
+        for arg in _all_args(args):
+            self._define(arg.arg, self._token_in(arg, arg.arg))
+        positional = args.posonlyargs + args.args
+        if parent.kind == "class" and positional and not _is_staticmethod(node):
+            self.result.self_bindings[BindingKey(scope.key, positional[0].arg)] = parent.key
+        self._visit_all(node.body)
+        self.scope = parent
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda):
+        args = node.args
+        self._visit_all(args.defaults)
+        self._visit_all([d for d in args.kw_defaults if d is not None])
+        parent = self.scope
+        self._enter(node, "lambda")
+        for arg in _all_args(args):
+            self._define(arg.arg, self._token_in(arg, arg.arg))
+        self.visit(node.body)
+        self.scope = parent
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._visit_all(node.bases)
+        self._visit_all(node.keywords)
+        self._visit_all(node.decorator_list)
+        binding = self._define(node.name, self._token_in(node, node.name))
+
+        parent = self.scope
+        scope = self._enter(node, node.name, kind="class")
+        self.result.class_scopes[binding] = scope.key
+        self.result.class_bindings[scope.key] = binding
+        self.result.class_nodes[scope.key] = node
+        self._visit_all(node.body)
+        self.scope = parent
+
+    def _visit_comprehension(self, node: ast.expr):
+        generators = node.generators
+        self.visit(generators[0].iter)
+        parent = self.scope
+        self._enter(node, _COMPREHENSIONS[type(node)])
+        for i, generator in enumerate(generators):
+            self.visit(generator.target)
+            if i:
+                self.visit(generator.iter)
+            self._visit_all(generator.ifs)
+        if isinstance(node, ast.DictComp):
+            self.visit(node.key)
+            self.visit(node.value)
+        else:
+            self.visit(node.elt)
+        self.scope = parent
+
+    visit_ListComp = visit_SetComp = visit_DictComp = visit_GeneratorExp = _visit_comprehension
+
+    # Names
+
+    def visit_Name(self, node: ast.Name):
+        is_store = isinstance(node.ctx, ast.Store)
+        binding = self.scope.resolve(node.id)
+        self.result.occurrences.append(
+            Occurrence(node.id, self._node_range(node), binding, is_definition=is_store)
+        )
+        if is_store:
+            self.result.stores[binding] = self.result.stores.get(binding, 0) + 1
+
+    def visit_Assign(self, node: ast.Assign):
+        if (
+            len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and isinstance(node.value, ast.Call)
+        ):
+            binding = self.scope.resolve(node.targets[0].id)
+            assignments = self.result.call_assignments.setdefault(binding, [])
+            assignments.append((node.value.func, self.scope))
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        start_line, start_column = self._char_position(node.end_lineno - 1, node.end_col_offset)
+        attr_range = Range(
+            start=Position(line=start_line, column=start_column - len(node.attr)),
+            end=Position(line=start_line, column=start_column),
+        )
+        self.result.attributes.append(AttributeOccurrence(node, attr_range, self.scope))
+        self.visit(node.value)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            bound = alias.asname or alias.name.split(".")[0]
+            token = self._token_in(alias, bound, last=alias.asname is not None)
+            binding = self._define(bound, token)
+            module = alias.name if alias.asname else bound
+            self.result.imports[binding] = ImportBinding(binding, module=module, level=0)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            if alias.name == "*":
+                self.result.star_imports.append((node.module or "", node.level))
+                continue
+            member_range = self._token_in(alias, alias.name)
+            if alias.asname:
+                binding = self._define(alias.asname, self._token_in(alias, alias.asname, last=True))
+            else:
+                binding = self._define(alias.name, member_range)
+            self.result.imports[binding] = ImportBinding(
+                binding,
+                module=node.module or "",
+                level=node.level,
+                member=alias.name,
+                member_range=member_range,
+            )
+
+    def visit_Global(self, node: ast.Global):
+        for name in node.names:
+            token = self._token_in(node, name)
+            if token is not None:
+                self.result.occurrences.append(Occurrence(name, token, self.scope.resolve(name)))
+
+    visit_Nonlocal = visit_Global
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler):
+        if node.type is not None:
+            self.visit(node.type)
+        if node.name:
+            end = self._char_position(node.body[0].lineno - 1, node.body[0].col_offset)
+            start = self._char_position(node.lineno - 1, node.col_offset)
+            self._define(node.name, self._find_token(start, end, node.name, last=True))
+        self._visit_all(node.body)
+
+    def visit_MatchAs(self, node: ast.AST):
+        if getattr(node, "name", None):
+            self._define(node.name, self._token_in(node, node.name, last=True))
+        self.generic_visit(node)
+
+    visit_MatchStar = visit_MatchAs
+
+    def visit_MatchMapping(self, node: ast.AST):
+        if node.rest:
+            self._define(node.rest, self._token_in(node, node.rest, last=True))
+        self.generic_visit(node)
+
+    # Helpers
+
+    def _enter(self, node: ast.AST, name: str, kind: str = "function") -> Scope:
+        table = self.scope.take_child(name, node.lineno)
+        key = self.scope.key + (f"{name}:{node.lineno}:{node.col_offset}",)
+        scope = Scope(key, kind, table, self.scope)
+        self.result.scopes[key] = scope
+        self.scope = scope
+        return scope
+
+    def _define(self, name: str, token: Optional[Range]) -> BindingKey:
+        binding = self.scope.resolve(name)
+        if token is not None:
+            self.result.occurrences.append(
+                Occurrence(name, token, binding, is_definition=True)
+            )
+        self.result.stores[binding] = self.result.stores.get(binding, 0) + 1
+        return binding
+
+    def _visit_all(self, nodes: List[ast.AST]):
+        for node in nodes:
+            self.visit(node)
+
+    def _char_position(self, line: int, byte_column: int) -> Tuple[int, int]:
+        text = self.lines[line] if line < len(self.lines) else ""
+        if text.isascii():
+            return line, byte_column
+        return line, len(text.encode("utf-8")[:byte_column].decode("utf-8", errors="ignore"))
+
+    def _node_range(self, node: ast.AST) -> Range:
+        start = self._char_position(node.lineno - 1, node.col_offset)
+        end = self._char_position(node.end_lineno - 1, node.end_col_offset)
+        return Range(
+            start=Position(line=start[0], column=start[1]),
+            end=Position(line=end[0], column=end[1]),
+        )
+
+    def _token_in(self, node: ast.AST, name: str, last: bool = False) -> Optional[Range]:
+        """Finds the token of a name within the span of a node."""
+        start = self._char_position(node.lineno - 1, node.col_offset)
+        end = self._char_position(node.end_lineno - 1, node.end_col_offset)
+        return self._find_token(start, end, name, last)
+
+    def _find_token(
+        self, start: Tuple[int, int], end: Tuple[int, int], name: str, last: bool = False
+    ) -> Optional[Range]:
+        found = None
+        for line in range(start[0], end[0] + 1):
+            for token_start, token_end, string in self.names.get(line, ()):
+                if string != name or (line, token_start) < start or (line, token_end) > end:
+                    continue
+                found = Range(
+                    start=Position(line=line, column=token_start),
+                    end=Position(line=line, column=token_end),
+                )
+                if not last:
+                    return found
+        return found
+
+
+def _name_tokens(text: str) -> Dict[int, List[Tuple[int, int, str]]]:
+    """Returns the NAME tokens of a text by 0-indexed line."""
+    names: Dict[int, List[Tuple[int, int, str]]] = {}
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(text).readline):
+            if token.type == tokenize.NAME and token.start[0] == token.end[0]:
+                names.setdefault(token.start[0] - 1, []).append(
+                    (token.start[1], token.end[1], token.string)
+                )
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return names
+
+
+def _all_args(args: ast.arguments) -> List[ast.arg]:
+    result = args.posonlyargs + args.args
+    if args.vararg:
+        result.append(args.vararg)
+    result += args.kwonlyargs
+    if args.kwarg:
+        result.append(args.kwarg)
+    return result
+
+
+def _is_staticmethod(node: ast.AST) -> bool:
+    return any(
+        isinstance(d, ast.Name) and d.id == "staticmethod" for d in node.decorator_list
+    )
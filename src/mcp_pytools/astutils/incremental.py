@@ -0,0 +1,245 @@
+# src/mcp_pytools/astutils/incremental.py
+
+import ast
+import copy
+import dataclasses
+import re
+from typing import List, Optional, Tuple
+
+from mcp_pytools.astutils.parser import ParentAndRangeVisitor, ParsedModule, Position, Range
+
+# Characters that str.splitlines() treats as line breaks but the Python
+# tokenizer does not (or vice versa). Text containing them is always re-parsed
+# in full, since line numbers from both views would disagree.
+_AMBIGUOUS_LINE_BREAKS = re.compile("\r(?!\n)|[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+@dataclasses.dataclass
+class TextEdit:
+    """A replacement of a range of text.
+
+    Positions are 0-indexed lines and character offsets within the line.
+    """
+
+    range: Range
+    new_text: str
+
+
+@dataclasses.dataclass
+class BlockUpdate:
+    """The result of re-parsing the top-level statements touched by an edit."""
+
+    module: ParsedModule
+    # First and last (inclusive) line of the re-parsed block before the edit.
+    start_line: int
+    end_line: int
+    # Number of lines added (or removed, if negative) by the edit.
+    line_delta: int
+    statements: List[ast.stmt]
+    # The text of the block before and after the edit.
+    old_text: str
+    new_text: str
+
+
+def apply_text_edit(text: str, edit: TextEdit) -> str:
+    """Applies a single edit to a text.
+
+    Args:
+        text: The text to edit.
+        edit: The edit to apply.
+
+    Returns:
+        The edited text.
+    """
+    lines = text.splitlines(keepends=True)
+    start = _offset(lines, edit.range.start)
+    end = _offset(lines, edit.range.end)
+    return text[:start] + edit.new_text + text[end:]
+
+
+def reparse_edit(module: ParsedModule, edit: TextEdit) -> Optional[BlockUpdate]:
+    """Applies an edit to a parsed module, re-parsing only what it touches.
+
+    The edited lines are widened to whole top-level statements, and only that
+    block is parsed again. The module is left unchanged: the updated module
+    has a new tree, which shares the statements before the block with the
+    old one. The statements after it are shared too if the edit kept the
+    number of lines, and are otherwise copied, shifted by the number of lines
+    the edit added or removed.
+
+    Parsing is proportional to the block, but an edit that adds or removes
+    lines still copies every statement after it, and the text is split and
+    joined in full, so part of the cost stays linear in the length of the
+    file.
+
+    Args:
+        module: The parsed module the edit applies to.
+        edit: The edit to apply.
+
+    Returns:
+        The block update, or None if the edit cannot be applied
+        incrementally (e.g. it leaves the block unbalanced), in which case the
+        whole edited text must be parsed again.
+    """
+    text = module.text
+    if _AMBIGUOUS_LINE_BREAKS.search(text) or _AMBIGUOUS_LINE_BREAKS.search(edit.new_text):
+        return None
+
+    body = module.tree.body
+    if not body:
+        return None
+    spans = [_statement_span(stmt) for stmt in body]
+
+    lines = text.splitlines(keepends=True)
+    if edit.range.end.line > len(lines):
+        return None
+    if edit.range.end.line >= len(lines) and not text.endswith("\n"):
+        # `apply_text_edit` appends to the unterminated last line instead
+        return None
+    first, last = _affected_statements(spans, edit.range.start.line, edit.range.end.line)
+    start_line = edit.range.start.line
+    end_line = edit.range.end.line
+    if first <= last:
+        start_line = min(start_line, spans[first][0])
+        end_line = max(end_line, spans[last][1])
+
+    base = sum(map(len, lines[:start_line]))
+    old_block = "".join(lines[start_line:end_line + 1])
+    edit_start = _offset(lines, edit.range.start) - base
+    edit_end = _offset(lines, edit.range.end) - base
+    new_block = old_block[:edit_start] + edit.new_text + old_block[edit_end:]
+
+    try:
+        block_tree = ast.parse(new_block, filename=module.uri, type_comments=True)
+    except SyntaxError:
+        return None
+
+    line_delta = len(new_block.splitlines()) - len(old_block.splitlines())
+
+    tree = ast.Module(body=[], type_ignores=[])
+    ast.increment_lineno(block_tree, start_line)
+    visitor = ParentAndRangeVisitor()
+    for stmt in block_tree.body:
+        visitor.parent = tree
+        visitor.visit(stmt)
+
+    trailing = body[last + 1:] if first <= last else body[first:]
+    if line_delta:
+        # Copies, since the old tree must keep its positions
+        trailing = [_shifted_copy(stmt, line_delta, tree) for stmt in trailing]
+
+    tree.body = body[:first] + block_tree.body + trailing
+    tree.type_ignores = (
+        [t for t in module.tree.type_ignores if t.lineno - 1 < start_line]
+        + block_tree.type_ignores
+        + [
+            _shifted_type_ignore(t, line_delta)
+            for t in module.tree.type_ignores
+            if t.lineno - 1 > end_line
+        ]
+    )
+
+    new_text = text[:base] + new_block + text[base + len(old_block):]
+    # Lines outside the block are unchanged, so they are not split again
+    new_lines = (
+        module.lines[:start_line] + new_block.splitlines() + module.lines[end_line + 1:]
+    )
+    updated = ParsedModule(tree=tree, text=new_text, lines=new_lines, uri=module.uri)
+    return BlockUpdate(
+        module=updated,
+        start_line=start_line,
+        end_line=end_line,
+        line_delta=line_delta,
+        statements=block_tree.body,
+        old_text=old_block,
+        new_text=new_block,
+    )
+
+
+def shift_range(range_: Range, line_delta: int) -> Range:
+    """Returns a copy of a range moved by a number of lines."""
+    return Range(
+        start=Position(line=range_.start.line + line_delta, column=range_.start.column),
+        end=Position(line=range_.end.line + line_delta, column=range_.end.column),
+    )
+
+
+def _offset(lines: List[str], position: Position) -> int:
+    """Converts a line/character position to an offset into the joined lines."""
+    if position.line >= len(lines):
+        return sum(map(len, lines))
+    line = lines[position.line]
+    content_length = len(line.rstrip("\r\n"))
+    return sum(map(len, lines[:position.line])) + min(position.column, content_length)
+
+
+def _statement_span(stmt: ast.stmt) -> Tuple[int, int]:
+    """Returns the first and last 0-indexed line of a statement, decorators included."""
+    start = stmt.lineno
+    for decorator in getattr(stmt, "decorator_list", []):
+        start = min(start, decorator.lineno)
+    return start - 1, stmt.end_lineno - 1
+
+
+def _affected_statements(
+    spans: List[Tuple[int, int]], start_line: int, end_line: int
+) -> Tuple[int, int]:
+    """Finds the statements overlapping a line range, widened until stable.
+
+    Returns:
+        The indices of the first and last affected statements. If no
+        statement is affected, `first` is the index where new statements
+        would be inserted and `last` is `first - 1`.
+    """
+    while True:
+        first = next(
+            (i for i, (_, end) in enumerate(spans) if end >= start_line), len(spans)
+        )
+        last = first - 1
+        while last + 1 < len(spans) and spans[last + 1][0] <= end_line:
+            last += 1
+        if first > last:
+            return first, last
+        new_start = min(start_line, spans[first][0])
+        new_end = max(end_line, spans[last][1])
+        if (new_start, new_end) == (start_line, end_line):
+            return first, last
+        start_line, end_line = new_start, new_end
+
+
+def _shifted_copy(node: ast.AST, line_delta: int, parent: ast.AST) -> ast.AST:
+    """Copies a node and all its descendants, moved by a number of lines.
+
+    Equivalent to a deep copy followed by `ast.increment_lineno` and a shift
+    of the decorated ranges, done in a single walk. Nodes without fields or
+    positions, such as expression contexts, are shared.
+    """
+    if not node._fields and "lineno" not in node._attributes:
+        return node
+    shifted = copy.copy(node)
+    shifted._parent = parent
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if isinstance(value, ast.AST):
+            setattr(shifted, field, _shifted_copy(value, line_delta, shifted))
+        elif isinstance(value, list):
+            setattr(
+                shifted,
+                field,
+                [
+                    _shifted_copy(item, line_delta, shifted) if isinstance(item, ast.AST) else item
+                    for item in value
+                ],
+            )
+    if "lineno" in node._attributes:
+        shifted.lineno += line_delta
+        if getattr(shifted, "end_lineno", None) is not None:
+            shifted.end_lineno += line_delta
+    node_range = getattr(node, "_range", None)
+    if node_range is not None:
+        shifted._range = shift_range(node_range, line_delta)
+    return shifted
+
+
+def _shifted_type_ignore(type_ignore: ast.TypeIgnore, line_delta: int) -> ast.TypeIgnore:
+    return ast.TypeIgnore(lineno=type_ignore.lineno + line_delta, tag=type_ignore.tag)
@@ -0,0 +1,72 @@
+# src/mcp_pytools/astutils/parse_cache.py
+
+import hashlib
+import sys
+from typing import Hashable, List, Tuple, Union
+
+from mcp_pytools.astutils.parser import ParsedModule, StructuredSyntaxError, parse_module
+from mcp_pytools.cache import CacheStats, ResultCache
+
+# The grammar the trees were parsed with; cached trees are only valid for it.
+GRAMMAR_VERSION = sys.version_info[:2]
+
+
+class ParseCache:
+    """
+    A bounded LRU cache of parsed modules, keyed by the SHA256 of their text
+    and the grammar version, so that identical content is only parsed once,
+    whichever file it comes from. Syntax errors are cached too.
+
+    Modules returned for the same content share their tree, which must
+    therefore not be modified. This cache is thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self._results = ResultCache(maxsize)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._results.stats
+
+    def parse(self, text: str, uri: str) -> ParsedModule:
+        """Parses Python code like `parse_module`, reusing earlier results.
+
+        Raises:
+            StructuredSyntaxError: If the code contains a syntax error.
+        """
+        result = self._results.get_or_compute(self.key(text), lambda: _parse(text, uri))
+        if isinstance(result, StructuredSyntaxError):
+            raise StructuredSyntaxError(
+                msg=result.msg,
+                filename=uri,
+                lineno=result.lineno,
+                offset=result.offset,
+                text=result.text,
+            )
+        tree, lines = result
+        return ParsedModule(tree=tree, text=text, lines=lines, uri=uri)
+
+    def trees(self) -> List[Tuple[object, List[str]]]:
+        """The cached trees, with the lines of their text."""
+        return [r for r in self._results.values() if not isinstance(r, StructuredSyntaxError)]
+
+    def clear(self):
+        """Drops every cached module."""
+        self._results = ResultCache(self._results.maxsize)
+
+    @staticmethod
+    def key(text: str) -> Hashable:
+        digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        return (digest, GRAMMAR_VERSION)
+
+
+def _parse(text: str, uri: str) -> Union[Tuple[object, List[str]], StructuredSyntaxError]:
+    try:
+        module = parse_module(text, uri)
+    except StructuredSyntaxError as e:
+        return e
+    return (module.tree, module.lines)
+
+
+# The parse cache shared by the index and all tools.
+PARSE_CACHE = ParseCache()
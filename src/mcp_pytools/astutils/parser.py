@@ -13,6 +13,10 @@ class Position:
     def to_dict(self) -> Dict[str, Any]:
         return {"line": self.line, "column": self.column}
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Position":
+        return cls(line=data["line"], column=data["column"])
+
 
 @dataclasses.dataclass
 class Range:
@@ -22,6 +26,10 @@ class Range:
     def to_dict(self) -> Dict[str, Any]:
         return {"start": self.start.to_dict(), "end": self.end.to_dict()}
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Range":
+        return cls(start=Position.from_dict(data["start"]), end=Position.from_dict(data["end"]))
+
 
 @dataclasses.dataclass
 class ParsedModule:
@@ -96,8 +104,9 @@ class ParentAndRangeVisitor(ast.NodeVisitor):
         if self.parent:
             node._parent = self.parent
 
-        # Python 3.8+ provides end line and col offsets
-        if hasattr(node, "lineno"):
+        # Python 3.8+ provides end line and col offsets. TypeIgnore nodes only
+        # carry a line number.
+        if hasattr(node, "lineno") and hasattr(node, "col_offset"):
             start = Position(line=node.lineno - 1, column=node.col_offset)
             if hasattr(node, "end_lineno") and node.end_lineno is not None:
                 end = Position(line=node.end_lineno - 1, column=node.end_col_offset)
@@ -0,0 +1,92 @@
+# src/mcp_pytools/cache.py
+
+import collections
+import dataclasses
+import threading
+from typing import Any, Callable, Hashable, List, Optional
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Hit and miss counters of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class ResultCache:
+    """
+    A bounded LRU cache for computed results, keyed by any hashable value.
+    Keys should include everything the result depends on, such as a content
+    hash and a version of the computation. This cache is thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._entries: "collections.OrderedDict[Hashable, Any]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Gets a cached result and marks it as recently used."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return self._entries[key]
+            self.stats.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """Stores a result, evicting the least recently used ones if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Gets a cached result, computing and storing it on a miss.
+
+        The computation runs without holding the cache lock, so concurrent
+        misses on the same key may compute the result more than once.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def discard(self, key: Hashable):
+        """Removes a result from the cache, if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Removes all results from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def values(self) -> List[Any]:
+        """Returns the cached results, from least to most recently used."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,61 @@
+# src/mcp_pytools/fs/atomic.py
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+def replace_files(contents: Dict[Path, str]):
+    """Writes new contents to several files, all or nothing.
+
+    Every content is first written to a temporary file next to its target,
+    and the targets are only replaced, with `os.replace`, once all writes
+    succeeded. If a replacement fails, the files already replaced get their
+    original content back. File permissions are preserved.
+
+    Args:
+        contents: The new text of each file.
+
+    Raises:
+        OSError: If the files could not be written. No file is left changed.
+    """
+    staged: List[Tuple[Path, str]] = []
+    try:
+        for path, text in contents.items():
+            fd, temp_path = tempfile.mkstemp(
+                dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+            )
+            staged.append((path, temp_path))
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+            if path.exists():
+                os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+    except BaseException:
+        for _, temp_path in staged:
+            _remove_quietly(temp_path)
+        raise
+
+    originals = {path: path.read_bytes() for path, _ in staged if path.exists()}
+    replaced: List[Path] = []
+    try:
+        for path, temp_path in staged:
+            os.replace(temp_path, path)
+            replaced.append(path)
+    except BaseException:
+        for path, temp_path in staged[len(replaced):]:
+            _remove_quietly(temp_path)
+        for path in replaced:
+            if path in originals:
+                path.write_bytes(originals[path])
+            else:
+                _remove_quietly(path)
+        raise
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
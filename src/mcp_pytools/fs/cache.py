@@ -1,10 +1,27 @@
 # src/mcp_pytools/fs/cache.py
 
+import concurrent.futures
+import contextlib
 import dataclasses
 import hashlib
+import mmap
+import os
 import threading
+import time
+import zlib
 from pathlib import Path
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from mcp_pytools.fs.overlay import Overlay, OverlayStore
+
+# Size of the blocks read when hashing a file without loading it whole.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+# Number of locks that paths are striped over.
+LOCK_STRIPES = 64
 
 
 @dataclasses.dataclass
@@ -13,27 +30,53 @@ class FileRecord:
     mtime_ns: int
     size: int
     sha256: Optional[str] = None
+    fingerprint: Optional[str] = None
     _content_bytes: Optional[bytes] = None
     _content_text: Optional[str] = None
+    _checked_at: float = 0.0
 
 
 class FileCache:
     """
     A cache for file content and metadata.
     This cache is thread-safe.
+
+    Files of at least `mmap_threshold` bytes are read through a memory map:
+    their text is decoded straight from the mapped pages, and no separate
+    copy of their bytes is kept.
+
+    Records are looked up without locking; locks are striped by path and are
+    only taken to create a record or load its content, and never around a
+    `stat()` call. With a positive `stat_ttl_ms`, a record whose file was
+    stat'ed less than that many milliseconds ago is trusted as fresh.
+
+    When an `OverlayStore` is given, documents open in it are served from
+    their in-memory content instead of the file on disk.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        mmap_threshold: int = MMAP_THRESHOLD,
+        stat_ttl_ms: float = 0,
+        overlays: Optional[OverlayStore] = None,
+    ):
         self._cache: Dict[Path, FileRecord] = {}
-        self._lock = threading.RLock()
+        self._overlay_records: Dict[Path, Tuple[Overlay, FileRecord]] = {}
+        self._locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+        self.mmap_threshold = mmap_threshold
+        self.stat_ttl_ms = stat_ttl_ms
+        self.overlays = overlays
 
     def get_text(self, path: Path) -> str:
         """Gets the text content of a file, using the cache if possible."""
         record = self._get_or_read_record(path)
         if record._content_text is None:
-            with self._lock:
+            with self._lock_for(path):
                 # Check again in case another thread just populated it
-                if record._content_text is None:
+                if record._content_text is None and self._use_mmap(record):
+                    with self._open_mmap(path) as buffer:
+                        record._content_text = str(buffer, "utf-8", errors="replace")
+                elif record._content_text is None:
                     try:
                         record._content_text = record._content_bytes.decode("utf-8")
                     except (UnicodeDecodeError, AttributeError):
@@ -46,43 +89,150 @@ class FileCache:
         return record._content_text
 
     def get_bytes(self, path: Path) -> bytes:
-        """Gets the byte content of a file, using the cache if possible."""
+        """Gets the byte content of a file, using the cache if possible.
+
+        Large files are copied out of a memory map and their bytes are not
+        cached; prefer `open_buffer` to scan them without any copy.
+        """
         record = self._get_or_read_record(path)
+        if record._content_bytes is None and self._use_mmap(record):
+            with self._open_mmap(path) as buffer:
+                return buffer[:]
         if record._content_bytes is None:
-            with self._lock:
+            with self._lock_for(path):
                 if record._content_bytes is None:
                     record._content_bytes = path.read_bytes()
         return record._content_bytes
 
+    @contextlib.contextmanager
+    def open_buffer(self, path: Path) -> Iterator[Union[bytes, mmap.mmap]]:
+        """Opens a read-only buffer over the byte content of a file.
+
+        Large files are memory-mapped for the duration of the context, so
+        they can be scanned without copying them into memory. Smaller files,
+        or files whose bytes are already cached, yield the cached bytes.
+
+        Args:
+            path: The path to the file.
+
+        Yields:
+            A bytes-like object with the file content. It must not be used
+            after the context exits.
+        """
+        record = self._get_or_read_record(path)
+        if record._content_bytes is not None or not self._use_mmap(record):
+            yield self.get_bytes(path)
+            return
+        with self._open_mmap(path) as buffer:
+            yield buffer
+
+    def prefers_buffer(self, path: Path) -> bool:
+        """Whether a file is large enough to be scanned through `open_buffer`.
+
+        Returns False when the decoded text is already cached, since scanning
+        it is then cheaper than going back to the raw bytes.
+        """
+        record = self._get_or_read_record(path)
+        return record._content_text is None and self._use_mmap(record)
+
     def stat(self, path: Path) -> FileRecord:
         """Gets the metadata record for a file."""
         return self._get_or_read_record(path)
 
+    def exists(self, path: Path) -> bool:
+        """Whether a file exists on disk or is open as an overlay."""
+        return (self.overlays is not None and path in self.overlays) or path.is_file()
+
+    def cached_contents(self) -> List[Union[bytes, str]]:
+        """The file contents held by the cache, as bytes or text."""
+        contents: List[Union[bytes, str]] = []
+        for record in list(self._cache.values()):
+            if record._content_bytes is not None:
+                contents.append(record._content_bytes)
+            if record._content_text is not None:
+                contents.append(record._content_text)
+        return contents
+
     def invalidate(self, path: Path):
         """Removes a file from the cache."""
-        with self._lock:
-            if path in self._cache:
-                del self._cache[path]
+        with self._lock_for(path):
+            self._cache.pop(path, None)
+            self._overlay_records.pop(path, None)
+
+    def _use_mmap(self, record: FileRecord) -> bool:
+        return record.size > 0 and record.size >= self.mmap_threshold
+
+    @contextlib.contextmanager
+    def _open_mmap(self, path: Path) -> Iterator[mmap.mmap]:
+        with path.open("rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                yield buffer
+
+    def _lock_for(self, path: Path):
+        return self._locks[hash(path) % LOCK_STRIPES]
 
     def _get_or_read_record(self, path: Path) -> FileRecord:
-        with self._lock:
-            stat_res = path.stat()
-            if path in self._cache and self._cache[path].mtime_ns == stat_res.st_mtime_ns:
-                return self._cache[path]
+        if self.overlays is not None:
+            overlay = self.overlays.get(path)
+            if overlay is not None:
+                return self._overlay_record(overlay)
+
+        record = self._cache.get(path)
+        now = time.monotonic()
+        if (
+            record is not None
+            and self.stat_ttl_ms > 0
+            and (now - record._checked_at) * 1000 < self.stat_ttl_ms
+        ):
+            return record
+
+        stat_res = path.stat()
+        if self._is_fresh(record, stat_res):
+            record._checked_at = now
+            return record
+
+        with self._lock_for(path):
+            # Another thread may have refreshed the record meanwhile
+            record = self._cache.get(path)
+            if self._is_fresh(record, stat_res):
+                return record
 
-            # Read file and create record
             record = FileRecord(
                 path=path,
                 mtime_ns=stat_res.st_mtime_ns,
                 size=stat_res.st_size,
+                _checked_at=now,
             )
             self._cache[path] = record
             return record
 
+    def _overlay_record(self, overlay: Overlay) -> FileRecord:
+        cached = self._overlay_records.get(overlay.path)
+        if cached is not None and cached[0] is overlay:
+            return cached[1]
+        record = FileRecord(
+            path=overlay.path,
+            mtime_ns=overlay.version,
+            size=len(overlay.data),
+            _content_bytes=overlay.data,
+            _content_text=overlay.text,
+        )
+        self._overlay_records[overlay.path] = (overlay, record)
+        return record
+
+    @staticmethod
+    def _is_fresh(record: Optional[FileRecord], stat_res: os.stat_result) -> bool:
+        return (
+            record is not None
+            and record.mtime_ns == stat_res.st_mtime_ns
+            and record.size == stat_res.st_size
+        )
+
     def get_sha256(self, path: Path) -> str:
         """Gets the SHA256 hash of a file, using the cache if possible.
 
-        The hash is computed lazily and cached.
+        The hash is computed lazily and cached. If the content is not already
+        cached, the file is hashed in chunks so it is never held in memory.
 
         Args:
             path: The path to the file.
@@ -92,8 +242,85 @@ class FileCache:
         """
         record = self._get_or_read_record(path)
         if record.sha256 is None:
-            with self._lock:
-                if record.sha256 is None:
-                    content_bytes = self.get_bytes(path)
-                    record.sha256 = hashlib.sha256(content_bytes).hexdigest()
+            content_bytes = record._content_bytes
+            if content_bytes is not None:
+                digest = hashlib.sha256(content_bytes).hexdigest()
+            else:
+                with path.open("rb") as f:
+                    digest = _sha256_stream(f)
+            record.sha256 = digest
         return record.sha256
+
+    def get_fingerprint(self, path: Path) -> str:
+        """Gets a cheap, non-cryptographic fingerprint of a file's content.
+
+        The fingerprint combines the file size with a CRC32 of the content and
+        is meant for change detection only. Like `get_sha256`, it streams the
+        file and does not populate the content cache.
+
+        Args:
+            path: The path to the file.
+
+        Returns:
+            The fingerprint of the file content.
+        """
+        record = self._get_or_read_record(path)
+        if record.fingerprint is None:
+            content_bytes = record._content_bytes
+            if content_bytes is not None:
+                crc = zlib.crc32(content_bytes)
+            else:
+                with path.open("rb") as f:
+                    crc = _crc32_stream(f)
+            record.fingerprint = f"{record.size:x}-{crc:08x}"
+        return record.fingerprint
+
+    def fingerprint_many(
+        self,
+        paths: Iterable[Path],
+        cryptographic: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Dict[Path, str]:
+        """Fingerprints many files concurrently using a thread pool.
+
+        Hashing releases the GIL for large buffers, so reading and hashing
+        files in parallel scales with the number of workers.
+
+        Args:
+            paths: The paths of the files to fingerprint.
+            cryptographic: If true, SHA256 hashes are returned instead of the
+                cheaper CRC32-based fingerprints.
+            max_workers: The maximum number of worker threads.
+
+        Returns:
+            A mapping from path to fingerprint. Files that cannot be read are
+            omitted.
+        """
+        compute = self.get_sha256 if cryptographic else self.get_fingerprint
+        results: Dict[Path, str] = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(compute, path): path for path in paths}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except OSError:
+                    continue
+        return results
+
+
+def _sha256_stream(f: BinaryIO) -> str:
+    """Computes the SHA256 hex digest of a binary stream."""
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, "sha256").hexdigest()
+    hasher = hashlib.sha256()
+    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _crc32_stream(f: BinaryIO) -> int:
+    """Computes the CRC32 checksum of a binary stream."""
+    crc = 0
+    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+        crc = zlib.crc32(chunk, crc)
+    return crc
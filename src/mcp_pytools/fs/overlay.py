@@ -0,0 +1,88 @@
+# src/mcp_pytools/fs/overlay.py
+
+import dataclasses
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+@dataclasses.dataclass(frozen=True)
+class Overlay:
+    """The in-memory content of a document that shadows the file on disk."""
+
+    path: Path
+    text: str
+    version: int
+    data: bytes
+
+
+class OverlayStore:
+    """
+    A store of in-memory document contents, e.g. unsaved editor buffers.
+    While a document is open here, its overlay content takes precedence over
+    the file on disk. This store is thread-safe.
+    """
+
+    def __init__(self):
+        self._overlays: Dict[Path, Overlay] = {}
+        self._lock = threading.Lock()
+
+    def open(self, path: Path, text: str, version: int = 0) -> Overlay:
+        """Opens a document with the given content, replacing any open overlay.
+
+        Args:
+            path: The path of the document. The file does not need to exist.
+            text: The content of the document.
+            version: The client's version number of the content.
+
+        Returns:
+            The new overlay.
+        """
+        overlay = Overlay(path=path, text=text, version=version, data=text.encode("utf-8"))
+        with self._lock:
+            self._overlays[path] = overlay
+        return overlay
+
+    def update(self, path: Path, text: str, version: Optional[int] = None) -> Overlay:
+        """Replaces the content of an open document.
+
+        Args:
+            path: The path of the document.
+            text: The new content of the document.
+            version: The client's version number of the content. Defaults to
+                the previous version plus one.
+
+        Returns:
+            The updated overlay.
+
+        Raises:
+            KeyError: If the document is not open.
+        """
+        with self._lock:
+            previous = self._overlays[path]
+            if version is None:
+                version = previous.version + 1
+            overlay = Overlay(path=path, text=text, version=version, data=text.encode("utf-8"))
+            self._overlays[path] = overlay
+        return overlay
+
+    def close(self, path: Path) -> Optional[Overlay]:
+        """Closes a document, so its file on disk is used again.
+
+        Returns:
+            The overlay that was closed, or None if the document was not open.
+        """
+        with self._lock:
+            return self._overlays.pop(path, None)
+
+    def get(self, path: Path) -> Optional[Overlay]:
+        """Gets the overlay of a document, or None if it is not open."""
+        return self._overlays.get(path)
+
+    def paths(self) -> List[Path]:
+        """Returns the paths of all open documents."""
+        with self._lock:
+            return list(self._overlays.keys())
+
+    def __contains__(self, path: Path) -> bool:
+        return path in self._overlays
@@ -0,0 +1,134 @@
+# src/mcp_pytools/index/diagnostics_store.py
+
+import collections
+import json
+import threading
+from typing import Any, Deque, Dict, List, Set, Tuple
+
+# A diagnostic as published to clients: its to_dict() form plus its "uri".
+DiagnosticItem = Dict[str, Any]
+
+
+class DiagnosticsStore:
+    """
+    The current diagnostics of every file, with a log of changes.
+
+    Each change to the stored diagnostics bumps a generation number, so a
+    client that remembers the last generation it saw can ask for only what
+    was added or removed since. The index marks files as dirty when they are
+    re-indexed; their diagnostics are recomputed the next time they are
+    requested. This store is thread-safe.
+    """
+
+    def __init__(self, max_log_size: int = 100_000):
+        self.generation = 0
+        self.max_log_size = max_log_size
+        self._current: Dict[str, Dict[str, DiagnosticItem]] = {}
+        # (generation, +1 for added or -1 for removed, key, item)
+        self._log: Deque[Tuple[int, int, str, DiagnosticItem]] = collections.deque()
+        self._log_start = 0
+        self._dirty: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def mark_dirty(self, uri: str):
+        """Marks the diagnostics of a file as stale."""
+        with self._lock:
+            self._dirty.add(uri)
+
+    def mark_all_dirty(self):
+        """Marks the diagnostics of every known file as stale."""
+        with self._lock:
+            self._dirty.update(self._current)
+
+    def take_dirty(self) -> List[str]:
+        """Returns the stale files and clears their dirty mark."""
+        with self._lock:
+            dirty = list(self._dirty)
+            self._dirty.clear()
+            return dirty
+
+    def set(self, uri: str, diagnostics: List[DiagnosticItem]) -> int:
+        """Replaces the diagnostics of a file, logging what changed.
+
+        Args:
+            uri: The file URI.
+            diagnostics: The diagnostics of the file, in their dict form.
+
+        Returns:
+            The generation after the change.
+        """
+        new = {}
+        for diagnostic in diagnostics:
+            item = dict(diagnostic, uri=uri)
+            new[_item_key(item)] = item
+        with self._lock:
+            old = self._current.get(uri, {})
+            changes = [(-1, key, item) for key, item in old.items() if key not in new]
+            changes += [(1, key, item) for key, item in new.items() if key not in old]
+            if new:
+                self._current[uri] = new
+            else:
+                self._current.pop(uri, None)
+            if changes:
+                self.generation += 1
+                for sign, key, item in changes:
+                    self._log.append((self.generation, sign, key, item))
+                self._trim_log()
+            return self.generation
+
+    def remove(self, uri: str) -> int:
+        """Removes all diagnostics of a file, e.g. because it was deleted."""
+        return self.set(uri, [])
+
+    def get(self, uri: str) -> List[DiagnosticItem]:
+        """Returns the current diagnostics of a file."""
+        with self._lock:
+            return list(self._current.get(uri, {}).values())
+
+    def delta(self, since: int) -> Dict[str, Any]:
+        """Returns the diagnostics added and removed after a generation.
+
+        If the changes since that generation are no longer in the log, or the
+        generation is unknown, the full current set is returned as added and
+        `reset` is true: the client should drop everything it holds first.
+
+        Args:
+            since: The last generation the client saw, 0 for none.
+
+        Returns:
+            A dict with the current `generation`, the `added` and `removed`
+            diagnostics, and the `reset` flag.
+        """
+        with self._lock:
+            if since < self._log_start or since > self.generation:
+                added = [item for items in self._current.values() for item in items.values()]
+                return {
+                    "generation": self.generation,
+                    "reset": True,
+                    "added": added,
+                    "removed": [],
+                }
+
+            net: Dict[str, int] = {}
+            items: Dict[str, DiagnosticItem] = {}
+            for generation, sign, key, item in reversed(self._log):
+                if generation <= since:
+                    break
+                net[key] = net.get(key, 0) + sign
+                items.setdefault(key, item)
+            return {
+                "generation": self.generation,
+                "reset": False,
+                "added": [items[key] for key, count in net.items() if count > 0],
+                "removed": [items[key] for key, count in net.items() if count < 0],
+            }
+
+    def _trim_log(self):
+        while len(self._log) > self.max_log_size:
+            generation = self._log.popleft()[0]
+            # Deltas from before a dropped entry can no longer be computed
+            self._log_start = generation
+
+
+def _item_key(item: DiagnosticItem) -> str:
+    return json.dumps(item, sort_keys=True)
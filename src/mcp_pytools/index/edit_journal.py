@@ -0,0 +1,93 @@
+# src/mcp_pytools/index/edit_journal.py
+
+import collections
+import dataclasses
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+
+class EditConflictError(Exception):
+    """Raised when a document changed after the edit that is being undone."""
+
+    def __init__(self, uris: List[str]):
+        super().__init__(f"Documents changed since the edit: {', '.join(uris)}")
+        self.uris = uris
+
+
+@dataclasses.dataclass
+class FileChange:
+    """The content of a document before and after an edit."""
+
+    uri: str
+    before: str
+    after: str
+
+
+@dataclasses.dataclass
+class Transaction:
+    """A set of document changes that were applied, and can be undone, together."""
+
+    id: int
+    description: str
+    timestamp: float
+    changes: List[FileChange]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "description": self.description,
+            "timestamp": self.timestamp,
+            "uris": [change.uri for change in self.changes],
+        }
+
+
+class EditJournal:
+    """
+    A bounded history of applied edit transactions, newest last, used to
+    undo them. This journal is thread-safe.
+    """
+
+    def __init__(self, max_transactions: int = 50):
+        self._transactions: Deque[Transaction] = collections.deque(maxlen=max_transactions)
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def record(self, description: str, changes: List[FileChange]) -> Transaction:
+        """Records an applied transaction, dropping the oldest one if full."""
+        with self._lock:
+            transaction = Transaction(
+                id=self._next_id, description=description, timestamp=time.time(), changes=changes
+            )
+            self._next_id += 1
+            self._transactions.append(transaction)
+            return transaction
+
+    def get(self, transaction_id: Optional[int] = None) -> Transaction:
+        """Gets a transaction by id, or the latest one.
+
+        Raises:
+            KeyError: If there is no such transaction in the journal.
+        """
+        with self._lock:
+            if transaction_id is None:
+                if not self._transactions:
+                    raise KeyError("No edits to undo")
+                return self._transactions[-1]
+            for transaction in self._transactions:
+                if transaction.id == transaction_id:
+                    return transaction
+            raise KeyError(f"No such edit: {transaction_id}")
+
+    def remove(self, transaction_id: int):
+        """Removes a transaction from the journal, e.g. after undoing it."""
+        with self._lock:
+            for transaction in self._transactions:
+                if transaction.id == transaction_id:
+                    self._transactions.remove(transaction)
+                    return
+
+    def transactions(self) -> List[Transaction]:
+        """Returns the recorded transactions, oldest first."""
+        with self._lock:
+            return list(self._transactions)
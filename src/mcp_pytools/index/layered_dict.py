@@ -0,0 +1,99 @@
+# src/mcp_pytools/index/layered_dict.py
+
+from typing import Dict, Generic, Iterator, MutableMapping, Optional, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# Deriving flattens a delta larger than this, or than 1/8 of the base.
+MIN_FLATTEN_SIZE = 256
+
+_ABSENT = object()
+_DELETED = object()
+
+
+class LayeredDict(MutableMapping[K, V], Generic[K, V]):
+    """
+    A dict made of a read-only base, shared with the dicts it was derived
+    from, and a delta of its own changes.
+
+    `derive` returns a copy that costs as much as the delta rather than the
+    whole dict, which keeps copy-on-write snapshots cheap while a few keys
+    are changed repeatedly. A delta that grows too large is merged into a
+    new base.
+    """
+
+    def __init__(self, base: Optional[Dict[K, V]] = None):
+        # Never modified once given to this dict
+        self._base: Dict[K, V] = base if base is not None else {}
+        self._delta: Dict[K, object] = {}
+        self._len = len(self._base)
+
+    def derive(self) -> "LayeredDict[K, V]":
+        """Returns a copy that can be changed without affecting this dict."""
+        if len(self._delta) > max(MIN_FLATTEN_SIZE, len(self._base) // 8):
+            return LayeredDict(self._flatten())
+        derived: LayeredDict[K, V] = LayeredDict(self._base)
+        derived._delta = dict(self._delta)
+        derived._len = self._len
+        return derived
+
+    def _flatten(self) -> Dict[K, V]:
+        merged = dict(self._base)
+        for key, value in self._delta.items():
+            if value is _DELETED:
+                merged.pop(key, None)
+            else:
+                merged[key] = value
+        return merged
+
+    def __getitem__(self, key: K) -> V:
+        value = self._delta.get(key, _ABSENT)
+        if value is _ABSENT:
+            return self._base[key]
+        if value is _DELETED:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        value = self._delta.get(key, _ABSENT)
+        if value is _ABSENT:
+            return self._base.get(key, default)
+        if value is _DELETED:
+            return default
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        value = self._delta.get(key, _ABSENT)
+        if value is _ABSENT:
+            return key in self._base
+        return value is not _DELETED
+
+    def __setitem__(self, key: K, value: V):
+        if key not in self:
+            self._len += 1
+        self._delta[key] = value
+
+    def __delitem__(self, key: K):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._base:
+            self._delta[key] = _DELETED
+        else:
+            del self._delta[key]
+        self._len -= 1
+
+    def __iter__(self) -> Iterator[K]:
+        delta = self._delta
+        for key in self._base:
+            if delta.get(key, _ABSENT) is not _DELETED:
+                yield key
+        for key, value in delta.items():
+            if value is not _DELETED and key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"LayeredDict({dict(self.items())!r})"
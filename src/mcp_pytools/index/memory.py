@@ -0,0 +1,99 @@
+# src/mcp_pytools/index/memory.py
+
+import ast
+import dataclasses
+import enum
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, TypeVar
+
+from mcp_pytools.astutils.parse_cache import PARSE_CACHE
+
+T = TypeVar("T")
+
+# The number of items of each structure that are measured.
+SAMPLE_SIZE = 16
+
+
+def estimate_memory(index: Any, sample_size: int = SAMPLE_SIZE) -> Dict[str, int]:
+    """Estimates the bytes held by the structures of an index.
+
+    Only a sample of the trees, symbols, imports and postings is measured,
+    and the sizes of the others are extrapolated from it, so the estimate
+    stays cheap on large projects. An object held by several structures,
+    such as a tree that is both indexed and in the parse cache, is counted
+    once.
+    """
+    snapshot = index.snapshot()
+    modules = snapshot.modules
+
+    resident = [(m.tree, m.lines) for m in modules.resident_modules()]
+    resident_ids = {id(tree) for tree, _ in resident}
+    cached = [(tree, lines) for tree, lines in PARSE_CACHE.trees() if id(tree) not in resident_ids]
+    bytes_per_line = _tree_bytes_per_line(resident + cached, sample_size)
+
+    texts = {}
+    for uri in modules:
+        text = modules.text(uri)
+        texts[id(text)] = text
+    cached_contents = [c for c in index.file_cache.cached_contents() if id(c) not in texts]
+
+    identifiers = snapshot.identifiers
+    return {
+        "syntax_trees": int(bytes_per_line * sum(len(lines) for _, lines in resident)),
+        "parse_cache": int(bytes_per_line * sum(len(lines) for _, lines in cached)),
+        "text": sum(sys.getsizeof(text) for text in texts.values()),
+        "file_cache": sum(sys.getsizeof(content) for content in cached_contents),
+        "symbols": _extrapolate(list(snapshot.symbols.values()), _deep_size, sample_size),
+        "imports": _extrapolate(list(snapshot.imports.values()), _deep_size, sample_size),
+        # The URIs and names in postings are shared with the other maps
+        "identifiers": _extrapolate(
+            list(identifiers), lambda name: sys.getsizeof(identifiers[name]), sample_size
+        )
+        + _extrapolate(
+            list(snapshot.identifiers_by_uri.values()), sys.getsizeof, sample_size
+        ),
+    }
+
+
+def _sample(items: Sequence[T], size: int) -> Sequence[T]:
+    """Picks up to `size` items spread evenly over a sequence."""
+    step = max(1, len(items) // size)
+    return items[::step][:size]
+
+
+def _extrapolate(items: Sequence[T], measure: Callable[[T], int], sample_size: int) -> int:
+    sample = _sample(items, sample_size)
+    if not sample:
+        return 0
+    return len(items) * sum(measure(item) for item in sample) // len(sample)
+
+
+def _tree_bytes_per_line(trees: List[Any], sample_size: int) -> float:
+    """The average size of a tree and its lines, per line of code."""
+    sample = _sample(trees, sample_size)
+    lines = sum(len(lines) for _, lines in sample)
+    if not lines:
+        return 0.0
+    size = 0
+    for tree, tree_lines in sample:
+        size += sys.getsizeof(tree_lines) + sum(sys.getsizeof(line) for line in tree_lines)
+        for node in ast.walk(tree):
+            size += sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+    return size / lines
+
+
+def _deep_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """The size of an object and of the containers and dataclasses it holds."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, enum.Enum):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif dataclasses.is_dataclass(obj):
+        size += sys.getsizeof(getattr(obj, "__dict__", ()))
+        size += sum(_deep_size(getattr(obj, f.name), seen) for f in dataclasses.fields(obj))
+    return size
@@ -0,0 +1,78 @@
+# src/mcp_pytools/index/module_store.py
+
+from typing import Iterator, List, MutableMapping, Optional, Union
+
+from mcp_pytools.astutils.parse_cache import PARSE_CACHE, ParseCache
+from mcp_pytools.astutils.parser import ParsedModule
+from mcp_pytools.index.layered_dict import LayeredDict
+
+
+class ModuleStore(MutableMapping[str, ParsedModule]):
+    """
+    The parsed modules of the index, by URI.
+
+    In compact mode only the text of a module is kept once it was indexed,
+    and its tree is parsed again through the parse cache when the module is
+    looked up; the parse cache then holds the recently used trees. Modules
+    stored with `pin=True` keep their tree in either mode.
+    """
+
+    def __init__(self, compact: bool = False, parse_cache: Optional[ParseCache] = None):
+        self.compact = compact
+        self._parse_cache = parse_cache or PARSE_CACHE
+        # A module, or the text of a module whose tree was dropped
+        self._entries: LayeredDict[str, Union[ParsedModule, str]] = LayeredDict()
+
+    def put(self, uri: str, module: ParsedModule, pin: bool = False):
+        """Stores a module, dropping its tree in compact mode unless pinned."""
+        if self.compact and not pin:
+            self._entries[uri] = module.text
+        else:
+            self._entries[uri] = module
+
+    def discard(self, uri: str):
+        """Removes a module, if present."""
+        self._entries.pop(uri, None)
+
+    def copy(self) -> "ModuleStore":
+        """Returns a store with the same modules, that can be changed separately."""
+        store = ModuleStore(compact=self.compact, parse_cache=self._parse_cache)
+        store._entries = self._entries.derive()
+        return store
+
+    def text(self, uri: str) -> Optional[str]:
+        """The text of a stored module, without parsing it again."""
+        entry = self._entries.get(uri)
+        if isinstance(entry, ParsedModule):
+            return entry.text
+        return entry
+
+    def resident_modules(self) -> List[ParsedModule]:
+        """The modules whose tree is kept by this store."""
+        return [entry for entry in self._entries.values() if isinstance(entry, ParsedModule)]
+
+    def resident_count(self) -> int:
+        """The number of modules whose tree is kept by this store."""
+        return len(self.resident_modules())
+
+    def __getitem__(self, uri: str) -> ParsedModule:
+        entry = self._entries[uri]
+        if isinstance(entry, ParsedModule):
+            return entry
+        # The text parsed before, so it cannot raise a syntax error
+        return self._parse_cache.parse(entry, uri)
+
+    def __setitem__(self, uri: str, module: ParsedModule):
+        self.put(uri, module)
+
+    def __delitem__(self, uri: str):
+        del self._entries[uri]
+
+    def __contains__(self, uri: object) -> bool:
+        return uri in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
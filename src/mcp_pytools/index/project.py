@@ -1,23 +1,44 @@
 # src/mcp_pytools/index/project.py
 
+import ast
+import collections
+import contextlib
+import contextvars
 import dataclasses
 import threading
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Set, Tuple
 
 from mcp_pytools.analysis.imports import ImportEdge, import_edges
 from mcp_pytools.analysis.symbols import Symbol, document_symbols
-from mcp_pytools.astutils.parser import ParsedModule, StructuredSyntaxError, parse_module
+from mcp_pytools.astutils.incremental import (
+    BlockUpdate,
+    TextEdit,
+    apply_text_edit,
+    reparse_edit,
+    shift_range,
+)
+from mcp_pytools.astutils.parse_cache import PARSE_CACHE
+from mcp_pytools.astutils.parser import ParsedModule, StructuredSyntaxError
+from mcp_pytools.cache import ResultCache
+from mcp_pytools.fs.atomic import replace_files
 from mcp_pytools.fs.cache import FileCache
 from mcp_pytools.fs.ignore import walk_text_files
+from mcp_pytools.fs.overlay import Overlay, OverlayStore
+from mcp_pytools.index.diagnostics_store import DiagnosticsStore
+from mcp_pytools.index.edit_journal import (
+    EditConflictError,
+    EditJournal,
+    FileChange,
+    Transaction,
+)
+from mcp_pytools.index.module_store import ModuleStore
+from mcp_pytools.index.scheduler import BuildScheduler
+from mcp_pytools.index.snapshot import IndexSnapshot, IndexStats
 
-
-@dataclasses.dataclass
-class IndexStats:
-    """Statistics about the indexing process."""
-
-    files_indexed: int = 0
-    parse_errors: int = 0
+# While building, a partial generation is published at least this often.
+PUBLISH_INTERVAL = 0.25
 
 
 class ProjectIndex:
@@ -26,89 +47,606 @@ class ProjectIndex:
     This class is responsible for scanning a project directory, parsing the
     Python files within it, and building an index of modules, symbols, and
     imports. It is designed to be thread-safe.
+
+    The indexed data lives in immutable `IndexSnapshot` generations. Writers
+    are serialized by `lock` and publish a new generation when done, so
+    readers never wait for them and never see a half-built index. Code that
+    reads several maps should do so inside `pinned()` to see one generation.
     """
 
-    def __init__(self, root: Path):
+    def __init__(self, root: Path, compact: bool = False):
         """Initializes the ProjectIndex.
 
         Args:
             root: The root directory of the project to index.
+            compact: If true, the trees of modules are dropped once their
+                symbols, imports and identifiers were extracted, and parsed
+                again when a tool needs them. Open documents keep their trees.
         """
         self.root = root
-        self.file_cache = FileCache()
+        self.overlays = OverlayStore()
+        self.file_cache = FileCache(overlays=self.overlays)
+        # Results derived from file contents, shared by tools
+        self.result_cache = ResultCache()
+        # Current lint diagnostics, refreshed lazily for re-indexed files
+        self.diagnostics = DiagnosticsStore()
+        # Edits applied by tools, for undo
+        self.edit_journal = EditJournal()
         self.lock = threading.RLock()
+        # Runs builds and batched re-indexing requested by tools
+        self.scheduler = BuildScheduler(self)
+
+        self._snapshot = IndexSnapshot(compact=compact)
+        # The snapshot being written, while a writer holds the lock
+        self._draft: Optional[IndexSnapshot] = None
+        # The files whose diagnostics the draft makes stale, marked on publish
+        self._draft_dirty: Set[str] = set()
+        self._draft_all_dirty = False
+        self._pinned: contextvars.ContextVar[Optional[IndexSnapshot]] = contextvars.ContextVar(
+            f"pinned_snapshot_{id(self)}", default=None
+        )
+
+        # The progress of the running build, guarded by its own condition so
+        # that waiting for files does not need the write lock
+        self._progress = threading.Condition()
+        self._building = False
+        self._listing_files = False
+        self._queue: Deque[Path] = collections.deque()
+        self._pending: Set[Path] = set()
+        self._priority: Deque[Path] = collections.deque()
+        self._unpublished: Set[Path] = set()
+        # When the running build started, how many files it found and indexed
+        self._build_started: Optional[float] = None
+        self._build_total: Optional[int] = None
+        self._build_done = 0
+
+    def snapshot(self) -> IndexSnapshot:
+        """Returns the generation pinned by `pinned()`, or else the latest one."""
+        return self._pinned.get() or self._snapshot
+
+    def latest(self) -> IndexSnapshot:
+        """Returns the latest published generation, even inside `pinned()`."""
+        return self._snapshot
+
+    @contextlib.contextmanager
+    def pinned(self) -> Iterator[IndexSnapshot]:
+        """Makes the index show one generation to the current context.
+
+        Inside the block, the properties and queries of the index read the
+        generation that was current when it was entered, or the ones that
+        this context wrote itself. Nested blocks keep the outer generation.
+        """
+        pinned = self._pinned.get()
+        if pinned is not None:
+            yield pinned
+            return
+        token = self._pinned.set(self._snapshot)
+        try:
+            yield self._snapshot
+        finally:
+            self._pinned.reset(token)
+
+    @property
+    def generation(self) -> int:
+        return self.snapshot().generation
+
+    @property
+    def modules(self) -> ModuleStore:
+        return self.snapshot().modules
 
-        self.modules: Dict[str, ParsedModule] = {}
-        self.symbols: Dict[str, List[Symbol]] = {}
-        self.imports: Dict[str, List[ImportEdge]] = {}
-        self.defs_by_name: Dict[str, List[Symbol]] = {}
-        self.stats = IndexStats()
+    @property
+    def symbols(self) -> Mapping[str, List[Symbol]]:
+        return self.snapshot().symbols
 
-    def build(self):
-        """Builds the project index by scanning and parsing all Python files."""
+    @property
+    def imports(self) -> Mapping[str, List[ImportEdge]]:
+        return self.snapshot().imports
+
+    @property
+    def defs_by_name(self) -> Mapping[str, List[Symbol]]:
+        return self.snapshot().defs_by_name
+
+    @property
+    def identifiers(self) -> Mapping[str, Set[str]]:
+        return self.snapshot().identifiers
+
+    @property
+    def stats(self) -> IndexStats:
+        return self.snapshot().stats
+
+    def build(self, cancel: Optional[threading.Event] = None) -> bool:
+        """Builds the project index by scanning and parsing all Python files.
+
+        Until a build completed, the index is built progressively: while
+        files are being indexed, partial generations (whose `complete` flag
+        is false) are published, and files passed to `ensure_indexed` are
+        indexed first. Once a complete generation exists, it is served until
+        the rebuild replaces it, so tools never see part of a project that
+        was fully indexed before.
+
+        Args:
+            cancel: If set while the build runs, the build stops before the
+                next file, leaving the last published generation current.
+                `ensure_indexed` then keeps waiting, for the build that is
+                expected to supersede it.
+
+        Returns:
+            False if the build was cancelled, else True.
+        """
+        cancelled = False
         with self.lock:
-            self.modules.clear()
-            self.symbols.clear()
-            self.imports.clear()
-            self.stats = IndexStats()
+            started = time.monotonic()
+            with self._progress:
+                self._building = True
+                self._listing_files = True
+                self._build_started = started
+                self._build_total = None
+                self._build_done = 0
+            try:
+                progressive = not self._snapshot.complete
+                self._draft = self._snapshot.empty()
+                # Files that are no longer found must lose their diagnostics too
+                self._draft_all_dirty = True
+
+                with self._draft.stats.timed("walk"):
+                    paths = dict.fromkeys(walk_text_files(self.root))
+                    # Documents that only exist as overlays
+                    paths.update(dict.fromkeys(self.overlays.paths()))
+                with self._progress:
+                    self._queue.extend(paths)
+                    self._pending.update(paths)
+                    self._build_total = len(paths)
+                    self._listing_files = False
+                    self._progress.notify_all()
+
+                last_publish = time.monotonic()
+                done = 0
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        cancelled = True
+                        return False
+                    with self._progress:
+                        self._build_done = done
+                        path, prioritized = self._next_pending()
+                    if path is None:
+                        break
+                    self._index_file(self._draft, path)
+                    done += 1
+                    if progressive and (
+                        prioritized or time.monotonic() - last_publish >= PUBLISH_INTERVAL
+                    ):
+                        self._publish(self._draft)
+                        self._draft = self._snapshot.derive()
+                        last_publish = time.monotonic()
 
-            for file_path in walk_text_files(self.root):
-                self._index_file(file_path)
+                self._draft.complete = True
+                self._draft.stats.build_seconds = time.monotonic() - started
+                self._publish(self._draft)
+                return True
+            finally:
+                self._drop_draft()
+                with self._progress:
+                    self._building = cancelled
+                    self._listing_files = cancelled
+                    self._build_started = None
+                    self._queue.clear()
+                    self._pending.clear()
+                    self._priority.clear()
+                    self._unpublished.clear()
+                    self._progress.notify_all()
 
-            self._build_cross_module_maps()
+    def announce_build(self):
+        """Makes `ensure_indexed` wait for a build about to start on another thread."""
+        with self._progress:
+            self._building = True
+            self._listing_files = True
+
+    def ensure_indexed(self, uris: List[str], timeout: Optional[float] = None) -> bool:
+        """Moves files to the front of the running build and waits for them.
+
+        Returns immediately if no build is running, or if the running build
+        rebuilds a complete generation, which is served until it finishes.
+
+        Args:
+            uris: The file URIs of the files needed.
+            timeout: The maximum number of seconds to wait.
+
+        Returns:
+            True if none of the files is still waiting to be indexed.
+        """
+        paths = [Path(uri[7:]) for uri in uris if uri.startswith("file://")]
+        with self._progress:
+            if self._building:
+                self._priority.extend(paths)
+            return self._progress.wait_for(
+                lambda: not self._building
+                or self._snapshot.complete
+                or not any(map(self._is_waiting, paths)),
+                timeout,
+            )
+
+    def pending_count(self) -> int:
+        """The number of files the running build has yet to index."""
+        with self._progress:
+            return len(self._pending)
+
+    def build_progress(self) -> Optional[Dict[str, Any]]:
+        """The progress of the running build, or None if no build is running.
+
+        The total and the estimates are None while files are being listed.
+        """
+        with self._progress:
+            if self._build_started is None:
+                return None
+            total, done = self._build_total, self._build_done
+            elapsed = time.monotonic() - self._build_started
+        rate = done / elapsed if done and elapsed > 0 else None
+        return {
+            "files_total": total,
+            "files_done": done,
+            "percent": 100.0 * done / total if total else None,
+            "elapsed_seconds": elapsed,
+            "files_per_second": rate,
+            "eta_seconds": (total - done) / rate if total is not None and rate else None,
+        }
+
+    def _is_waiting(self, path: Path) -> bool:
+        return self._listing_files or path in self._pending or path in self._unpublished
+
+    def _next_pending(self) -> Tuple[Optional[Path], bool]:
+        """Takes the next file to index, and whether it was requested.
+
+        The file counts as unpublished from now on, until the generation it
+        is indexed into is published.
+        """
+        for queue, prioritized in ((self._priority, True), (self._queue, False)):
+            while queue:
+                path = queue.popleft()
+                if path in self._pending:
+                    self._pending.discard(path)
+                    self._unpublished.add(path)
+                    return path, prioritized
+        return None, False
 
     def get_all_uris(self) -> List[str]:
         """Returns a list of all indexed URIs."""
-        with self.lock:
-            return list(self.modules.keys())
+        return self.snapshot().get_all_uris()
+
+    def uris_with_identifier(self, name: str) -> List[str]:
+        """Returns the indexed files whose text contains an identifier.
+
+        The postings are built from the raw text, so files that only mention
+        the name in a string or a comment are included too.
+        """
+        return self.snapshot().uris_with_identifier(name)
 
     def invalidate(self, uri: str):
-        """Invalidates the index for a given URI and rebuilds cross-module maps."""
-        with self.lock:
-            self._invalidate_uri(uri)
-            self._build_cross_module_maps()
+        """Invalidates the index for a given URI and updates cross-module maps."""
+        with self._writing() as snapshot:
+            self._invalidate_uri(snapshot, uri)
 
     def rebuild(self, uri: str):
         """Re-indexes a single file and updates the index."""
+        self.rebuild_many([uri])
+
+    def rebuild_many(self, uris: List[str]):
+        """Re-indexes several files in one pass.
+
+        Only the cross-module map entries of these files are replaced, so the
+        cost does not depend on the size of the project.
+        """
+        with self._writing() as snapshot:
+            for uri in uris:
+                self._invalidate_uri(snapshot, uri)
+                try:
+                    # A URI might not be a file URI, so handle this gracefully
+                    if uri.startswith("file://"):
+                        file_path = Path(uri[7:])
+                        if self.file_cache.exists(file_path):
+                            self._index_file(snapshot, file_path)
+                except Exception:
+                    # Ignore errors for non-existent files etc.
+                    pass
+
+    def open_document(self, uri: str, text: str, version: int = 0) -> Overlay:
+        """Opens an in-memory overlay for a document and re-indexes it.
+
+        Until the document is closed, the index and the file cache use the
+        overlay content instead of the file on disk.
+
+        Args:
+            uri: The file URI of the document.
+            text: The content of the document.
+            version: The client's version number of the content.
+
+        Returns:
+            The opened overlay.
+        """
+        with self._writing():
+            overlay = self.overlays.open(self._path_from_uri(uri), text, version)
+            self.rebuild(uri)
+            return overlay
+
+    def update_document(self, uri: str, text: str, version: Optional[int] = None) -> Overlay:
+        """Replaces the content of an open document and re-indexes it.
+
+        Args:
+            uri: The file URI of the document.
+            text: The new content of the document.
+            version: The client's version number of the content.
+
+        Returns:
+            The updated overlay.
+
+        Raises:
+            KeyError: If the document is not open.
+        """
+        with self._writing():
+            overlay = self.overlays.update(self._path_from_uri(uri), text, version)
+            self.rebuild(uri)
+            return overlay
+
+    def close_document(self, uri: str) -> bool:
+        """Closes the overlay of a document and re-indexes it from disk.
+
+        Returns:
+            True if the document was open.
+        """
+        with self._writing():
+            closed = self.overlays.close(self._path_from_uri(uri))
+            if closed is not None:
+                self.rebuild(uri)
+            return closed is not None
+
+    def apply_edits(
+        self, uri: str, edits: List[TextEdit], version: Optional[int] = None
+    ) -> Overlay:
+        """Applies ranged text edits to an open document and updates the index.
+
+        Each edit re-parses only the top-level statements it touches; the
+        symbols and imports of those statements are replaced and the ones
+        after them are shifted, so the cost of an edit does not depend on the
+        length of the file. If an edit cannot be applied incrementally, the
+        document is re-indexed in full.
+
+        Args:
+            uri: The file URI of the open document.
+            edits: The edits to apply, in order. Each edit's positions refer
+                to the text produced by the previous one.
+            version: The client's version number of the resulting content.
+
+        Returns:
+            The updated overlay.
+
+        Raises:
+            KeyError: If the document is not open.
+        """
+        with self._writing() as snapshot:
+            path = self._path_from_uri(uri)
+            overlay = self.overlays.get(path)
+            if overlay is None:
+                raise KeyError(uri)
+
+            text = overlay.text
+            module = snapshot.modules.get(uri)
+            if module is not None and module.text != text:
+                module = None
+            for edit in edits:
+                update = reparse_edit(module, edit) if module is not None else None
+                if update is None:
+                    text = apply_text_edit(text, edit)
+                    module = None
+                    continue
+                self._apply_block_update(snapshot, uri, update)
+                module = update.module
+                text = module.text
+
+            overlay = self.overlays.update(path, text, version)
+            if module is None:
+                self.rebuild(uri)
+            return overlay
+
+    def apply_changes(self, changes: Dict[str, str], description: str = "") -> Transaction:
+        """Replaces the content of several documents as one undoable transaction.
+
+        Files on disk are replaced atomically: either all of them are written
+        or none is. Open documents are changed in memory. All changed
+        documents are then re-indexed in one pass.
+
+        Args:
+            changes: The new text of each document, by file URI.
+            description: A description of the edit, for the journal.
+
+        Returns:
+            The recorded transaction.
+
+        Raises:
+            FileNotFoundError: If a document is neither open nor on disk.
+            OSError: If the files could not be written. Nothing was changed.
+        """
+        with self._writing():
+            file_changes = []
+            on_disk = {}
+            for uri, text in changes.items():
+                path = self._path_from_uri(uri)
+                overlay = self.overlays.get(path)
+                if overlay is not None:
+                    before = overlay.text
+                elif self.file_cache.exists(path):
+                    before = self.file_cache.get_text(path)
+                    on_disk[path] = text
+                else:
+                    raise FileNotFoundError(path)
+                file_changes.append(FileChange(uri=uri, before=before, after=text))
+
+            replace_files(on_disk)
+            self._update_overlays(changes)
+            self.rebuild_many(list(changes))
+            return self.edit_journal.record(description, file_changes)
+
+    def undo(self, transaction_id: Optional[int] = None, force: bool = False) -> Transaction:
+        """Reverts an applied transaction and removes it from the journal.
+
+        Args:
+            transaction_id: The transaction to undo. Defaults to the latest.
+            force: If true, documents that changed after the transaction are
+                reverted anyway.
+
+        Returns:
+            The transaction that was undone.
+
+        Raises:
+            KeyError: If the transaction is not in the journal.
+            EditConflictError: If a document changed after the transaction.
+            OSError: If the files could not be written. Nothing was changed.
+        """
+        with self._writing():
+            transaction = self.edit_journal.get(transaction_id)
+            if not force:
+                conflicts = [
+                    change.uri
+                    for change in transaction.changes
+                    if self.current_text(change.uri) != change.after
+                ]
+                if conflicts:
+                    raise EditConflictError(conflicts)
+
+            reverted = {change.uri: change.before for change in transaction.changes}
+            replace_files(
+                {
+                    self._path_from_uri(uri): text
+                    for uri, text in reverted.items()
+                    if self._path_from_uri(uri) not in self.overlays
+                }
+            )
+            self._update_overlays(reverted)
+            self.rebuild_many(list(reverted))
+            self.edit_journal.remove(transaction.id)
+            return transaction
+
+    def _update_overlays(self, changes: Dict[str, str]):
+        for uri, text in changes.items():
+            path = self._path_from_uri(uri)
+            if path in self.overlays:
+                self.overlays.update(path, text)
+
+    def current_text(self, uri: str) -> Optional[str]:
+        """The text of a document: open, else on disk, else None."""
+        path = self._path_from_uri(uri)
+        overlay = self.overlays.get(path)
+        if overlay is not None:
+            return overlay.text
+        if not self.file_cache.exists(path):
+            return None
+        return self.file_cache.get_text(path)
+
+    @staticmethod
+    def _path_from_uri(uri: str) -> Path:
+        if not uri.startswith("file://"):
+            raise ValueError(f"URI must be a file URI: {uri}")
+        return Path(uri[7:])
+
+    @contextlib.contextmanager
+    def _writing(self) -> Iterator[IndexSnapshot]:
+        """Holds the write lock and yields the next generation to change.
+
+        The generation is published when the block succeeds, and dropped if
+        it raises. Nested writes change the generation of the outermost one.
+        """
         with self.lock:
-            self._invalidate_uri(uri)
+            if self._draft is not None:
+                yield self._draft
+                return
+            self._draft = self._snapshot.derive()
             try:
-                # A URI might not be a file URI, so handle this gracefully
-                if uri.startswith("file://"):
-                    file_path = Path(uri[7:])
-                    if file_path.is_file():
-                        self._index_file(file_path)
-            except Exception:
-                # Ignore errors for non-existent files etc.
-                pass
-
-            self._build_cross_module_maps()
-
-    def _index_file(self, file_path: Path):
+                yield self._draft
+                self._publish(self._draft)
+            finally:
+                self._drop_draft()
+
+    def _publish(self, snapshot: IndexSnapshot):
+        """Makes a generation the current one. It must not be changed anymore."""
+        self._snapshot = snapshot
+        if self._pinned.get() is not None:
+            # A context reads its own writes
+            self._pinned.set(snapshot)
+        # Only once the changes can be read, so that whoever takes the dirty
+        # marks finds the files in the latest generation
+        if self._draft_all_dirty:
+            self.diagnostics.mark_all_dirty()
+        for uri in self._draft_dirty:
+            self.diagnostics.mark_dirty(uri)
+        self._draft_dirty.clear()
+        self._draft_all_dirty = False
+        with self._progress:
+            self._unpublished.clear()
+            self._progress.notify_all()
+
+    def _drop_draft(self):
+        """Forgets the draft, which was published or must be discarded."""
+        self._draft = None
+        self._draft_dirty.clear()
+        self._draft_all_dirty = False
+
+    def _index_file(self, snapshot: IndexSnapshot, file_path: Path):
         """Internal helper to index a single file."""
         uri = file_path.as_uri()
+        self._draft_dirty.add(uri)
         try:
-            text = self.file_cache.get_text(file_path)
-            module = parse_module(text, uri)
-
-            self.modules[uri] = module
-            self.symbols[uri] = document_symbols(module)
-            self.imports[uri] = import_edges(module)
+            stats = snapshot.stats
+            with stats.timed("read"):
+                text = self.file_cache.get_text(file_path)
+            with stats.timed("parse"):
+                module = PARSE_CACHE.parse(text, uri)
+            with stats.timed("symbols"):
+                symbols = document_symbols(module)
+            with stats.timed("imports"):
+                imports = import_edges(module)
 
-            self.stats.files_indexed += 1
+            snapshot.set_file(uri, module, symbols, imports, pin=file_path in self.overlays)
+            stats.files_indexed += 1
         except (StructuredSyntaxError, ValueError):
-            self.stats.parse_errors += 1
+            snapshot.stats.parse_errors += 1
         except Exception:
-            self.stats.parse_errors += 1
+            snapshot.stats.parse_errors += 1
+
+    def _apply_block_update(self, snapshot: IndexSnapshot, uri: str, update: BlockUpdate):
+        """Replaces the index entries of a re-parsed block of statements."""
+        block = ParsedModule(
+            tree=ast.Module(body=update.statements, type_ignores=[]),
+            text=update.module.text,
+            lines=update.module.lines,
+            uri=uri,
+        )
 
-    def _invalidate_uri(self, uri: str):
+        symbols = snapshot.symbols.get(uri, [])
+        before = [s for s in symbols if s.range.start.line < update.start_line]
+        after = [s for s in symbols if s.range.start.line > update.end_line]
+        edges = snapshot.imports.get(uri, [])
+        edges_before = [e for e in edges if e.range.start.line < update.start_line]
+        edges_after = [e for e in edges if e.range.start.line > update.end_line]
+        if update.line_delta:
+            # Copies, since older generations still hold the originals
+            after = [
+                dataclasses.replace(s, range=shift_range(s.range, update.line_delta))
+                for s in after
+            ]
+            edges_after = [
+                dataclasses.replace(e, range=shift_range(e.range, update.line_delta))
+                for e in edges_after
+            ]
+
+        # Only open documents are edited, and they keep their tree
+        snapshot.modules.put(uri, update.module, pin=True)
+        self._draft_dirty.add(uri)
+        snapshot.update_identifiers(uri, update.old_text, update.new_text, update.module.text)
+        snapshot.set_symbols(uri, before + document_symbols(block) + after)
+        snapshot.imports[uri] = edges_before + import_edges(block) + edges_after
+
+    def _invalidate_uri(self, snapshot: IndexSnapshot, uri: str):
         """Internal helper to remove all data for a URI."""
-        if uri in self.modules:
-            del self.modules[uri]
-        if uri in self.symbols:
-            del self.symbols[uri]
-        if uri in self.imports:
-            del self.imports[uri]
+        self._draft_dirty.add(uri)
+        snapshot.remove_file(uri)
 
         try:
             if uri.startswith("file://"):
@@ -116,20 +654,3 @@ class ProjectIndex:
                 self.file_cache.invalidate(file_path)
         except Exception:
             pass
-
-    def _build_cross_module_maps(self):
-        """Builds maps that require information from all modules."""
-        self.defs_by_name.clear()
-        for uri, symbols in self.symbols.items():
-            for symbol in symbols:
-                # Unqualified name
-                if symbol.name not in self.defs_by_name:
-                    self.defs_by_name[symbol.name] = []
-                self.defs_by_name[symbol.name].append(symbol)
-
-                # Qualified name
-                if symbol.container:
-                    q_name = f"{symbol.container}.{symbol.name}"
-                    if q_name not in self.defs_by_name:
-                        self.defs_by_name[q_name] = []
-                    self.defs_by_name[q_name].append(symbol)
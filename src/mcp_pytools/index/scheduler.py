@@ -0,0 +1,118 @@
+# src/mcp_pytools/index/scheduler.py
+
+import concurrent.futures
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class BuildScheduler:
+    """
+    Runs the full builds and file re-indexing of a `ProjectIndex` on a
+    single worker thread, so that they never contend with each other.
+
+    Requests made while the worker is busy are coalesced: a full build
+    cancels a running one, whose callers then wait for the new build, and
+    files to re-index are merged into one batch. A pending full build also
+    covers the files queued before it. The worker thread only lives while
+    there is work to do.
+    """
+
+    def __init__(self, index: Any):
+        self._index = index
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running: Optional[str] = None
+        self._cancel = threading.Event()
+        self._build_waiters: List[concurrent.futures.Future] = []
+        self._file_waiters: List[concurrent.futures.Future] = []
+        # The callers of the job taken last, to notify when it finishes
+        self._waiters: List[concurrent.futures.Future] = []
+        self._files: Dict[str, None] = {}
+        self.builds_cancelled = 0
+
+    def request_build(self) -> concurrent.futures.Future:
+        """Schedules a full build, cancelling any running one.
+
+        Returns:
+            A future that completes when a build started after this request
+            completes.
+        """
+        self._index.announce_build()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cond:
+            self._build_waiters.append(future)
+            if self._running == "build":
+                self._cancel.set()
+            self._wake()
+        return future
+
+    def request_rebuild(self, uris: List[str]) -> concurrent.futures.Future:
+        """Schedules files to be re-indexed with the other queued files.
+
+        Returns:
+            A future that completes when the files were re-indexed.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._cond:
+            self._files.update(dict.fromkeys(uris))
+            self._file_waiters.append(future)
+            self._wake()
+        return future
+
+    def status(self) -> Dict[str, Any]:
+        """The running job and the depth of the queue."""
+        with self._cond:
+            return {
+                "running": self._running,
+                "builds_queued": len(self._build_waiters),
+                "files_queued": len(self._files),
+                "builds_cancelled": self.builds_cancelled,
+            }
+
+    def _wake(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name="index-builder", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+
+    def _next_job(self) -> Optional[Callable[[], Any]]:
+        """Takes the next job off the queue. Must be called with the condition held."""
+        if self._build_waiters:
+            # A full build re-reads the queued files too
+            self._waiters = self._build_waiters + self._file_waiters
+            self._build_waiters, self._file_waiters, self._files = [], [], {}
+            self._running = "build"
+            self._cancel = threading.Event()
+            cancel = self._cancel
+            return lambda: self._index.build(cancel)
+        if self._files:
+            uris = list(self._files)
+            self._waiters = self._file_waiters
+            self._file_waiters, self._files = [], {}
+            self._running = "rebuild"
+            return lambda: self._index.rebuild_many(uris)
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                self._running = None
+                job = self._next_job()
+                if job is None:
+                    self._thread = None
+                    return
+                waiters = self._waiters
+            try:
+                result = job()
+            except BaseException as e:
+                for waiter in waiters:
+                    waiter.set_exception(e)
+                continue
+            if result is False:
+                # Cancelled: the callers get the result of the build that superseded it
+                with self._cond:
+                    self.builds_cancelled += 1
+                    self._build_waiters[:0] = waiters
+                continue
+            for waiter in waiters:
+                waiter.set_result(None)
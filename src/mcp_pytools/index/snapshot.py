@@ -0,0 +1,224 @@
+# src/mcp_pytools/index/snapshot.py
+
+import contextlib
+import dataclasses
+import re
+import time
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set
+
+from mcp_pytools.analysis.imports import ImportEdge
+from mcp_pytools.analysis.symbols import Symbol
+from mcp_pytools.astutils.parser import ParsedModule
+from mcp_pytools.index.layered_dict import LayeredDict
+from mcp_pytools.index.module_store import ModuleStore
+
+_IDENTIFIER = re.compile(r"[^\W\d]\w*")
+
+
+# The phases of indexing a file that are timed, in order.
+PHASES = ("walk", "read", "parse", "symbols", "imports", "cross_maps")
+
+
+@dataclasses.dataclass
+class PhaseTiming:
+    """Wall-clock and CPU time spent in one phase of indexing, in seconds."""
+
+    wall: float = 0.0
+    cpu: float = 0.0
+
+
+@dataclasses.dataclass
+class IndexStats:
+    """Statistics about the indexing process.
+
+    The timings cover the last full build and the files re-indexed since.
+    """
+
+    files_indexed: int = 0
+    parse_errors: int = 0
+    # The duration of the last full build, once it completed
+    build_seconds: Optional[float] = None
+    phases: Dict[str, PhaseTiming] = dataclasses.field(
+        default_factory=lambda: {phase: PhaseTiming() for phase in PHASES}
+    )
+
+    @contextlib.contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Adds the time spent in the block to a phase."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            timing = self.phases[phase]
+            timing.wall += time.perf_counter() - wall
+            timing.cpu += time.thread_time() - cpu
+
+    def copy(self) -> "IndexStats":
+        return dataclasses.replace(
+            self,
+            phases={phase: dataclasses.replace(t) for phase, t in self.phases.items()},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        files = self.files_indexed + self.parse_errors
+        return {
+            "files_indexed": self.files_indexed,
+            "parse_errors": self.parse_errors,
+            "build_seconds": self.build_seconds,
+            "files_per_second": files / self.build_seconds if self.build_seconds else None,
+            "phases": {
+                phase: {"wall_seconds": t.wall, "cpu_seconds": t.cpu}
+                for phase, t in self.phases.items()
+            },
+        }
+
+
+class IndexSnapshot:
+    """
+    One generation of the index: its modules, symbols, imports and the maps
+    derived from them.
+
+    A published snapshot is never modified, so it can be read without
+    locking. Writers `derive` a new snapshot, change it and publish it in
+    place of the old one. Deriving shares the maps through `LayeredDict`;
+    the lists and sets they contain are copied the first time the new
+    snapshot changes them.
+    """
+
+    def __init__(self, generation: int = 0, compact: bool = False):
+        self.generation = generation
+        # False while a build has only indexed part of the project
+        self.complete = False
+        self.modules = ModuleStore(compact=compact)
+        self.symbols: LayeredDict[str, List[Symbol]] = LayeredDict()
+        self.imports: LayeredDict[str, List[ImportEdge]] = LayeredDict()
+        self.defs_by_name: LayeredDict[str, List[Symbol]] = LayeredDict()
+        # Postings of every identifier-like word to the files containing it
+        self.identifiers: LayeredDict[str, Set[str]] = LayeredDict()
+        self.identifiers_by_uri: LayeredDict[str, FrozenSet[str]] = LayeredDict()
+        self.stats = IndexStats()
+        # The definition lists and postings this snapshot may change in place
+        self._owned_defs: Set[str] = set()
+        self._owned_postings: Set[str] = set()
+
+    def derive(self) -> "IndexSnapshot":
+        """Returns an unpublished copy of this snapshot, for the next generation."""
+        derived = IndexSnapshot(self.generation + 1)
+        derived.modules = self.modules.copy()
+        derived.symbols = self.symbols.derive()
+        derived.imports = self.imports.derive()
+        derived.defs_by_name = self.defs_by_name.derive()
+        derived.identifiers = self.identifiers.derive()
+        derived.identifiers_by_uri = self.identifiers_by_uri.derive()
+        derived.stats = self.stats.copy()
+        derived.complete = self.complete
+        return derived
+
+    def empty(self) -> "IndexSnapshot":
+        """Returns an unpublished, empty snapshot for the next generation."""
+        return IndexSnapshot(self.generation + 1, compact=self.modules.compact)
+
+    def get_all_uris(self) -> List[str]:
+        """Returns a list of all indexed URIs."""
+        return list(self.modules.keys())
+
+    def uris_with_identifier(self, name: str) -> List[str]:
+        """Returns the indexed files whose text contains an identifier."""
+        return sorted(self.identifiers.get(name, ()))
+
+    # The methods below must only be called on an unpublished snapshot.
+
+    def set_file(
+        self,
+        uri: str,
+        module: ParsedModule,
+        symbols: List[Symbol],
+        imports: List[ImportEdge],
+        pin: bool = False,
+    ):
+        """Stores the entries of a file, replacing any previous ones."""
+        with self.stats.timed("cross_maps"):
+            self.modules.put(uri, module, pin=pin)
+            self.set_symbols(uri, symbols)
+            self.imports[uri] = imports
+            self.set_identifiers(uri, module.text)
+
+    def remove_file(self, uri: str):
+        """Removes every entry of a file."""
+        self.modules.discard(uri)
+        self._remove_definitions(self.symbols.pop(uri, []))
+        self.imports.pop(uri, None)
+        self.set_identifiers(uri, "")
+
+    def set_symbols(self, uri: str, symbols: List[Symbol]):
+        """Replaces the symbols of a file and their definitions by name."""
+        self._remove_definitions(self.symbols.get(uri, []))
+        self.symbols[uri] = symbols
+        self._add_definitions(symbols)
+
+    def set_identifiers(self, uri: str, text: str):
+        """Replaces the identifier postings of a file."""
+        self._replace_identifiers(uri, frozenset(_IDENTIFIER.findall(text)))
+
+    def update_identifiers(self, uri: str, old_text: str, new_text: str, text: str):
+        """Updates the identifier postings of a file after part of it changed.
+
+        Only the changed part is scanned, unless it lost identifiers: they
+        may still occur elsewhere, so the whole new `text` is scanned then.
+        """
+        new = frozenset(_IDENTIFIER.findall(new_text))
+        if not new.issuperset(_IDENTIFIER.findall(old_text)):
+            self.set_identifiers(uri, text)
+            return
+        self._replace_identifiers(uri, self.identifiers_by_uri.get(uri, frozenset()) | new)
+
+    def _replace_identifiers(self, uri: str, new: FrozenSet[str]):
+        old = self.identifiers_by_uri.pop(uri, frozenset())
+        for name in old - new:
+            uris = self._owned_posting(name)
+            if uris is not None:
+                uris.discard(uri)
+                if not uris:
+                    del self.identifiers[name]
+        for name in new - old:
+            uris = self._owned_posting(name)
+            if uris is None:
+                uris = self.identifiers[name] = set()
+                self._owned_postings.add(name)
+            uris.add(uri)
+        if new:
+            self.identifiers_by_uri[uri] = new
+
+    def _owned_posting(self, name: str) -> Optional[Set[str]]:
+        uris = self.identifiers.get(name)
+        if uris is not None and name not in self._owned_postings:
+            uris = self.identifiers[name] = set(uris)
+            self._owned_postings.add(name)
+        return uris
+
+    def _add_definitions(self, symbols: List[Symbol]):
+        for symbol in symbols:
+            for name in _definition_names(symbol):
+                self._owned_definitions(name).append(symbol)
+
+    def _remove_definitions(self, symbols: List[Symbol]):
+        for symbol in symbols:
+            for name in _definition_names(symbol):
+                definitions = self._owned_definitions(name)
+                definitions[:] = [d for d in definitions if d is not symbol]
+                if not definitions:
+                    del self.defs_by_name[name]
+
+    def _owned_definitions(self, name: str) -> List[Symbol]:
+        if name not in self._owned_defs:
+            self.defs_by_name[name] = list(self.defs_by_name.get(name, ()))
+            self._owned_defs.add(name)
+        return self.defs_by_name.setdefault(name, [])
+
+
+def _definition_names(symbol: Symbol) -> List[str]:
+    """The unqualified and, if nested, qualified names of a definition."""
+    names = [symbol.name]
+    if symbol.container:
+        names.append(f"{symbol.container}.{symbol.name}")
+    return names
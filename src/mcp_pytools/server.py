@@ -1,14 +1,20 @@
 import argparse
+import json
 import threading
+import time
 from inspect import Parameter, Signature
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 
 from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.telemetry.metrics import TOOL_METRICS, MetricsFileWriter, ToolMetrics
+from mcp_pytools.telemetry.profiler import PROFILER, CallProfiler
+from mcp_pytools.telemetry.slow_log import SLOW_REQUESTS, SlowRequestLog
 from mcp_pytools.tools import tool_registry
 from mcp_pytools.tools.registry import ToolRegistry
+from mcp_pytools.tools.response_cache import RESPONSE_CACHE, ResponseCache
 from mcp_pytools.tools.tool import Tool, ToolContext
 
 mcp = FastMCP("Python Code Tools")
@@ -24,9 +30,9 @@ JSON_SCHEMA_TO_PYTHON_TYPE = {
 
 
 class ServerContext(ToolContext):
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, compact_index: bool = False):
         self._project_root = project_root
-        self._project_index = ProjectIndex(project_root)
+        self._project_index = ProjectIndex(project_root, compact=compact_index)
         self._index_ready = threading.Event()
         self._tool_registry = tool_registry
 
@@ -39,32 +45,80 @@ class ServerContext(ToolContext):
         return self._tool_registry
 
     def build_index(self):
-        def build():
-            print("Building project index...")
-            self._project_index.build()
-            print(
-                f"Index built. {len(self._project_index.modules)} modules indexed."
-            )
+        # Calls for single files can be answered as soon as those are indexed
+        print("Building project index...")
+        future = self._project_index.scheduler.request_build()
+
+        def built(future):
+            # A build superseded by `index_build` completes with the new one
+            if future.exception() is None:
+                print(
+                    f"Index built. {len(self._project_index.latest().modules)} modules indexed."
+                )
             self._index_ready.set()
 
-        thread = threading.Thread(target=build, daemon=True)
-        thread.start()
+        future.add_done_callback(built)
 
     def ensure_index_ready(self):
         """Blocks until the project index is ready."""
         self._index_ready.wait()
 
 
-def create_tool_handler(tool: Tool, context: ServerContext):
-    """Creates a handler function for a given tool that FastMCP can use."""
+def create_tool_handler(
+    tool: Tool,
+    context: ServerContext,
+    metrics: ToolMetrics = TOOL_METRICS,
+    slow_log: SlowRequestLog = SLOW_REQUESTS,
+    profiler: CallProfiler = PROFILER,
+    response_cache: Optional[ResponseCache] = RESPONSE_CACHE,
+):
+    """Creates a handler function for a given tool that FastMCP can use.
+
+    The latency, outcome and JSON size of every call are recorded in
+    `metrics`, slow calls are recorded in `slow_log`, and calls are profiled
+    when `profiler` is armed. The results of cacheable tools are reused from
+    `response_cache`.
+    """
+    cache = response_cache if tool.cacheable else None
 
     async def handler(**kwargs):
+        started = time.perf_counter()
+        with profiler.profile() as profile:
+            result, generation, size = await call_tool(**kwargs)
+        error = isinstance(result, dict) and "error" in result
+        if size is None:
+            size = _json_size(result)
+            if cache is not None and generation is not None and not error:
+                cache.put(tool.name, kwargs, generation, result, size)
+        seconds = time.perf_counter() - started
+        metrics.record(tool.name, seconds, size, error)
+        slow = slow_log.record(tool.name, kwargs, generation, seconds)
+        if profile is not None:
+            profiler.save(profile, tool.name, slow)
+        return result
+
+    async def call_tool(**kwargs) -> Tuple[Any, Optional[int], Optional[int]]:
+        """Runs the tool, returning its result, the index generation it read
+        and, for a cached result, its size as JSON."""
         try:
             if tool.requires_index:
-                context.ensure_index_ready()
+                uris = tool.indexed_uris(kwargs)
+                if uris is not None:
+                    context.project_index.ensure_indexed(uris)
+                if uris is None and not tool.accepts_partial_index:
+                    context.ensure_index_ready()
 
             # Note: We assume the concrete tool's handle method accepts the context.
-            return await tool.handle(context, **kwargs)
+            # Each call reads one generation of the index, however long it runs.
+            with context.project_index.pinned() as snapshot:
+                cached = cache.get(tool.name, kwargs, snapshot.generation) if cache else None
+                if cached is not None:
+                    result, size = cached
+                    return result, snapshot.generation, size
+                result = await tool.handle(context, **kwargs)
+            if tool.accepts_partial_index and not snapshot.complete and isinstance(result, dict):
+                result["incomplete"] = True
+            return result, snapshot.generation, None
         except Exception as e:
             # Basic error handling, can be improved.
             return {
@@ -73,7 +127,7 @@ def create_tool_handler(tool: Tool, context: ServerContext):
                     "message": f"Tool '{tool.name}' execution failed: {type(e).__name__}",
                     "data": str(e),
                 }
-            }
+            }, None, None
 
     # Dynamically create the function signature for FastMCP's inspection
     params = []
@@ -106,6 +160,14 @@ def create_tool_handler(tool: Tool, context: ServerContext):
     return handler
 
 
+def _json_size(result: Any) -> int:
+    """The size of a result serialized as compact JSON."""
+    try:
+        return len(json.dumps(result, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
 def main():
     """
     Main entry point for the MCP server.
@@ -117,12 +179,68 @@ def main():
         default=".",
         help="The root directory of the Python project.",
     )
+    parser.add_argument(
+        "--compact-index",
+        action="store_true",
+        help="Drop parsed trees after indexing and re-parse them on demand, "
+        "to use less memory on large projects.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="Write tool call metrics to this file in the Prometheus text format.",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=15.0,
+        help="Seconds between two writes of the metrics file.",
+    )
+    parser.add_argument(
+        "--slow-request-threshold",
+        type=float,
+        default=SLOW_REQUESTS.threshold,
+        help="Log tool calls that take at least this many seconds.",
+    )
+    parser.add_argument(
+        "--slow-request-log",
+        type=Path,
+        help="Also append slow tool calls to this file, as JSON lines.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=PROFILER.directory,
+        help="The directory where profiles of tool calls are saved.",
+    )
+    parser.add_argument(
+        "--profile-calls",
+        type=int,
+        default=0,
+        help="Profile the first N tool calls with cProfile.",
+    )
+    parser.add_argument(
+        "--profile-slow",
+        action="store_true",
+        help="Profile every tool call and save the profiles of the slow ones.",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Also take tracemalloc snapshots of the profiled calls.",
+    )
     args = parser.parse_args()
 
     project_root = Path(args.project_root).resolve()
 
-    context = ServerContext(project_root)
+    context = ServerContext(project_root, compact_index=args.compact_index)
     context.build_index()
+    if args.metrics_file:
+        MetricsFileWriter(TOOL_METRICS, args.metrics_file, args.metrics_interval).start()
+    SLOW_REQUESTS.threshold = args.slow_request_threshold
+    SLOW_REQUESTS.path = args.slow_request_log
+    PROFILER.directory = args.profile_dir
+    PROFILER.arm(calls=args.profile_calls, slow=args.profile_slow, memory=args.profile_memory)
 
     # Discover and register all tools with FastMCP
     for tool in tool_registry:
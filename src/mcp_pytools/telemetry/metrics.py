@@ -0,0 +1,178 @@
+# src/mcp_pytools/telemetry/metrics.py
+
+import bisect
+import dataclasses
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from mcp_pytools.fs.atomic import replace_files
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency buckets, in seconds; a last bucket holds the rest.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class LatencyHistogram:
+    """
+    A histogram of durations over fixed buckets, like a Prometheus histogram.
+
+    Recording is constant time and memory; percentiles are interpolated
+    within the bucket they fall in, so they are only as precise as the
+    buckets.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Estimates the duration below which a fraction of the calls took."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+@dataclasses.dataclass
+class ToolStats:
+    """The calls of one tool."""
+
+    calls: int = 0
+    errors: int = 0
+    result_bytes: int = 0
+    max_result_bytes: int = 0
+    latency: LatencyHistogram = dataclasses.field(default_factory=LatencyHistogram)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "result_bytes": self.result_bytes,
+            "max_result_bytes": self.max_result_bytes,
+            "latency_seconds": self.latency.to_dict(),
+        }
+
+
+class ToolMetrics:
+    """
+    Call counts, error counts, result sizes and latencies, by tool.
+    This class is thread-safe.
+    """
+
+    def __init__(self):
+        self._tools: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, seconds: float, result_bytes: int, error: bool):
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = ToolStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.result_bytes += result_bytes
+            stats.max_result_bytes = max(stats.max_result_bytes, result_bytes)
+            stats.latency.record(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {tool: stats.to_dict() for tool, stats in sorted(self._tools.items())}
+
+    def to_prometheus(self) -> str:
+        """Formats the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            tools = sorted(self._tools.items())
+            for name, kind, help_text, value in (
+                ("mcp_tool_calls_total", "counter", "Tool calls.", lambda s: s.calls),
+                ("mcp_tool_errors_total", "counter", "Failed tool calls.", lambda s: s.errors),
+                (
+                    "mcp_tool_result_bytes_total",
+                    "counter",
+                    "Bytes of JSON returned by tools.",
+                    lambda s: s.result_bytes,
+                ),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                lines += [f'{name}{{tool="{tool}"}} {value(stats)}' for tool, stats in tools]
+
+            name = "mcp_tool_latency_seconds"
+            lines += [f"# HELP {name} Tool call latency.", f"# TYPE {name} histogram"]
+            for tool, stats in tools:
+                histogram = stats.latency
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{tool="{tool}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{tool="{tool}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{tool="{tool}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path):
+        """Replaces a file with the metrics in the Prometheus text format."""
+        replace_files({path: self.to_prometheus()})
+
+
+class MetricsFileWriter:
+    """Writes metrics to a Prometheus text file periodically, on a daemon thread."""
+
+    def __init__(self, metrics: ToolMetrics, path: Path, interval: float = 15.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._write()
+        self._write()
+
+    def _write(self):
+        try:
+            self.metrics.write_prometheus(self.path)
+        except OSError:
+            logger.warning("Could not write metrics to %s", self.path, exc_info=True)
+
+
+# The metrics of the tool calls served by this process.
+TOOL_METRICS = ToolMetrics()
@@ -0,0 +1,138 @@
+# src/mcp_pytools/telemetry/profiler.py
+
+import collections
+import contextlib
+import cProfile
+import dataclasses
+import itertools
+import logging
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Where profiles are saved unless another directory is configured.
+DEFAULT_PROFILE_DIR = Path(tempfile.gettempdir()) / "mcp-pytools-profiles"
+
+
+@dataclasses.dataclass
+class CallProfile:
+    """The profiles taken of one tool call."""
+
+    cpu: cProfile.Profile
+    memory: Optional[tracemalloc.Snapshot] = None
+
+
+class CallProfiler:
+    """
+    Profiles tool calls on demand, with `cProfile` and optionally
+    `tracemalloc`, and saves the profiles for offline analysis.
+
+    Once armed, either the next `calls` calls are profiled and saved, or,
+    with `slow=True`, every call is profiled and only the slow ones are
+    saved. CPU profiles are written as `.prof` files for `pstats` and memory
+    snapshots as `.tracemalloc` files for `tracemalloc.Snapshot.load`.
+
+    A profile covers the thread the call runs on, so it also includes
+    whatever other calls the event loop ran meanwhile. Only one call is
+    profiled at a time; calls that overlap it are not profiled.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_PROFILE_DIR, max_saved: int = 20):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._remaining = 0
+        self._slow = False
+        self._memory = False
+        self._busy = False
+        self._counter = itertools.count(1)
+        self._saved: Deque[str] = collections.deque(maxlen=max_saved)
+
+    def arm(self, calls: int = 0, slow: bool = False, memory: bool = False):
+        """Profiles the next `calls` calls, or with `slow`, the slow calls."""
+        with self._lock:
+            self._remaining = calls
+            self._slow = slow
+            self._memory = memory
+
+    def disarm(self):
+        self.arm()
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "directory": str(self.directory),
+                "remaining_calls": self._remaining,
+                "slow_calls": self._slow,
+                "memory": self._memory,
+                "saved": list(self._saved),
+            }
+
+    @contextlib.contextmanager
+    def profile(self) -> Iterator[Optional[CallProfile]]:
+        """Profiles the block if armed, yielding the profile or None.
+
+        The profile is complete once the block exited.
+        """
+        with self._lock:
+            armed = (self._remaining > 0 or self._slow) and not self._busy
+            if armed:
+                self._busy = True
+                if self._remaining > 0:
+                    self._remaining -= 1
+            memory = self._memory
+        if not armed:
+            yield None
+            return
+
+        profile = CallProfile(cpu=cProfile.Profile())
+        started_tracing = memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            profile.cpu.enable()
+            try:
+                yield profile
+            finally:
+                profile.cpu.disable()
+                if memory:
+                    profile.memory = tracemalloc.take_snapshot()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            with self._lock:
+                self._busy = False
+
+    def save(self, profile: CallProfile, tool: str, slow: bool) -> List[Path]:
+        """Saves the profile of a call, unless only slow calls are kept and it was not.
+
+        Returns:
+            The files written.
+        """
+        with self._lock:
+            if self._slow and not slow:
+                return []
+            n = next(self._counter)
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{n:04d}-{tool}"
+        paths = [self.directory / f"{stem}.prof"]
+        if profile.memory is not None:
+            paths.append(self.directory / f"{stem}.tracemalloc")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profile.cpu.dump_stats(paths[0])
+            if profile.memory is not None:
+                profile.memory.dump(str(paths[1]))
+        except OSError:
+            logger.warning("Could not save the profile of %s", tool, exc_info=True)
+            return []
+        with self._lock:
+            self._saved.extend(str(path) for path in paths)
+        return paths
+
+
+# The profiler of the tool calls served by this process.
+PROFILER = CallProfiler()
@@ -0,0 +1,96 @@
+# src/mcp_pytools/telemetry/slow_log.py
+
+import collections
+import dataclasses
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Arguments are logged with strings and lists shortened to these lengths.
+MAX_STRING_LENGTH = 200
+MAX_LIST_LENGTH = 20
+
+
+@dataclasses.dataclass
+class SlowRequest:
+    """A tool call that took longer than the threshold."""
+
+    tool: str
+    arguments: Dict[str, Any]
+    generation: Optional[int]
+    seconds: float
+    timestamp: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+class SlowRequestLog:
+    """
+    Keeps the latest tool calls that took at least `threshold` seconds.
+
+    Slow calls are also logged as warnings and, if a `path` is given,
+    appended to it as JSON lines. Their arguments are shortened, so that
+    the text of a whole document is not logged. This class is thread-safe.
+    """
+
+    def __init__(self, threshold: float = 1.0, maxlen: int = 100, path: Optional[Path] = None):
+        self.threshold = threshold
+        self.path = path
+        self._entries: Deque[SlowRequest] = collections.deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(
+        self, tool: str, arguments: Dict[str, Any], generation: Optional[int], seconds: float
+    ) -> bool:
+        """Records a call if it was slow.
+
+        Returns:
+            Whether the call was slow.
+        """
+        if seconds < self.threshold:
+            return False
+        entry = SlowRequest(tool, _shorten(arguments), generation, seconds, time.time())
+        logger.warning(
+            "Slow call to %s took %.3fs at index generation %s: %s",
+            tool,
+            seconds,
+            generation,
+            entry.arguments,
+        )
+        with self._lock:
+            self._entries.append(entry)
+            if self.path is not None:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry.to_dict(), default=str) + "\n")
+                except OSError:
+                    logger.warning("Could not append to %s", self.path, exc_info=True)
+        return True
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """The slow calls kept, from oldest to latest."""
+        with self._lock:
+            return [entry.to_dict() for entry in self._entries]
+
+
+def _shorten(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > MAX_STRING_LENGTH:
+        return f"{value[:MAX_STRING_LENGTH]}... ({len(value)} characters)"
+    if isinstance(value, (list, tuple)):
+        items = [_shorten(item) for item in value[:MAX_LIST_LENGTH]]
+        if len(value) > MAX_LIST_LENGTH:
+            items.append(f"... ({len(value)} items)")
+        return items
+    if isinstance(value, dict):
+        return {key: _shorten(item) for key, item in value.items()}
+    return value
+
+
+# The slow calls served by this process.
+SLOW_REQUESTS = SlowRequestLog()
@@ -0,0 +1,159 @@
+import asyncio
+import concurrent.futures
+import contextvars
+from typing import Any, Dict, List, Optional
+
+from .tool import Tool, ToolContext
+
+# The maximum number of calls of a batch that run at the same time.
+MAX_CONCURRENT_CALLS = 8
+
+
+class BatchTool(Tool):
+    """A tool that runs many tool calls in one request, against one index generation."""
+
+    @property
+    def name(self) -> str:
+        return "batch"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Runs a list of tool calls in one request and returns their results in "
+            "order, each as `{\"result\": ...}` or `{\"error\": ...}` with the "
+            "`generation` of the index it read, which includes its own changes. All "
+            "calls read the same generation of the index, plus the changes made by "
+            "earlier calls of the batch. The response's `generation` is the one after "
+            "the last call. Consecutive read-only calls run concurrently."
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tool": {"type": "string"},
+                            "arguments": {"type": "object"},
+                        },
+                        "required": ["tool"],
+                    },
+                    "description": "The calls to run, as objects with the name of a "
+                    "`tool` and its `arguments`.",
+                }
+            },
+            "required": ["calls"],
+        }
+
+    def indexed_uris(self, arguments: Dict[str, Any]) -> Optional[List[str]]:
+        """The files named by the calls, or None if one of them needs the whole project."""
+        # The registry of the server; arguments do not come with a context
+        from . import tool_registry
+
+        uris: List[str] = []
+        for call in arguments.get("calls") or []:
+            tool = _lookup(tool_registry, call.get("tool"))
+            if tool is None or not tool.requires_index:
+                continue
+            call_uris = tool.indexed_uris(call.get("arguments") or {})
+            if call_uris is None:
+                return None
+            uris.extend(call_uris)
+        return uris
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Runs the calls of the batch."""
+        calls = kwargs["calls"]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        with context.project_index.pinned():
+            # Runs of read-only calls run concurrently; other calls may write,
+            # so they run one at a time, in order
+            concurrent_run: List[int] = []
+            for i, call in enumerate(calls):
+                tool = _lookup(context.tool_registry, call.get("tool"))
+                if tool is not None and tool.cacheable:
+                    concurrent_run.append(i)
+                    continue
+                await self._run_concurrently(context, calls, concurrent_run, results)
+                concurrent_run = []
+                results[i] = await _call(context, tool, call)
+            await self._run_concurrently(context, calls, concurrent_run, results)
+            # Includes the writes of the batch
+            generation = context.project_index.generation
+        return {"generation": generation, "results": results}
+
+    async def _run_concurrently(
+        self,
+        context: ToolContext,
+        calls: List[Dict[str, Any]],
+        indexes: List[int],
+        results: List[Optional[Dict[str, Any]]],
+    ):
+        if len(indexes) <= 1:
+            for i in indexes:
+                results[i] = await _call(context, _tool_of(context, calls[i]), calls[i])
+            return
+        loop = asyncio.get_running_loop()
+        workers = min(len(indexes), MAX_CONCURRENT_CALLS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each worker reads the generation pinned by this call
+            futures = [
+                loop.run_in_executor(
+                    executor,
+                    contextvars.copy_context().run,
+                    _call_in_thread,
+                    context,
+                    _tool_of(context, calls[i]),
+                    calls[i],
+                )
+                for i in indexes
+            ]
+            for i, result in zip(indexes, await asyncio.gather(*futures)):
+                results[i] = result
+
+
+def _lookup(registry: Any, name: Any) -> Optional[Tool]:
+    if not isinstance(name, str):
+        return None
+    try:
+        return registry.get_tool(name)
+    except ValueError:
+        return None
+
+
+def _tool_of(context: ToolContext, call: Dict[str, Any]) -> Optional[Tool]:
+    return _lookup(context.tool_registry, call.get("tool"))
+
+
+def _call_in_thread(context: ToolContext, tool: Optional[Tool], call: Dict[str, Any]):
+    return asyncio.run(_call(context, tool, call))
+
+
+async def _call(context: ToolContext, tool: Optional[Tool], call: Dict[str, Any]):
+    """Runs one call of a batch, returning its result or error."""
+    item = await _call_item(context, tool, call)
+    # After the call, so that its own writes are included
+    item["generation"] = context.project_index.generation
+    return item
+
+
+async def _call_item(context: ToolContext, tool: Optional[Tool], call: Dict[str, Any]):
+    if tool is None:
+        return _error(f"No tool named {call.get('tool')!r}")
+    if isinstance(tool, BatchTool):
+        return _error("Batches cannot be nested")
+    try:
+        return {"result": await tool.handle(context, **(call.get("arguments") or {}))}
+    except Exception as e:
+        return _error(f"Tool '{tool.name}' execution failed: {type(e).__name__}", str(e))
+
+
+def _error(message: str, data: Optional[str] = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"code": -32000, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"error": error}
@@ -0,0 +1,71 @@
+from typing import Any, Dict
+
+from .lint_project import iter_project_diagnostics
+from .tool import Tool, ToolContext
+
+
+class DiagnosticsDeltaTool(Tool):
+    """A tool that returns the lint diagnostics that changed since a generation."""
+
+    @property
+    def name(self) -> str:
+        return "diagnostics_delta"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Returns the lint diagnostics added and removed since the given "
+            "generation, together with the current generation to pass next time. "
+            "Only files re-indexed since the last call are re-linted. If `reset` is "
+            "true, the client should discard its diagnostics and use `added` as "
+            "the full set."
+        )
+
+    @property
+    def accepts_partial_index(self) -> bool:
+        return True
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "since": {
+                    "type": "integer",
+                    "default": 0,
+                    "description": (
+                        "The generation returned by the previous call, or 0 to get "
+                        "all current diagnostics."
+                    ),
+                },
+            },
+        }
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Refreshes the stale diagnostics and returns the changes."""
+        since = kwargs.get("since") or 0
+        index = context.project_index
+        store = index.diagnostics
+
+        dirty = [uri for uri in store.take_dirty() if uri.endswith(".py")]
+        # Files are marked dirty once their change is published, so the latest
+        # generation has it, whichever generation this context reads
+        snapshot = index.latest()
+        building = not snapshot.complete and index.build_progress() is not None
+        refreshed = set()
+        for uri, diagnostics in iter_project_diagnostics(
+            context, dirty, modules=snapshot.modules
+        ):
+            store.set(uri, [d.to_dict() for d in diagnostics])
+            refreshed.add(uri)
+        for uri in dirty:
+            if uri in refreshed:
+                continue
+            if building:
+                # The running build may not have indexed it yet
+                store.mark_dirty(uri)
+            else:
+                # Deleted, or no longer parses
+                store.remove(uri)
+
+        return store.delta(since)
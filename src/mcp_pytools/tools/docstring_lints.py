@@ -1,70 +1,55 @@
 import ast
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple, Type, Union
 
 from ..astutils.parser import Position, Range
-from .diagnostics import Diagnostic, DiagnosticSeverity
+from .pagination import PAGINATION_PROPERTIES, paginate
+from .rule_engine import LintRule, RuleContext, RuleEngine
 from .tool import Tool, ToolContext
 
 
-class DocstringVisitor(ast.NodeVisitor):
-    def __init__(self, uri: str, ignore_private: bool = False):
-        self.uri = uri
-        self.diagnostics: List[Diagnostic] = []
-        self.ignore_private = ignore_private
+def _has_docstring(node: ast.AST) -> bool:
+    return bool(
+        hasattr(node, "body")
+        and node.body
+        and isinstance(node.body[0], ast.Expr)
+        and isinstance(node.body[0].value, ast.Constant)
+        and isinstance(node.body[0].value.value, str)
+    )
 
-    def check_docstring(self, node: ast.AST, name: str):
-        if self.ignore_private and name.startswith("_"):
-            return
 
-        if not (
-            hasattr(node, "body")
-            and node.body
-            and isinstance(node.body[0], ast.Expr)
-            and isinstance(node.body[0].value, ast.Constant)
-            and isinstance(node.body[0].value.value, str)
-        ):
-            self.diagnostics.append(
-                Diagnostic(
-                    range=node._range,
-                    message=f"Missing docstring for '{name}'",
-                    severity=DiagnosticSeverity.WARNING,
-                )
-            )
+class MissingDocstringRule(LintRule):
+    """Reports modules, classes and functions without a docstring.
 
-    def visit_Module(self, node: ast.Module):
-        if not (
-            hasattr(node, "body")
-            and node.body
-            and isinstance(node.body[0], ast.Expr)
-            and isinstance(node.body[0].value, ast.Constant)
-            and isinstance(node.body[0].value.value, str)
-        ):
-            default_range = Range(
-                start=Position(line=0, column=0), end=Position(line=0, column=1)
-            )
-            self.diagnostics.append(
-                Diagnostic(
-                    range=default_range,
-                    message=f"Missing docstring for '{self.uri}'",
-                    severity=DiagnosticSeverity.WARNING,
-                )
-            )
-        self.generic_visit(node)
+    Honors the `ignore_private` option, which skips classes and functions
+    whose name starts with an underscore.
+    """
 
-    def visit_ClassDef(self, node: ast.ClassDef):
-        self.check_docstring(node, node.name)
-        self.generic_visit(node)
+    @property
+    def code(self) -> str:
+        return "missing-docstring"
 
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        self.check_docstring(node, node.name)
-        self.generic_visit(node)
+    @property
+    def node_types(self) -> Tuple[Type[ast.AST], ...]:
+        return (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
 
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        self.check_docstring(node, node.name)
-        self.generic_visit(node)
+    def check(self, node: ast.AST, context: RuleContext) -> None:
+        if _has_docstring(node):
+            return
+        if isinstance(node, ast.Module):
+            default_range = Range(
+                start=Position(line=0, column=0), end=Position(line=0, column=1)
+            )
+            context.report(default_range, f"Missing docstring for '{context.module.uri}'")
+            return
+        if context.options.get("ignore_private") and node.name.startswith("_"):
+            return
+        context.report(node._range, f"Missing docstring for '{node.name}'")
 
 
 class DocstringLintsTool(Tool):
+    def __init__(self):
+        self._engine = RuleEngine([MissingDocstringRule()])
+
     @property
     def name(self) -> str:
         return "docstring_lints"
@@ -77,6 +62,10 @@ class DocstringLintsTool(Tool):
             "documentation standards."
         )
 
+    @property
+    def cacheable(self) -> bool:
+        return True
+
     @property
     def schema(self) -> Dict[str, Any]:
         return {
@@ -94,17 +83,19 @@ class DocstringLintsTool(Tool):
                         "will be ignored."
                     ),
                 },
+                **PAGINATION_PROPERTIES,
             },
             "required": ["uri"],
         }
 
-    async def handle(self, context: ToolContext, **kwargs: Any) -> List[Dict[str, Any]]:
+    async def handle(
+        self, context: ToolContext, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         uri = kwargs["uri"]
         ignore_private = kwargs.get("ignore_private", False)
         module = context.project_index.modules.get(uri)
         if not module:
             return []
 
-        visitor = DocstringVisitor(uri, ignore_private)
-        visitor.visit(module.tree)
-        return [d.to_dict() for d in visitor.diagnostics]
+        diagnostics = self._engine.run(module, ignore_private=ignore_private)
+        return paginate(diagnostics, lambda d: [d.to_dict()], kwargs)
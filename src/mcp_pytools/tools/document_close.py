@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+from .tool import Tool, ToolContext
+
+
+class DocumentCloseTool(Tool):
+    """A tool to close an in-memory document overlay."""
+
+    @property
+    def name(self) -> str:
+        return "document_close"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Closes a document opened with 'document_open', discarding its in-memory "
+            "content. Tools then see the file on disk again."
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "uri": {
+                    "type": "string",
+                    "description": "The file URI of the open document.",
+                }
+            },
+            "required": ["uri"],
+        }
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Closes the overlay and re-indexes the document from disk."""
+        uri = kwargs["uri"]
+        if not context.project_index.close_document(uri):
+            return {"error": f"Document is not open: {uri}"}
+        return {"status": "ok", "uri": uri}
@@ -0,0 +1,48 @@
+from typing import Any, Dict
+
+from .tool import Tool, ToolContext
+
+
+class DocumentOpenTool(Tool):
+    """A tool to open an in-memory overlay for a document."""
+
+    @property
+    def name(self) -> str:
+        return "document_open"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Opens an in-memory version of a file, e.g. an unsaved editor buffer or a "
+            "proposed edit. Until it is closed, all tools see this content instead of "
+            "the file on disk. The file does not need to exist."
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "uri": {
+                    "type": "string",
+                    "description": "The file URI of the document.",
+                },
+                "text": {
+                    "type": "string",
+                    "description": "The full content of the document.",
+                },
+                "version": {
+                    "type": "integer",
+                    "description": "Optional version number of the content.",
+                },
+            },
+            "required": ["uri", "text"],
+        }
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Opens the overlay and re-indexes the document."""
+        uri = kwargs["uri"]
+        overlay = context.project_index.open_document(
+            uri, kwargs["text"], kwargs.get("version") or 0
+        )
+        return {"status": "ok", "uri": uri, "version": overlay.version}
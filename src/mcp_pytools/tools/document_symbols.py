@@ -1,9 +1,11 @@
 """Tool to provide a document symbol outline for a given file."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
 
 from ..analysis.symbols import Symbol
+from .pagination import PAGINATION_PROPERTIES, paginate
 from .tool import Tool, ToolContext
+from .wire_format import WIRE_FORMAT_PROPERTIES, ResultEncoder
 
 
 class DocumentSymbolsTool(Tool):
@@ -21,6 +23,10 @@ class DocumentSymbolsTool(Tool):
             "structure and contents."
         )
 
+    @property
+    def cacheable(self) -> bool:
+        return True
+
     @property
     def schema(self) -> Dict[str, Any]:
         return {
@@ -29,13 +35,29 @@ class DocumentSymbolsTool(Tool):
                 "uri": {
                     "type": "string",
                     "description": "The file URI of the Python module to analyze.",
-                }
+                },
+                **PAGINATION_PROPERTIES,
+                **WIRE_FORMAT_PROPERTIES,
             },
             "required": ["uri"],
         }
 
-    async def handle(self, context: ToolContext, **kwargs: Any) -> List[Dict[str, Any]]:
+    async def handle(
+        self, context: ToolContext, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """Handles a document symbols request."""
         uri = kwargs["uri"]
         symbols: List[Symbol] = context.project_index.symbols.get(uri, [])
-        return [symbol.to_dict() for symbol in symbols]
+        encoder = ResultEncoder(("name", "kind", "range", "container"), kwargs)
+
+        def encode(symbol: Symbol) -> List[Any]:
+            return [
+                encoder.encode(
+                    name=symbol.name,
+                    kind=symbol.kind.name,
+                    range=symbol.range,
+                    container=symbol.container,
+                )
+            ]
+
+        return encoder.finish(paginate(symbols, encode, kwargs))
@@ -0,0 +1,94 @@
+from typing import Any, Dict
+
+from ..astutils.incremental import TextEdit
+from ..astutils.parser import Range
+from .tool import Tool, ToolContext
+
+
+class DocumentUpdateTool(Tool):
+    """A tool to replace or edit the content of an open document overlay."""
+
+    @property
+    def name(self) -> str:
+        return "document_update"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Updates the in-memory content of a document opened with "
+            "'document_open' and re-indexes just that document. Either the full new "
+            "'text' or a list of ranged 'changes' can be given; changes only re-parse "
+            "the top-level statements they touch."
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "uri": {
+                    "type": "string",
+                    "description": "The file URI of the open document.",
+                },
+                "text": {
+                    "type": "string",
+                    "description": "The new full content of the document.",
+                },
+                "changes": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "range": {
+                                "type": "object",
+                                "description": (
+                                    "The range to replace, with 0-indexed 'start' and "
+                                    "'end' positions made of a 'line' and a character "
+                                    "'column'."
+                                ),
+                            },
+                            "text": {"type": "string"},
+                        },
+                        "required": ["range", "text"],
+                    },
+                    "description": (
+                        "Ranged edits to apply in order, each relative to the result of "
+                        "the previous one."
+                    ),
+                },
+                "version": {
+                    "type": "integer",
+                    "description": (
+                        "Optional version number of the content. Defaults to the "
+                        "previous version plus one."
+                    ),
+                },
+            },
+            "required": ["uri"],
+        }
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Updates the overlay and re-indexes the document."""
+        uri = kwargs["uri"]
+        text = kwargs.get("text")
+        changes = kwargs.get("changes")
+        if (text is None) == (changes is None):
+            return {"error": "Exactly one of 'text' or 'changes' must be given."}
+
+        edits = None
+        if changes is not None:
+            edits = [
+                TextEdit(range=Range.from_dict(change["range"]), new_text=change["text"])
+                for change in changes
+            ]
+
+        try:
+            if edits is not None:
+                overlay = context.project_index.apply_edits(uri, edits, kwargs.get("version"))
+            else:
+                overlay = context.project_index.update_document(
+                    uri, text, kwargs.get("version")
+                )
+        except KeyError:
+            return {"error": f"Document is not open: {uri}"}
+        return {"status": "ok", "uri": uri, "version": overlay.version}
@@ -1,10 +1,12 @@
 import ast
 import dataclasses
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Union
 
-from ..astutils.parser import Range, parse_module
+from ..analysis.symbols import Symbol
+from ..astutils.parser import Range
+from .pagination import PAGINATION_PROPERTIES, paginate
 from .tool import Tool, ToolContext
+from .wire_format import WIRE_FORMAT_PROPERTIES, ResultEncoder
 
 
 @dataclasses.dataclass
@@ -32,6 +34,10 @@ class FindDefinitionTool(Tool):
             "project-wide search."
         )
 
+    @property
+    def cacheable(self) -> bool:
+        return True
+
     @property
     def schema(self) -> Dict[str, Any]:
         return {
@@ -40,35 +46,41 @@ class FindDefinitionTool(Tool):
                 "symbol": {
                     "type": "string",
                     "description": "The name of the symbol to find the definition for.",
-                }
+                },
+                **PAGINATION_PROPERTIES,
+                **WIRE_FORMAT_PROPERTIES,
             },
             "required": ["symbol"],
         }
 
-    async def handle(self, context: ToolContext, **kwargs: Any) -> List[Dict[str, Any]]:
+    async def handle(
+        self, context: ToolContext, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """Handles a find definition request for a given symbol."""
         symbol = kwargs["symbol"]
-        locations: List[Location] = []
-        if symbol in context.project_index.defs_by_name:
-            for def_symbol in context.project_index.defs_by_name[symbol]:
-                for uri, symbols_in_doc in context.project_index.symbols.items():
-                    if def_symbol in symbols_in_doc:
-                        file_path = Path(uri.replace("file://", ""))
-                        file_content = context.project_index.file_cache.get_text(file_path)
-                        if file_content:
-                            module = parse_module(file_content, uri)
-                            for node in ast.walk(module.tree):
-                                if hasattr(node, "name") and node.name == symbol:
-                                    text = ast.get_source_segment(file_content, node)
-                                    if text:
-                                        locations.append(
-                                            Location(
-                                                uri=uri,
-                                                range=def_symbol.range,
-                                                text=text,
-                                            )
-                                        )
-                                        break
-                        # Assuming one symbol is in one doc
-                        break
-        return [loc.to_dict() for loc in locations]
+        index = context.project_index
+        encoder = ResultEncoder(("uri", "range", "text"), kwargs)
+
+        def find(def_symbol: Symbol) -> Iterator[Any]:
+            # The file defining the symbol mentions its name
+            for uri in index.uris_with_identifier(def_symbol.name):
+                if not any(s is def_symbol for s in index.symbols.get(uri, ())):
+                    continue
+                # The text the ranges refer to, rather than the file as it is now
+                module = index.modules.get(uri)
+                if module:
+                    for node in ast.walk(module.tree):
+                        if hasattr(node, "name") and node.name == symbol:
+                            text = ast.get_source_segment(module.text, node)
+                            if text:
+                                yield encoder.encode(
+                                    uri=uri,
+                                    range=def_symbol.range,
+                                    text=text,
+                                )
+                                break
+                # Assuming one symbol is in one doc
+                break
+
+        definitions = index.defs_by_name.get(symbol, [])
+        return encoder.finish(paginate(definitions, find, kwargs))
@@ -2,11 +2,11 @@
 Tool to find all references to a symbol."""
 
 import ast
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Union
 
-from .find_definition import Location
+from .pagination import PAGINATION_PROPERTIES, paginate
 from .tool import Tool, ToolContext
+from .wire_format import WIRE_FORMAT_PROPERTIES, ResultEncoder
 
 
 class ReferenceVisitor(ast.NodeVisitor):
@@ -51,9 +51,14 @@ class FindReferencesTool(Tool):
     def description(self) -> str:
         return (
             "Finds all references to a symbol by its name across the entire project. "
-            "This is a simple, text-based search."
+            "This is a simple, text-based search. Large results are paginated with "
+            "`limit` and `cursor`."
         )
 
+    @property
+    def cacheable(self) -> bool:
+        return True
+
     @property
     def schema(self) -> Dict[str, Any]:
         return {
@@ -62,28 +67,35 @@ class FindReferencesTool(Tool):
                 "symbol": {
                     "type": "string",
                     "description": "The name of the symbol to find references for.",
-                }
+                },
+                **PAGINATION_PROPERTIES,
+                **WIRE_FORMAT_PROPERTIES,
             },
             "required": ["symbol"],
         }
 
-    async def handle(self, context: ToolContext, **kwargs: Any) -> List[Dict[str, Any]]:
+    async def handle(
+        self, context: ToolContext, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         """Handles a find references request for a given symbol."""
         symbol = kwargs["symbol"]
-        locations: List[Location] = []
-        all_uris = context.project_index.get_all_uris()
-        for file_uri in all_uris:
-            file_module = context.project_index.modules.get(file_uri)
+        index = context.project_index
+        encoder = ResultEncoder(("uri", "range", "text"), kwargs)
+
+        def find(file_uri: str) -> Iterator[Any]:
+            file_module = index.modules.get(file_uri)
             if not file_module:
-                continue
+                return
 
             visitor = ReferenceVisitor(symbol)
             visitor.visit(file_module.tree)
+            # The text the ranges refer to, rather than the file as it is now
+            lines = file_module.lines
             for ref_node in visitor.references:
-                if hasattr(ref_node, "_range"):
-                    file_path = Path(file_uri.replace("file://", ""))
-                    file_content = context.project_index.file_cache.get_text(file_path)
-                    lines = file_content.splitlines()
+                if not hasattr(ref_node, "_range"):
+                    continue
+                text = None
+                if encoder.wants("text"):
                     start_line = ref_node._range.start.line
                     end_line = ref_node._range.end.line
                     start_col = ref_node._range.start.column
@@ -97,6 +109,7 @@ class FindReferencesTool(Tool):
                         text_lines.append(lines[end_line][:end_col])
                         text = "\n".join(text_lines)
 
-                    locations.append(Location(uri=file_uri, range=ref_node._range, text=text))
+                yield encoder.encode(uri=file_uri, range=ref_node._range, text=text)
 
-        return [loc.to_dict() for loc in locations]
+        # Sorted, so that cursors stay valid across generations
+        return encoder.finish(paginate(sorted(index.get_all_uris()), find, kwargs))
@@ -42,6 +42,14 @@ class ImportGraphTool(Tool):
     def description(self) -> str:
         return "Shows a module's direct imports and its dependents (reverse imports)."
 
+    @property
+    def accepts_partial_index(self) -> bool:
+        return True
+
+    @property
+    def cacheable(self) -> bool:
+        return True
+
     @property
     def schema(self) -> Dict[str, Any]:
         return {
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Dict
 
 from .tool import Tool, ToolContext
@@ -12,12 +13,20 @@ class IndexBuildTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Builds or rebuilds the entire project index."
+        return (
+            "Builds or rebuilds the entire project index. A build that is already "
+            "running is cancelled in favour of the new one."
+        )
+
+    @property
+    def requires_index(self) -> bool:
+        return False
 
     async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
         """Triggers a full rebuild of the project index."""
-        context.project_index.build()
+        index = context.project_index
+        await asyncio.wrap_future(index.scheduler.request_build())
         return {
             "status": "ok",
-            "message": f"Index built with {len(context.project_index.modules)} modules.",
+            "message": f"Index built with {len(index.latest().modules)} modules.",
         }
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any, Dict
 
 from .tool import Tool, ToolContext
@@ -12,7 +13,14 @@ class IndexInvalidateTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Invalidates and rebuilds a file in the project index."
+        return (
+            "Invalidates and rebuilds a file in the project index. Files invalidated "
+            "together are re-indexed in one batch."
+        )
+
+    @property
+    def requires_index(self) -> bool:
+        return False
 
     @property
     def schema(self) -> Dict[str, Any]:
@@ -30,7 +38,7 @@ class IndexInvalidateTool(Tool):
     async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
         """Handles an invalidate request."""
         uri = kwargs["uri"]
-        context.project_index.rebuild(uri)
+        await asyncio.wrap_future(context.project_index.scheduler.request_rebuild([uri]))
         return {
             "status": "ok",
             "message": f"URI '{uri}' invalidated and rebuilt.",
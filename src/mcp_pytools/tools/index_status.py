@@ -1,5 +1,7 @@
 from typing import Any, Dict
 
+from ..astutils.parse_cache import PARSE_CACHE
+from ..index.memory import estimate_memory
 from .tool import Tool, ToolContext
 
 
@@ -20,8 +22,23 @@ class IndexStatusTool(Tool):
 
     async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
         """Gets the status of the project index."""
-        stats = context.project_index.stats
+        index = context.project_index
+        stats = index.stats
+        timings = stats.to_dict()
         return {
+            "complete": index.snapshot().complete,
+            "pending_files": index.pending_count(),
+            "queue": index.scheduler.status(),
+            # The progress of the running build, with an estimate of its end
+            "build": index.build_progress(),
             "indexed_files": stats.files_indexed,
             "parse_errors": stats.parse_errors,
+            "parse_cache": PARSE_CACHE.stats.to_dict(),
+            "compact": context.project_index.modules.compact,
+            "resident_trees": context.project_index.modules.resident_count(),
+            "build_seconds": timings["build_seconds"],
+            "files_per_second": timings["files_per_second"],
+            "phases": timings["phases"],
+            # Approximate bytes held by each structure
+            "memory": estimate_memory(index),
         }
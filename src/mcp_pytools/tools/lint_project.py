@@ -0,0 +1,196 @@
+import concurrent.futures
+import fnmatch
+import itertools
+import logging
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from ..index.module_store import ModuleStore
+from .diagnostics import Diagnostic
+from .lints import LINT_ENGINE, lint_cache_key, lint_module, lint_text
+from .pagination import PAGINATION_PROPERTIES, page_fields, paginate
+from .tool import Tool, ToolContext
+
+logger = logging.getLogger(__name__)
+
+# Below this many modules to lint, a process pool costs more than it saves.
+_MIN_FILES_FOR_PROCESS_POOL = 32
+
+
+def select_python_uris(
+    context: ToolContext,
+    include_globs: Optional[List[str]] = None,
+    exclude_globs: Optional[List[str]] = None,
+) -> List[str]:
+    """Returns the URIs of the indexed Python modules matching the globs.
+
+    Args:
+        context: The tool context.
+        include_globs: If given, only paths matching one of them are kept.
+        exclude_globs: Paths matching one of them are skipped.
+
+    Returns:
+        The selected file URIs.
+    """
+    uris = []
+    for uri in context.project_index.get_all_uris():
+        path = uri[7:]
+        if not path.endswith(".py"):
+            continue
+        if include_globs and not any(fnmatch.fnmatch(path, glob) for glob in include_globs):
+            continue
+        if exclude_globs and any(fnmatch.fnmatch(path, glob) for glob in exclude_globs):
+            continue
+        uris.append(uri)
+    return uris
+
+
+def iter_project_diagnostics(
+    context: ToolContext,
+    uris: List[str],
+    ignore_private: bool = False,
+    max_workers: Optional[int] = None,
+    modules: Optional[ModuleStore] = None,
+) -> Iterator[Tuple[str, List[Diagnostic]]]:
+    """Lints many modules, reusing cached results.
+
+    Results are cached by the content hash of the indexed text. The modules
+    without a cached result are linted in a process pool when there are
+    enough of them, since linting is pure Python and threads would only
+    contend for the GIL.
+
+    Args:
+        context: The tool context.
+        uris: The file URIs of the modules to lint.
+        ignore_private: See `lints.lint_module`.
+        max_workers: The maximum number of worker processes.
+        modules: The modules to lint from. Defaults to those of the
+            generation the context reads.
+
+    Yields:
+        Tuples of a module URI and its diagnostics, cached ones first.
+        Modules that are not indexed are skipped.
+    """
+    index = context.project_index
+    if modules is None:
+        # One generation for all the modules, even if a write publishes another
+        modules = index.modules
+    pending: List[Tuple[str, str, Hashable]] = []
+    sentinel = object()
+    for uri in uris:
+        text = modules.text(uri)
+        if text is None:
+            continue
+        key = lint_cache_key(uri, text, ignore_private)
+        cached = index.result_cache.get(key, sentinel)
+        if cached is sentinel:
+            pending.append((uri, text, key))
+        else:
+            yield uri, cached
+
+    linted = _lint_all(modules, pending, ignore_private, max_workers)
+    for (uri, _, key), diagnostics in zip(pending, linted):
+        index.result_cache.put(key, diagnostics)
+        yield uri, diagnostics
+
+
+def _lint_all(
+    modules: ModuleStore,
+    pending: List[Tuple[str, str, Hashable]],
+    ignore_private: bool,
+    max_workers: Optional[int],
+) -> List[List[Diagnostic]]:
+    if len(pending) >= _MIN_FILES_FOR_PROCESS_POOL:
+        texts = [text for _, text, _ in pending]
+        uris = [uri for uri, _, _ in pending]
+        try:
+            workers = max_workers or os.cpu_count() or 1
+            # Few large chunks keep the pickling overhead per file low
+            chunksize = max(1, len(pending) // (4 * workers))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(
+                    executor.map(
+                        lint_text,
+                        texts,
+                        uris,
+                        itertools.repeat(ignore_private),
+                        chunksize=chunksize,
+                    )
+                )
+        except (OSError, BrokenProcessPool):
+            logger.warning("Process pool unavailable, linting in-process", exc_info=True)
+    # The indexed trees are reused in-process
+    return [lint_module(modules[uri], ignore_private) for uri, _, _ in pending]
+
+
+class LintProjectTool(Tool):
+    """A tool that runs every lint over all (or a subset of) the project's modules."""
+
+    @property
+    def name(self) -> str:
+        return "lint_project"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Runs all lint rules ("
+            + ", ".join(rule.code for rule in LINT_ENGINE.rules)
+            + ") over every Python module of the "
+            "project, or those matching the given globs, in parallel. Results are "
+            "cached by file content, so re-running after a change only re-lints the "
+            "changed files. Files with diagnostics are returned by URI; `limit` and "
+            "`cursor` page through them."
+        )
+
+    @property
+    def accepts_partial_index(self) -> bool:
+        return True
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "includeGlobs": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional list of glob patterns of files to lint.",
+                },
+                "excludeGlobs": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional list of glob patterns of files to skip.",
+                },
+                "ignore_private": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": (
+                        "If true, functions and classes starting with an underscore "
+                        "are not required to have docstrings."
+                    ),
+                },
+                **PAGINATION_PROPERTIES,
+            },
+        }
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Lints the selected modules of the project."""
+        include_globs = kwargs.get("includeGlobs")
+        exclude_globs = kwargs.get("excludeGlobs")
+        ignore_private = kwargs.get("ignore_private") or False
+
+        uris = select_python_uris(context, include_globs, exclude_globs)
+
+        # Every page lints all files, but pages after the first hit the cache
+        found = {
+            uri: diagnostics
+            for uri, diagnostics in iter_project_diagnostics(context, uris, ignore_private)
+            if diagnostics
+        }
+        files = paginate(
+            sorted(found),
+            lambda uri: [{"uri": uri, "diagnostics": [d.to_dict() for d in found[uri]]}],
+            kwargs,
+        )
+        return {"files_checked": len(uris), **page_fields("files", files)}
@@ -0,0 +1,41 @@
+"""Lints that can be run over any parsed module, with cached results."""
+
+import hashlib
+from typing import Hashable, List
+
+from ..astutils.parser import ParsedModule, parse_module
+from .diagnostics import Diagnostic
+from .docstring_lints import MissingDocstringRule
+from .mutability_check import MutableDefaultRule
+from .rule_engine import RuleEngine
+
+# Every registered rule, run in a single traversal per module.
+LINT_ENGINE = RuleEngine([MissingDocstringRule(), MutableDefaultRule()])
+
+
+def lint_module(module: ParsedModule, ignore_private: bool = False) -> List[Diagnostic]:
+    """Runs every registered lint rule over a module.
+
+    Args:
+        module: The module to lint.
+        ignore_private: If true, private classes and functions are not
+            required to have docstrings.
+
+    Returns:
+        The diagnostics of all rules.
+    """
+    return LINT_ENGINE.run(module, ignore_private=ignore_private)
+
+
+def lint_text(text: str, uri: str, ignore_private: bool = False) -> List[Diagnostic]:
+    """Parses and lints a source that is known to be valid Python.
+
+    This is a top-level function so that it can run in a worker process.
+    """
+    return lint_module(parse_module(text, uri), ignore_private)
+
+
+def lint_cache_key(uri: str, text: str, ignore_private: bool = False) -> Hashable:
+    """The result cache key of the diagnostics of a module's text."""
+    sha256 = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+    return ("lint", uri, sha256, LINT_ENGINE.version, ignore_private)
@@ -1,45 +1,34 @@
 import ast
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple, Type, Union
 
-from .diagnostics import Diagnostic, DiagnosticSeverity
+from .pagination import PAGINATION_PROPERTIES, paginate
+from .rule_engine import LintRule, RuleContext, RuleEngine
 from .tool import Tool, ToolContext
 
+_MUTABLE_DEFAULT_TYPES = (ast.List, ast.Dict, ast.Set, ast.Call)
 
-class MutabilityVisitor(ast.NodeVisitor):
-    def __init__(self, uri: str):
-        self.uri = uri
-        self.diagnostics: List[Diagnostic] = []
 
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        self.check_defaults(node)
-        self.generic_visit(node)
+class MutableDefaultRule(LintRule):
+    """Reports function arguments whose default value is mutable."""
 
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        self.check_defaults(node)
-        self.generic_visit(node)
+    @property
+    def code(self) -> str:
+        return "mutable-default"
+
+    @property
+    def node_types(self) -> Tuple[Type[ast.AST], ...]:
+        return (ast.FunctionDef, ast.AsyncFunctionDef)
 
-    def check_defaults(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
-        for default in node.args.defaults:
-            if isinstance(default, (ast.List, ast.Dict, ast.Set, ast.Call)):
-                self.diagnostics.append(
-                    Diagnostic(
-                        range=default._range,
-                        message="Mutable default argument",
-                        severity=DiagnosticSeverity.WARNING,
-                    )
-                )
-        for default in node.args.kw_defaults:
-            if default and isinstance(default, (ast.List, ast.Dict, ast.Set, ast.Call)):
-                self.diagnostics.append(
-                    Diagnostic(
-                        range=default._range,
-                        message="Mutable default argument",
-                        severity=DiagnosticSeverity.WARNING,
-                    )
-                )
+    def check(self, node: ast.AST, context: RuleContext) -> None:
+        for default in node.args.defaults + node.args.kw_defaults:
+            if default and isinstance(default, _MUTABLE_DEFAULT_TYPES):
+                context.report(default._range, "Mutable default argument")
 
 
 class MutabilityCheckTool(Tool):
+    def __init__(self):
+        self._engine = RuleEngine([MutableDefaultRule()])
+
     @property
     def name(self) -> str:
         return "mutability_check"
@@ -48,20 +37,25 @@ class MutabilityCheckTool(Tool):
     def description(self) -> str:
         return "Checks for mutable default arguments in a Python module."
 
+    @property
+    def cacheable(self) -> bool:
+        return True
+
     @property
     def schema(self) -> Dict[str, Any]:
         return {
             "type": "object",
-            "properties": {"uri": {"type": "string"}},
+            "properties": {"uri": {"type": "string"}, **PAGINATION_PROPERTIES},
             "required": ["uri"],
         }
 
-    async def handle(self, context: ToolContext, **kwargs: Any) -> List[Dict[str, Any]]:
+    async def handle(
+        self, context: ToolContext, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         uri = kwargs["uri"]
         module = context.project_index.modules.get(uri)
         if not module:
             return []
 
-        visitor = MutabilityVisitor(uri)
-        visitor.visit(module.tree)
-        return [d.to_dict() for d in visitor.diagnostics]
+        diagnostics = self._engine.run(module)
+        return paginate(diagnostics, lambda d: [d.to_dict()], kwargs)
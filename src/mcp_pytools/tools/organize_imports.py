@@ -1,10 +1,18 @@
+import collections
+import concurrent.futures
 import difflib
+import json
 import os
+import re
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
+from ..analysis.import_sorter import SortSettings, sort_imports
+from ..astutils.parse_cache import PARSE_CACHE
+from ..astutils.parser import StructuredSyntaxError
+from .lint_project import select_python_uris
 from .tool import Tool, ToolContext
 
 
@@ -17,8 +25,10 @@ class OrganizeImportsTool(Tool):
     def description(self) -> str:
         return (
             "Sorts and formats import statements in a Python file according to PEP 8 "
-            "standards using the 'ruff' linter. It can either return a diff of the "
-            "changes or apply them directly to the file."
+            "standards, compatible with isort and the 'ruff' linter. It can either "
+            "return a diff of the changes or apply them directly to the file. Pass "
+            "'uris' or 'includeGlobs' instead of 'uri' to organize many files at once; "
+            "changes to many files are applied all or nothing."
         )
 
     @property
@@ -30,6 +40,21 @@ class OrganizeImportsTool(Tool):
                     "type": "string",
                     "description": "The file URI of the Python module to organize imports for.",
                 },
+                "uris": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "The file URIs of several modules to organize imports for.",
+                },
+                "includeGlobs": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Glob patterns of indexed modules to organize imports for.",
+                },
+                "excludeGlobs": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Glob patterns of modules to skip when using 'includeGlobs'.",
+                },
                 "apply": {
                     "type": "boolean",
                     "default": False,
@@ -38,76 +63,289 @@ class OrganizeImportsTool(Tool):
                         "returns a diff of the proposed changes."
                     ),
                 },
+                "backend": {
+                    "type": "string",
+                    "enum": ["builtin", "ruff"],
+                    "default": "builtin",
+                    "description": (
+                        "The sorter to use. 'builtin' sorts in-process and leaves import "
+                        "blocks containing comments unchanged; 'ruff' runs the 'ruff' "
+                        "executable, which must be installed."
+                    ),
+                },
             },
-            "required": ["uri"],
         }
 
     async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
-        uri = kwargs["uri"]
+        uri = kwargs.get("uri")
         apply = kwargs.get("apply", False)
+        backend = kwargs.get("backend") or "builtin"
+
+        if backend not in ("builtin", "ruff"):
+            return {"error": f"Unknown backend: {backend}"}
+        if uri is None:
+            if kwargs.get("uris") is not None:
+                uris = kwargs["uris"]
+            elif kwargs.get("includeGlobs"):
+                uris = select_python_uris(
+                    context, kwargs["includeGlobs"], kwargs.get("excludeGlobs")
+                )
+            else:
+                return {"error": "One of 'uri', 'uris' or 'includeGlobs' is required"}
+            return self._organize_many(context, uris, apply, backend)
 
         if not uri.startswith("file://"):
             return {"error": "URI must be a file URI"}
 
         path = Path(uri[7:])
-        if not path.is_file():
+        if not context.project_index.file_cache.exists(path):
             return {"error": f"File not found: {path}"}
 
         original_content = context.project_index.file_cache.get_text(path)
 
-        env = os.environ.copy()
-        venv_bin_path = str(Path(sys.prefix) / "bin")
-        if "PATH" in env:
-            env["PATH"] = f"{venv_bin_path}:{env['PATH']}"
-        else:
-            env["PATH"] = venv_bin_path
-
-        ruff_executable = "ruff"
-        config_path = context.project_index.root / "pyproject.toml"
+        try:
+            if backend == "ruff":
+                fixed_content = self._run_ruff(context, path, original_content)
+            else:
+                settings = SortSettings.from_project(context.project_index.root)
+                fixed_content = self._sort_builtin(context, uri, original_content, settings)
+        except StructuredSyntaxError as e:
+            return {"error": f"Syntax error: {e}"}
+        except FileNotFoundError:
+            return {"error": "The 'ruff' executable was not found"}
+        except RuntimeError as e:
+            return {"error": str(e)}
 
         if apply:
-            subprocess.run(
-                [
-                    ruff_executable,
-                    "check",
-                    "--fix",
-                    "--config",
-                    str(config_path),
-                    str(path),
-                ],
-                capture_output=True,
-                text=True,
-                cwd=context.project_index.root,
-                env=env,
-            )
-            context.project_index.file_cache.invalidate(path)
-            return {"status": "ok"}
-        else:
-            run_result = subprocess.run(
-                [
-                    ruff_executable,
-                    "check",
-                    "--fix",
-                    "--config",
-                    str(config_path),
-                    "--stdin-filename",
-                    str(path),
-                ],
-                input=original_content,
-                capture_output=True,
-                text=True,
-                cwd=context.project_index.root,
-                env=env,
-            )
-
-            fixed_content = run_result.stdout
-
-            diff = "".join(
-                difflib.unified_diff(
-                    original_content.splitlines(keepends=True),
-                    fixed_content.splitlines(keepends=True),
-                    fromfile=str(path),
-                    tofile=str(path),
+            if fixed_content == original_content:
+                return {"status": "ok"}
+            try:
+                transaction = context.project_index.apply_changes(
+                    {uri: fixed_content}, f"Organize imports in {path.name}"
                 )
-            )
-            return {"diff": diff}
+            except OSError as e:
+                return {"error": f"Failed to write file: {e}"}
+            return {"status": "ok", "transaction_id": transaction.id}
+
+        return {"diff": _unified_diff(path, original_content, fixed_content)}
+
+    def _organize_many(
+        self, context: ToolContext, uris: List[str], apply: bool, backend: str
+    ) -> Dict[str, Any]:
+        """Organizes the imports of many files with one backend pass.
+
+        Nothing is written unless every file could be processed, and the
+        index is updated for all changed files at once.
+        """
+        index = context.project_index
+        errors: List[Dict[str, str]] = []
+        originals: Dict[str, str] = {}
+        for uri in uris:
+            path = Path(uri[7:])
+            if not uri.startswith("file://"):
+                errors.append({"uri": uri, "error": "URI must be a file URI"})
+            elif not index.file_cache.exists(path):
+                errors.append({"uri": uri, "error": f"File not found: {path}"})
+            else:
+                originals[uri] = index.file_cache.get_text(path)
+
+        try:
+            if backend == "ruff":
+                fixed, failed = self._run_ruff_batch(context, originals)
+            else:
+                fixed, failed = self._sort_builtin_batch(context, originals)
+        except FileNotFoundError:
+            return {"error": "The 'ruff' executable was not found"}
+        except RuntimeError as e:
+            return {"error": str(e)}
+        errors.extend(failed)
+        errors.sort(key=lambda e: e["uri"])
+
+        changed = {uri: text for uri, text in fixed.items() if text != originals[uri]}
+        if not apply:
+            files = [
+                {"uri": uri, "diff": _unified_diff(Path(uri[7:]), originals[uri], changed[uri])}
+                for uri in sorted(changed)
+            ]
+            return {"files_checked": len(uris), "files": files, "errors": errors}
+        if errors:
+            return {
+                "error": "Some files could not be organized; nothing was applied",
+                "errors": errors,
+            }
+
+        result = {"status": "ok", "files_checked": len(uris), "files_changed": sorted(changed)}
+        if changed:
+            try:
+                transaction = index.apply_changes(
+                    changed, f"Organize imports in {len(changed)} files"
+                )
+            except OSError as e:
+                return {"error": f"Failed to write files: {e}"}
+            result["transaction_id"] = transaction.id
+        return result
+
+    @staticmethod
+    def _sort_builtin(context: ToolContext, uri: str, content: str, settings: SortSettings) -> str:
+        """Sorts the imports in-process, reusing the indexed module if current."""
+        module = context.project_index.modules.get(uri)
+        if module is None or module.text != content:
+            module = PARSE_CACHE.parse(content, uri)
+        return sort_imports(module, settings)
+
+    def _sort_builtin_batch(
+        self, context: ToolContext, contents: Dict[str, str]
+    ) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
+        """Sorts the imports of many files on a thread pool."""
+        settings = SortSettings.from_project(context.project_index.root)
+        fixed: Dict[str, str] = {}
+        errors: List[Dict[str, str]] = []
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            futures = {
+                executor.submit(self._sort_builtin, context, uri, content, settings): uri
+                for uri, content in contents.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                uri = futures[future]
+                try:
+                    fixed[uri] = future.result()
+                except StructuredSyntaxError as e:
+                    errors.append({"uri": uri, "error": f"Syntax error: {e}"})
+        return fixed, errors
+
+    @staticmethod
+    def _run_ruff(context: ToolContext, path: Path, content: str) -> str:
+        """Sorts the imports of the content with a 'ruff check --fix' subprocess."""
+        config_path = context.project_index.root / "pyproject.toml"
+        run_result = subprocess.run(
+            [
+                "ruff",
+                "check",
+                # Only the isort rules, like a batch, whatever the project selects
+                "--select",
+                "I",
+                "--fix",
+                "--config",
+                str(config_path),
+                "--stdin-filename",
+                str(path),
+            ],
+            input=content,
+            capture_output=True,
+            text=True,
+            cwd=context.project_index.root,
+            env=_ruff_env(),
+        )
+        # ruff exits with 1 when violations remain after fixing
+        if run_result.returncode not in (0, 1):
+            raise RuntimeError(f"ruff failed: {run_result.stderr.strip()}")
+        return run_result.stdout
+
+    def _run_ruff_batch(
+        self, context: ToolContext, contents: Dict[str, str]
+    ) -> Tuple[Dict[str, str], List[Dict[str, str]]]:
+        """Sorts the imports of many files with a single ruff invocation.
+
+        ruff reports the fixes of its isort rules as JSON, and they are
+        applied here, so the files on disk are not touched. Open documents,
+        whose content is not on disk, are passed to ruff one by one.
+        """
+        index = context.project_index
+        fixed: Dict[str, str] = {}
+        on_disk = {}
+        for uri, content in contents.items():
+            path = Path(uri[7:])
+            if path in index.overlays:
+                fixed[uri] = self._run_ruff(context, path, content)
+            else:
+                on_disk[str(path)] = uri
+        if not on_disk:
+            return fixed, []
+
+        run_result = subprocess.run(
+            [
+                "ruff",
+                "check",
+                "--select",
+                "I",
+                "--output-format",
+                "json",
+                "--config",
+                str(index.root / "pyproject.toml"),
+                *on_disk,
+            ],
+            capture_output=True,
+            text=True,
+            cwd=index.root,
+            env=_ruff_env(),
+        )
+        if run_result.returncode not in (0, 1):
+            raise RuntimeError(f"ruff failed: {run_result.stderr.strip()}")
+
+        edits = collections.defaultdict(list)
+        errors = []
+        for diagnostic in json.loads(run_result.stdout or "[]"):
+            uri = on_disk.get(diagnostic["filename"])
+            if uri is None:
+                continue
+            fix = diagnostic.get("fix")
+            if fix and fix.get("applicability") == "safe":
+                edits[uri].extend(fix["edits"])
+            elif diagnostic.get("code") is None:
+                errors.append({"uri": uri, "error": diagnostic["message"]})
+        failed = {e["uri"] for e in errors}
+        for uri in on_disk.values():
+            if uri not in failed:
+                fixed[uri] = _apply_ruff_edits(contents[uri], edits[uri])
+        return fixed, errors
+
+
+def _ruff_env() -> Dict[str, str]:
+    """The environment for ruff subprocesses, with the venv's bin on PATH."""
+    env = os.environ.copy()
+    venv_bin_path = str(Path(sys.prefix) / "bin")
+    if "PATH" in env:
+        env["PATH"] = f"{venv_bin_path}:{env['PATH']}"
+    else:
+        env["PATH"] = venv_bin_path
+    return env
+
+
+def _apply_ruff_edits(text: str, edits: List[Dict[str, Any]]) -> str:
+    """Applies ruff fix edits, which use 1-indexed rows and columns, to a text.
+
+    Edits overlapping an earlier one are skipped, like in a single ruff fix pass.
+    """
+    line_starts = [0] + [m.end() for m in re.finditer(r"\r\n|\r|\n", text)]
+
+    def offset(location: Dict[str, int]) -> int:
+        row = location["row"] - 1
+        if row >= len(line_starts):
+            return len(text)
+        return line_starts[row] + location["column"] - 1
+
+    spans = sorted(
+        (offset(edit["location"]), offset(edit["end_location"]), edit.get("content") or "")
+        for edit in edits
+    )
+    parts = []
+    position = 0
+    for start, end, content in spans:
+        if start < position:
+            continue
+        parts.append(text[position:start])
+        parts.append(content)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def _unified_diff(path: Path, original: str, fixed: str) -> str:
+    return "".join(
+        difflib.unified_diff(
+            original.splitlines(keepends=True),
+            fixed.splitlines(keepends=True),
+            fromfile=str(path),
+            tofile=str(path),
+        )
+    )
@@ -0,0 +1,137 @@
+# src/mcp_pytools/tools/pagination.py
+
+import base64
+import hashlib
+import itertools
+import json
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar, Union
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+# Calls that give no `limit` return at most this many results.
+DEFAULT_MAX_RESULTS = 10_000
+
+# The arguments of the tools whose results are paginated.
+PAGINATION_PROPERTIES: Dict[str, Any] = {
+    "limit": {
+        "type": "integer",
+        "description": "The maximum number of results to return. When more results exist, "
+        "the response is an object with the page of `results`, `truncated: true` and a "
+        f"`next_cursor`. Defaults to {DEFAULT_MAX_RESULTS}.",
+    },
+    "cursor": {
+        "type": "string",
+        "description": "The `next_cursor` of the previous page, to get the next one. It is "
+        "only valid with the same other arguments, and while the set of searched files or "
+        "items stays the same.",
+    },
+}
+
+
+def paginate(
+    sources: Sequence[S],
+    find: Callable[[S], Iterable[T]],
+    arguments: Dict[str, Any],
+) -> Union[List[T], Dict[str, Any]]:
+    """Returns one page of the results found in a sequence of sources.
+
+    The sources, typically files, are searched in order with `find`, which
+    should produce its results lazily. Searching stops as soon as the page
+    is full, and only resumes from the page's cursor, so the cost of a page
+    does not depend on the total number of results.
+
+    A cursor records a fingerprint of the other arguments and of the
+    sources, so that it is rejected by another query, or once the sources
+    changed, instead of resuming at the wrong place.
+
+    Returns:
+        The results as a plain list when neither `limit` nor `cursor` was
+        given and they all fit, otherwise an object with the page of
+        `results`, whether it was `truncated`, and the `next_cursor` if so.
+
+    Raises:
+        ValueError: If the cursor is invalid, or was made for another query
+            or other sources.
+    """
+    limit = arguments.get("limit")
+    cursor = arguments.get("cursor")
+    paged = limit is not None or cursor is not None
+    limit = max(1, limit) if limit is not None else DEFAULT_MAX_RESULTS
+    position, skip = 0, 0
+    if cursor:
+        position, skip, fingerprint = _decode_cursor(cursor)
+        if fingerprint != _fingerprint(sources, arguments):
+            raise ValueError(
+                "The cursor was made for another query, or the results changed since; "
+                "start again without a cursor"
+            )
+
+    results: List[T] = []
+    next_cursor = None
+    for index in range(position, len(sources)):
+        found = iter(find(sources[index]))
+        if index == position and skip:
+            found = itertools.islice(found, skip, None)
+            taken = skip
+        else:
+            taken = 0
+        for result in found:
+            if len(results) == limit:
+                # This result starts the next page
+                next_cursor = _encode_cursor(index, taken, _fingerprint(sources, arguments))
+                break
+            results.append(result)
+            taken += 1
+        if next_cursor is not None:
+            break
+
+    if not paged and next_cursor is None:
+        return results
+    return {"results": results, "truncated": next_cursor is not None, "next_cursor": next_cursor}
+
+
+def page_fields(field: str, page: Union[List[Any], Dict[str, Any]]) -> Dict[str, Any]:
+    """Returns the fields of a page of results, for tools that return an object.
+
+    Args:
+        field: The name of the field holding the results.
+        page: The result of `paginate`.
+
+    Returns:
+        The results under `field`, plus `truncated` and `next_cursor` for a page.
+    """
+    if isinstance(page, list):
+        return {field: page}
+    return {
+        field: page["results"],
+        "truncated": page["truncated"],
+        "next_cursor": page["next_cursor"],
+    }
+
+
+def _fingerprint(sources: Sequence[Any], arguments: Dict[str, Any]) -> str:
+    """A short hash of the query arguments, other than paging, and of the sources."""
+    query = {
+        name: value
+        for name, value in arguments.items()
+        if name not in ("cursor", "limit") and value is not None
+    }
+    data = json.dumps([query, [str(source) for source in sources]], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+
+
+def _encode_cursor(position: int, skip: int, fingerprint: str) -> str:
+    data = json.dumps([position, skip, fingerprint]).encode("ascii")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[int, int, str]:
+    """Returns the source to resume from, its results to skip, and the fingerprint."""
+    try:
+        position, skip, fingerprint = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii"))
+        )
+        return int(position), int(skip), str(fingerprint)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
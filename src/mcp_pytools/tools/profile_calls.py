@@ -0,0 +1,65 @@
+from typing import Any, Dict
+
+from ..telemetry.profiler import PROFILER
+from .tool import Tool, ToolContext
+
+
+class ProfileCallsTool(Tool):
+    """A tool that profiles the next tool calls, for offline analysis."""
+
+    @property
+    def name(self) -> str:
+        return "profile_calls"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Profiles the next `calls` tool calls with cProfile, or with `slow`, every "
+            "call, keeping the profiles of the calls slower than the slow-request "
+            "threshold. With `memory`, tracemalloc snapshots are taken too. Profiles "
+            "are saved as files, which are listed in the result. `stop` disarms it."
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "integer",
+                    "default": 0,
+                    "description": "The number of upcoming calls to profile.",
+                },
+                "slow": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Profile every call and keep the slow ones.",
+                },
+                "memory": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Also take tracemalloc snapshots.",
+                },
+                "stop": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Stop profiling.",
+                },
+            },
+        }
+
+    @property
+    def requires_index(self) -> bool:
+        return False
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Arms or disarms the profiler and reports its state."""
+        if kwargs.get("stop"):
+            PROFILER.disarm()
+        elif kwargs.get("calls") or kwargs.get("slow"):
+            PROFILER.arm(
+                calls=kwargs.get("calls") or 0,
+                slow=bool(kwargs.get("slow")),
+                memory=bool(kwargs.get("memory")),
+            )
+        return PROFILER.status()
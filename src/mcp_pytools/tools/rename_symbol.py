@@ -1,7 +1,8 @@
-from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from ..analysis.rename import RenameEngine, RenameError, RenamePlan
+from ..astutils.parser import Position
 from .tool import Tool, ToolContext
 
 
@@ -12,7 +13,18 @@ class RenameSymbolTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Renames a symbol and all its references across the project."
+        return (
+            "Renames a symbol and all its references across the project. Names are "
+            "resolved by scope and through imports, so other symbols with the same name "
+            "are left alone. Identify the symbol by 'uri', 'line' and 'column' of any of "
+            "its occurrences, or by 'old_name' (optionally with the 'uri' of the module "
+            "defining it). Attribute accesses whose receiver type cannot be determined "
+            "are reported as 'unresolved' and not changed."
+        )
+
+    def indexed_uris(self, arguments: Dict[str, Any]) -> Optional[List[str]]:
+        # References may be anywhere in the project
+        return None
 
     @property
     def schema(self) -> Dict[str, Any]:
@@ -27,66 +39,112 @@ class RenameSymbolTool(Tool):
                     "type": "string",
                     "description": "The new name for the symbol.",
                 },
+                "uri": {
+                    "type": "string",
+                    "description": "The file URI of the module containing the symbol.",
+                },
+                "line": {
+                    "type": "integer",
+                    "description": "0-indexed line of an occurrence of the symbol in 'uri'.",
+                },
+                "column": {
+                    "type": "integer",
+                    "description": "0-indexed character column of the occurrence.",
+                },
                 "apply": {
                     "type": "boolean",
                     "default": False,
                     "description": (
                         "If true, applies the changes directly to the files. If false, "
-                        "returns a list of references that would be changed."
+                        "returns the edits and the references that would be changed."
                     ),
                 },
             },
-            "required": ["old_name", "new_name"],
+            "required": ["new_name"],
         }
 
     async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
-        old_name = kwargs["old_name"]
-        new_name = kwargs["new_name"]
+        old_name = kwargs.get("old_name")
+        new_name = kwargs.get("new_name")
+        uri = kwargs.get("uri")
+        if uri is None and kwargs.get("file_path"):
+            # Older clients pass a path instead of a URI
+            uri = Path(kwargs["file_path"]).as_uri()
+        line = kwargs.get("line")
+        column = kwargs.get("column")
         apply = kwargs.get("apply", False)
 
-        if not old_name or not new_name:
+        if not new_name or not (old_name or (uri and line is not None and column is not None)):
             return {"error": "Old symbol name and new name cannot be empty."}
 
-        find_references_tool = context.tool_registry.get_tool("find_references")
-        references = await find_references_tool.handle(context, symbol=old_name)
+        index = context.project_index
+
+        def plan_rename() -> RenamePlan:
+            with index.pinned():
+                engine = RenameEngine(index)
+                if line is not None and column is not None and uri:
+                    definition = engine.definition_at(uri, Position(line=line, column=column))
+                else:
+                    definition = engine.definition_named(old_name, uri)
+                return engine.plan(definition, new_name)
 
-        if not references:
-            return {"error": f"No references found for symbol: {old_name}"}
+        try:
+            plan = plan_rename()
+        except RenameError as e:
+            return {"error": str(e)}
 
+        unresolved = [{"uri": u, "range": r.to_dict()} for u, r in plan.unresolved]
         if not apply:
-            return {"status": "ok", "references": references}
-
-        modified_files = set()
-        grouped_references = defaultdict(list)
-        for ref in references:
-            grouped_references[ref["uri"]].append(ref)
-
-        for file_uri, refs in grouped_references.items():
-            file_path = file_uri.replace("file://", "")
-            path = Path(file_path)
-            if not path.is_file():
-                continue
-
-            content = path.read_text()
-            lines = content.splitlines(True)
-
-            # Sort refs by line and column in reverse order
-            refs.sort(key=lambda r: (r["range"]["start"]["line"], r["range"]["start"]["column"]), reverse=True)
-
-            for ref in refs:
-                line_num = ref["range"]["start"]["line"]
-                start_char = ref["range"]["start"]["column"]
-
-                line = lines[line_num]
-                # The range from find_references can be broad. Find the exact position.
-                actual_start = line.find(old_name, start_char)
-                if actual_start != -1:
-                    end_char = actual_start + len(old_name)
-                    lines[line_num] = line[:actual_start] + new_name + line[end_char:]
-
-            modified_content = "".join(lines)
-            path.write_text(modified_content)
-            modified_files.add(str(path))
-            context.project_index.file_cache.invalidate(path)
-
-        return {"status": "ok", "modified_files": list(modified_files)}
+            old = plan.definition[1].name
+            references = [
+                {"uri": edit_uri, "range": e.range.to_dict(), "text": old}
+                for edit_uri, edits in sorted(plan.edit.changes.items())
+                for e in edits
+            ]
+            return {
+                "status": "ok",
+                "references": references,
+                "edit": plan.edit.to_dict(),
+                "unresolved": unresolved,
+            }
+
+        with index.lock:
+            stale = _stale_uris(index, plan)
+            if stale:
+                # The edits were planned on an outdated index of these files
+                index.rebuild_many(stale)
+                try:
+                    plan = plan_rename()
+                except RenameError as e:
+                    return {"error": str(e)}
+                unresolved = [{"uri": u, "range": r.to_dict()} for u, r in plan.unresolved]
+                stale = _stale_uris(index, plan)
+                if stale:
+                    return {"error": f"Files changed while renaming: {', '.join(stale)}"}
+
+            changes = plan.edit.changes
+            new_texts = {
+                file_uri: plan.edit.apply(file_uri, plan.texts[file_uri]) for file_uri in changes
+            }
+            try:
+                transaction = index.apply_changes(
+                    new_texts, f"Rename {plan.definition[1].name} to {new_name}"
+                )
+            except OSError as e:
+                return {"error": f"Failed to write files: {e}"}
+
+        return {
+            "status": "ok",
+            "modified_files": sorted(file_uri[7:] for file_uri in changes),
+            "unresolved": unresolved,
+            "transaction_id": transaction.id,
+        }
+
+
+def _stale_uris(index: Any, plan: RenamePlan) -> List[str]:
+    """The edited documents whose text differs from the one the plan analyzed."""
+    return sorted(
+        file_uri
+        for file_uri in plan.edit.changes
+        if index.current_text(file_uri) != plan.texts[file_uri]
+    )
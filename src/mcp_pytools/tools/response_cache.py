@@ -0,0 +1,56 @@
+# src/mcp_pytools/tools/response_cache.py
+
+import json
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ..cache import CacheStats, ResultCache
+
+# Results larger than this, as JSON, are not cached.
+MAX_CACHED_RESULT_BYTES = 1024 * 1024
+
+
+class ResponseCache:
+    """
+    A bounded LRU cache of the results of cacheable tools, keyed by the tool,
+    its normalized arguments and the index generation the call read.
+
+    Since every write to the index publishes a new generation, cached
+    results are never stale; those of older generations are evicted as
+    newer ones are cached. Results are shared between calls and must not be
+    modified. This cache is thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_result_bytes: int = MAX_CACHED_RESULT_BYTES):
+        self._results = ResultCache(maxsize)
+        self.max_result_bytes = max_result_bytes
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._results.stats
+
+    def get(
+        self, tool: str, arguments: Dict[str, Any], generation: int
+    ) -> Optional[Tuple[Any, int]]:
+        """Returns a cached result and its size as JSON, or None."""
+        return self._results.get(self.key(tool, arguments, generation))
+
+    def put(self, tool: str, arguments: Dict[str, Any], generation: int, result: Any, size: int):
+        """Caches a result, unless it is larger than `max_result_bytes`."""
+        if size <= self.max_result_bytes:
+            self._results.put(self.key(tool, arguments, generation), (result, size))
+
+    def clear(self):
+        self._results.clear()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def key(tool: str, arguments: Dict[str, Any], generation: int) -> Hashable:
+        # Omitted optional arguments are passed as None
+        given = {name: value for name, value in arguments.items() if value is not None}
+        return (tool, json.dumps(given, sort_keys=True, default=str), generation)
+
+
+# The responses cached by the tool handlers of this process.
+RESPONSE_CACHE = ResponseCache()
@@ -0,0 +1,109 @@
+"""A lint rule engine that runs many rules in a single traversal of the AST."""
+
+import ast
+import dataclasses
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Tuple, Type
+
+from ..astutils.parser import ParsedModule, Range
+from .diagnostics import Diagnostic, DiagnosticSeverity
+
+
+@dataclasses.dataclass
+class RuleContext:
+    """The state shared by the rules while linting one module."""
+
+    module: ParsedModule
+    options: Dict[str, Any]
+    diagnostics: List[Diagnostic] = dataclasses.field(default_factory=list)
+
+    def report(
+        self,
+        range: Range,
+        message: str,
+        severity: DiagnosticSeverity = DiagnosticSeverity.WARNING,
+    ):
+        """Records a diagnostic."""
+        self.diagnostics.append(Diagnostic(range=range, message=message, severity=severity))
+
+
+class LintRule(ABC):
+    """Abstract base class for a lint rule.
+
+    A rule declares the AST node types it inspects, and the engine calls
+    `check` only for nodes of those types.
+    """
+
+    @property
+    @abstractmethod
+    def code(self) -> str:
+        """A unique identifier of the rule."""
+        pass
+
+    @property
+    @abstractmethod
+    def node_types(self) -> Tuple[Type[ast.AST], ...]:
+        """The AST node types the rule inspects. Subclasses are included."""
+        pass
+
+    @property
+    def version(self) -> int:
+        """The version of the rule. Bump it when the rule's output changes."""
+        return 1
+
+    @abstractmethod
+    def check(self, node: ast.AST, context: RuleContext) -> None:
+        """Inspects a node and reports diagnostics to the context."""
+        pass
+
+
+class RuleEngine:
+    """Runs a set of lint rules over modules with one traversal per module."""
+
+    def __init__(self, rules: Iterable[LintRule]):
+        """Initializes the engine and its node type dispatch table.
+
+        Args:
+            rules: The rules to run.
+        """
+        self.rules: List[LintRule] = list(rules)
+        self._dispatch: Dict[Type[ast.AST], Tuple[LintRule, ...]] = {}
+        for node_type in _node_classes(ast.AST):
+            matching = tuple(r for r in self.rules if issubclass(node_type, r.node_types))
+            if matching:
+                self._dispatch[node_type] = matching
+
+    @property
+    def version(self) -> str:
+        """An identifier of the rule set, for caching results."""
+        return ",".join(f"{rule.code}:{rule.version}" for rule in self.rules)
+
+    def run(self, module: ParsedModule, **options: Any) -> List[Diagnostic]:
+        """Lints a module with all rules.
+
+        Nodes are visited in the same depth-first order as `ast.NodeVisitor`.
+
+        Args:
+            module: The module to lint.
+            **options: Options for the rules, e.g. `ignore_private`.
+
+        Returns:
+            The diagnostics reported by the rules.
+        """
+        context = RuleContext(module=module, options=options)
+        dispatch = self._dispatch
+        stack = [module.tree]
+        while stack:
+            node = stack.pop()
+            for rule in dispatch.get(type(node), ()):
+                rule.check(node, context)
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+        return context.diagnostics
+
+
+def _node_classes(base: Type[ast.AST]) -> List[Type[ast.AST]]:
+    """Returns a class and all its subclasses."""
+    classes = [base]
+    for subclass in base.__subclasses__():
+        classes.extend(_node_classes(subclass))
+    return classes
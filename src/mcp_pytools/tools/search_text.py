@@ -3,11 +3,25 @@
 import dataclasses
 import fnmatch
 import re
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Union
 
-from ..astutils.parser import Position, Range
+from ..astutils.parser import Range
+from ..fs.cache import FileCache
 from ..fs.ignore import walk_text_files
+from .pagination import PAGINATION_PROPERTIES, paginate
 from .tool import Tool, ToolContext
+from .wire_format import WIRE_FORMAT_PROPERTIES, ResultEncoder
+
+# Line boundaries recognised by str.splitlines() other than "\n", encoded as
+# UTF-8. Buffers containing any of them take the decoded path so that line
+# numbers and end-of-line anchors behave identically.
+_EXTRA_LINE_BREAKS = re.compile(rb"[\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+# Escapes whose meaning differs between str and bytes patterns.
+_UNSAFE_BYTES_ESCAPES = set("wWsSdDbBAZxuUN0123456789")
+
+_NEWLINE_COUNT_CHUNK = 1024 * 1024
 
 
 @dataclasses.dataclass
@@ -34,9 +48,14 @@ class SearchTextTool(Tool):
         return (
             "Performs a case-sensitive regular expression search across all text files "
             "in the project, respecting .gitignore rules. Returns a list of all "
-            "matching lines."
+            "matching lines, paginated with `limit` and `cursor` when there are many."
         )
 
+    @property
+    def requires_index(self) -> bool:
+        # Files are read from disk and overlays, not from the index
+        return False
+
     @property
     def schema(self) -> Dict[str, Any]:
         return {
@@ -56,46 +75,162 @@ class SearchTextTool(Tool):
                     "items": {"type": "string"},
                     "description": "Optional list of glob patterns to exclude from the search.",
                 },
+                **PAGINATION_PROPERTIES,
+                **WIRE_FORMAT_PROPERTIES,
             },
             "required": ["pattern"],
         }
 
-    async def handle(self, context: ToolContext, **kwargs: Any) -> List[Dict[str, Any]]:
+    async def handle(
+        self, context: ToolContext, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
         pattern = kwargs["pattern"]
         includeGlobs = kwargs.get("includeGlobs")
         excludeGlobs = kwargs.get("excludeGlobs")
 
-        matches: List[Match] = []
         try:
             regex = re.compile(pattern)
         except re.error:
             return []  # Invalid regex, return no matches
+        bytes_regex = _compile_bytes_regex(pattern)
+        file_cache = context.project_index.file_cache
+        encoder = ResultEncoder(("uri", "range", "line"), kwargs)
 
-        for path in walk_text_files(context.project_index.root):
-            # Filtering based on includeGlobs and excludeGlobs
-            if includeGlobs and not any(
-                fnmatch.fnmatch(str(path), glob) for glob in includeGlobs
-            ):
-                continue
-            if excludeGlobs and any(
-                fnmatch.fnmatch(str(path), glob) for glob in excludeGlobs
-            ):
-                continue
+        paths = list(walk_text_files(context.project_index.root))
+        # Open documents that do not exist on disk yet
+        seen = set(paths)
+        paths.extend(
+            path
+            for path in context.project_index.overlays.paths()
+            if path not in seen and context.project_index.root in path.parents
+        )
 
+        # Filtering based on includeGlobs and excludeGlobs
+        if includeGlobs:
+            paths = [p for p in paths if any(fnmatch.fnmatch(str(p), g) for g in includeGlobs)]
+        if excludeGlobs:
+            paths = [
+                p for p in paths if not any(fnmatch.fnmatch(str(p), g) for g in excludeGlobs)
+            ]
+
+        def find(path: Path) -> List[Any]:
             uri = path.as_uri()
             try:
-                content = context.project_index.file_cache.get_text(path)
+                if bytes_regex is not None and file_cache.prefers_buffer(path):
+                    found = _search_buffer(file_cache, path, uri, regex, bytes_regex, encoder)
+                    if found is not None:
+                        return found
+                content = file_cache.get_text(path)
                 lines = content.splitlines()
+                matches: List[Any] = []
                 for i, line_text in enumerate(lines):
-                    for match in regex.finditer(line_text):
-                        start_pos = Position(line=i, column=match.start())
-                        end_pos = Position(line=i, column=match.end())
-                        match_range = Range(start=start_pos, end=end_pos)
-                        matches.append(
-                            Match(uri=uri, range=match_range, line=line_text)
-                        )
+                    matches.extend(_match_line(regex, uri, i, line_text, encoder))
+                return matches
             except Exception:
                 # Ignore files that can't be read
-                continue
+                return []
+
+        return encoder.finish(paginate(paths, find, kwargs))
+
+
+def _match_line(
+    regex: Pattern[str], uri: str, line_no: int, line_text: str, encoder: ResultEncoder
+) -> List[Any]:
+    """Returns the encoded matches of a regex within a single line."""
+    return [
+        encoder.encode(
+            uri=uri, range=(line_no, match.start(), line_no, match.end()), line=line_text
+        )
+        for match in regex.finditer(line_text)
+    ]
+
+
+def _compile_bytes_regex(pattern: str) -> Optional[Pattern[bytes]]:
+    """Compiles a bytes version of a pattern if it is safe to scan raw UTF-8.
+
+    A pattern qualifies when it is ASCII and avoids constructs whose meaning
+    depends on decoding or on the line terminator (any-character wildcards,
+    negated classes, Unicode aware or numeric escapes, negative lookarounds
+    and inline flags). For such patterns every match in the
+    decoded text is also a match in the raw bytes, so the bytes regex can be
+    used to locate candidate lines without missing any.
+
+    Args:
+        pattern: The user supplied regular expression.
+
+    Returns:
+        The compiled bytes pattern, or None if the pattern does not qualify.
+    """
+    if not pattern.isascii():
+        return None
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if pattern[i + 1:i + 2] in _UNSAFE_BYTES_ESCAPES:
+                return None
+            i += 2
+            continue
+        if char == ".":
+            return None
+        if char == "[" and pattern[i + 1:i + 2] == "^":
+            return None
+        if char == "(" and pattern[i + 1:i + 2] == "?" and pattern[i + 2:i + 3] not in (
+            ":", "=", "P"
+        ):
+            return None
+        i += 1
+    try:
+        return re.compile(pattern.encode("ascii"), re.MULTILINE)
+    except re.error:
+        return None
+
+
+def _search_buffer(
+    file_cache: FileCache,
+    path: Path,
+    uri: str,
+    regex: Pattern[str],
+    bytes_regex: Pattern[bytes],
+    encoder: ResultEncoder,
+) -> Optional[List[Any]]:
+    """Searches a file through its (memory-mapped) byte buffer.
+
+    The bytes regex locates candidate lines, and only those lines are decoded
+    and matched with the original regex, so results are identical to the
+    decoded path.
+
+    Returns:
+        The matches found, or None if the file must be searched as text.
+    """
+    matches: List[Any] = []
+    with file_cache.open_buffer(path) as buffer:
+        if _EXTRA_LINE_BREAKS.search(buffer):
+            return None
+        size = len(buffer)
+        line_no = 0
+        counted_to = 0
+        pos = 0
+        while pos < size:
+            candidate = bytes_regex.search(buffer, pos)
+            if candidate is None:
+                break
+            line_start = buffer.rfind(b"\n", 0, candidate.start()) + 1
+            line_end = buffer.find(b"\n", candidate.start())
+            if line_end == -1:
+                line_end = size
+            line_no += _count_newlines(buffer, counted_to, line_start)
+            counted_to = line_start
+            line_text = buffer[line_start:line_end].decode("utf-8", errors="replace")
+            matches.extend(_match_line(regex, uri, line_no, line_text, encoder))
+            pos = line_end + 1
+    return matches
+
 
-        return [m.to_dict() for m in matches]
+def _count_newlines(buffer: Any, start: int, end: int) -> int:
+    """Counts newlines in a buffer range without copying it all at once."""
+    count = 0
+    for chunk_start in range(start, end, _NEWLINE_COUNT_CHUNK):
+        chunk_end = min(chunk_start + _NEWLINE_COUNT_CHUNK, end)
+        count += buffer[chunk_start:chunk_end].count(b"\n")
+    return count
@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+from ..telemetry.metrics import TOOL_METRICS
+from ..telemetry.slow_log import SLOW_REQUESTS
+from .response_cache import RESPONSE_CACHE
+from .tool import Tool, ToolContext
+
+
+class ServerMetricsTool(Tool):
+    """A tool that reports how the tools of this server performed."""
+
+    @property
+    def name(self) -> str:
+        return "server_metrics"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Reports the number of calls, errors, result sizes and latency percentiles "
+            "(p50/p95/p99) of every tool since the server started, as JSON or in the "
+            "Prometheus text format. The JSON format also lists the latest calls that "
+            "were slower than the slow-request threshold, and the hit rate of the "
+            "response cache."
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "format": {
+                    "type": "string",
+                    "enum": ["json", "prometheus"],
+                    "default": "json",
+                    "description": "The format of the metrics.",
+                }
+            },
+        }
+
+    @property
+    def requires_index(self) -> bool:
+        return False
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Returns the metrics of the tool calls."""
+        if kwargs.get("format") == "prometheus":
+            return {"format": "prometheus", "text": TOOL_METRICS.to_prometheus()}
+        return {
+            "format": "json",
+            "tools": TOOL_METRICS.to_dict(),
+            "slow_requests": SLOW_REQUESTS.entries(),
+            "response_cache": RESPONSE_CACHE.stats.to_dict(),
+        }
@@ -1,9 +1,113 @@
-from typing import Any, Dict, List
+import ast
+import concurrent.futures
+import fnmatch
+import logging
+import os
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from ..astutils.parser import Position, Range, StructuredSyntaxError, parse_module
+from ..astutils.parser import Position, Range
+from ..fs.ignore import walk_text_files
 from .diagnostics import Diagnostic, DiagnosticSeverity
+from .pagination import PAGINATION_PROPERTIES, page_fields, paginate
 from .tool import Tool, ToolContext
 
+logger = logging.getLogger(__name__)
+
+# Below this many files to compile, a process pool costs more than it saves.
+_MIN_FILES_FOR_PROCESS_POOL = 32
+
+# A syntax error as (message, 1-based line, 1-based offset), or None.
+SyntaxErrorInfo = Optional[Tuple[str, int, int]]
+
+
+def compile_errors(text: str, filename: str) -> SyntaxErrorInfo:
+    """Finds the first syntax error of a source, without building a full ParsedModule.
+
+    This is a top-level function so that it can run in a worker process.
+    """
+    try:
+        compile(text, filename, "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+    except SyntaxError as e:
+        return (e.msg, e.lineno or 1, e.offset or 0)
+    except ValueError as e:
+        # E.g. source code containing null bytes
+        return (str(e), 1, 0)
+    return None
+
+
+def check_syntax_many(
+    context: ToolContext, uris: List[str], max_workers: Optional[int] = None
+) -> Dict[str, SyntaxErrorInfo]:
+    """Checks the syntax of many files, reusing earlier results.
+
+    A file is known to be valid if its indexed module is up to date, and
+    other results are cached by content hash. The remaining files are
+    compiled in a process pool when there are enough of them.
+
+    Args:
+        context: The tool context.
+        uris: The file URIs to check.
+        max_workers: The maximum number of worker processes.
+
+    Returns:
+        The syntax error of each readable file, or None if it has none.
+    """
+    index = context.project_index
+    results: Dict[str, SyntaxErrorInfo] = {}
+    pending: List[Tuple[str, str, Tuple[str, str]]] = []
+    for uri in uris:
+        path = Path(uri[7:])
+        try:
+            text = index.file_cache.get_text(path)
+            sha256 = index.file_cache.get_sha256(path)
+        except (OSError, UnicodeDecodeError):
+            continue
+        if index.modules.text(uri) == text:
+            results[uri] = None
+            continue
+        key = ("syntax", sha256)
+        sentinel = object()
+        cached = index.result_cache.get(key, sentinel)
+        if cached is sentinel:
+            pending.append((uri, text, key))
+        else:
+            results[uri] = cached
+
+    for (uri, _, key), error in zip(pending, _compile_all(pending, max_workers)):
+        index.result_cache.put(key, error)
+        results[uri] = error
+    return results
+
+
+def _compile_all(
+    pending: List[Tuple[str, str, Any]], max_workers: Optional[int]
+) -> List[SyntaxErrorInfo]:
+    texts = [text for _, text, _ in pending]
+    uris = [uri for uri, _, _ in pending]
+    if len(pending) >= _MIN_FILES_FOR_PROCESS_POOL:
+        try:
+            workers = max_workers or os.cpu_count() or 1
+            # Few large chunks keep the pickling overhead per file low
+            chunksize = max(1, len(pending) // (4 * workers))
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(compile_errors, texts, uris, chunksize=chunksize))
+        except (OSError, BrokenProcessPool):
+            logger.warning("Process pool unavailable, checking syntax in-process", exc_info=True)
+    return [compile_errors(text, uri) for text, uri in zip(texts, uris)]
+
+
+def _to_diagnostic(error: Tuple[str, int, int]) -> Diagnostic:
+    msg, lineno, offset = error
+    pos = Position(line=lineno - 1, column=offset - 1 if offset else 0)
+    return Diagnostic(
+        range=Range(start=pos, end=pos),
+        message=msg,
+        severity=DiagnosticSeverity.ERROR,
+        source="syntax-check",
+    )
+
 
 class SyntaxCheckTool(Tool):
     @property
@@ -13,9 +117,11 @@ class SyntaxCheckTool(Tool):
     @property
     def description(self) -> str:
         return (
-            "Analyzes a single Python file for syntax errors and reports them as "
-            "diagnostics. This tool is useful for quickly validating the basic "
-            "structure of a file without performing a full analysis."
+            "Checks Python files for syntax errors and reports them as diagnostics. "
+            "With a 'uri', checks that file and returns its diagnostics. Without one, "
+            "checks every Python file of the project (or those matching the globs) in "
+            "parallel and returns the files that have errors, which `limit` and `cursor` "
+            "page through. Results are cached by file content."
         )
 
     @property
@@ -26,34 +132,66 @@ class SyntaxCheckTool(Tool):
                 "uri": {
                     "type": "string",
                     "description": "The file URI of the Python module to check.",
-                }
+                },
+                "includeGlobs": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Without 'uri', only check files matching these globs.",
+                },
+                "excludeGlobs": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Without 'uri', skip files matching these globs.",
+                },
+                **PAGINATION_PROPERTIES,
             },
-            "required": ["uri"],
         }
 
     @property
     def requires_index(self) -> bool:
         return False
 
-    async def handle(self, context: ToolContext, **kwargs: Any) -> List[Dict[str, Any]]:
-        uri = kwargs["uri"]
-        diagnostics: List[Diagnostic] = []
-        try:
-            path = context.project_index.root / uri.replace("file://", "")
-            content = context.project_index.file_cache.get_text(path)
-            parse_module(content, uri)
-        except StructuredSyntaxError as e:
-            pos = Position(line=e.lineno - 1, column=e.offset - 1 if e.offset else 0)
-            error_range = Range(start=pos, end=pos)
-            diagnostics.append(
-                Diagnostic(
-                    range=error_range,
-                    message=e.msg,
-                    severity=DiagnosticSeverity.ERROR,
-                    source="syntax-check",
-                )
+    async def handle(
+        self, context: ToolContext, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        uri = kwargs.get("uri")
+        if uri is None:
+            return self._check_project(
+                context, kwargs.get("includeGlobs"), kwargs.get("excludeGlobs"), kwargs
             )
-        except Exception:
-            pass
+        if not uri.startswith("file://"):
+            return []
+
+        error = check_syntax_many(context, [uri]).get(uri)
+        if error is None:
+            return []
+        return [_to_diagnostic(error).to_dict()]
 
-        return [d.to_dict() for d in diagnostics]
+    def _check_project(
+        self,
+        context: ToolContext,
+        include_globs: Optional[List[str]],
+        exclude_globs: Optional[List[str]],
+        arguments: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        index = context.project_index
+        paths = {p for p in walk_text_files(index.root) if p.suffix == ".py"}
+        paths.update(p for p in index.overlays.paths() if p.suffix == ".py")
+        uris = []
+        for path in sorted(paths):
+            if include_globs and not any(fnmatch.fnmatch(str(path), g) for g in include_globs):
+                continue
+            if exclude_globs and any(fnmatch.fnmatch(str(path), g) for g in exclude_globs):
+                continue
+            uris.append(path.as_uri())
+
+        # Every page checks all files, but pages after the first hit the cache
+        results = check_syntax_many(context, uris)
+        files = paginate(
+            sorted(uri for uri, error in results.items() if error is not None),
+            lambda file_uri: [
+                {"uri": file_uri, "diagnostics": [_to_diagnostic(results[file_uri]).to_dict()]}
+            ],
+            arguments,
+        )
+        return {"files_checked": len(results), **page_fields("files", files)}
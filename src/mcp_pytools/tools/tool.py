@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Protocol
+from typing import Any, Dict, List, Optional, Protocol
 
 
 class Tool(ABC):
@@ -27,6 +27,37 @@ class Tool(ABC):
         """Whether the tool requires the project index to be built."""
         return True
 
+    @property
+    def accepts_partial_index(self) -> bool:
+        """Whether the tool may run on a partially built index.
+
+        Its results are then flagged as incomplete. Tools that do not accept
+        a partial index wait for the build to finish, unless `indexed_uris`
+        names the only files they need.
+        """
+        return False
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether results may be reused for calls with the same arguments.
+
+        A cached result is reused until the index publishes a new generation,
+        so only tools whose result depends on nothing but their arguments
+        and the index may be cacheable.
+        """
+        return False
+
+    def indexed_uris(self, arguments: Dict[str, Any]) -> Optional[List[str]]:
+        """The files a call needs indexed, or None if it needs the whole project.
+
+        These files are indexed first while the index is being built. By
+        default, they are the files named by the `uri`, `uris` and
+        `moduleUri` arguments.
+        """
+        uris = [arguments[name] for name in ("uri", "moduleUri") if arguments.get(name)]
+        uris.extend(arguments.get("uris") or [])
+        return uris or None
+
     @abstractmethod
     async def handle(self, **kwargs: Any) -> Any:
         """Executes the tool with the given arguments."""
@@ -0,0 +1,53 @@
+from typing import Any, Dict
+
+from ..index.edit_journal import EditConflictError
+from .tool import Tool, ToolContext
+
+
+class UndoEditTool(Tool):
+    """A tool that reverts an edit applied by another tool."""
+
+    @property
+    def name(self) -> str:
+        return "undo_edit"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Reverts an edit applied by a tool such as `rename_symbol` or "
+            "`organize_imports`, restoring every file it changed at once. Undoes the "
+            "latest edit unless a `transaction_id` is given. Refuses if a file was "
+            "changed since the edit, unless `force` is true."
+        )
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "transaction_id": {
+                    "type": "integer",
+                    "description": "The transaction id returned by the edit. Defaults "
+                    "to the latest edit.",
+                },
+                "force": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Revert files even if they changed since the edit.",
+                },
+            },
+        }
+
+    async def handle(self, context: ToolContext, **kwargs: Any) -> Dict[str, Any]:
+        """Undoes the transaction and reports the restored files."""
+        transaction_id = kwargs.get("transaction_id")
+        force = kwargs.get("force", False)
+        try:
+            transaction = context.project_index.undo(transaction_id, force=force)
+        except KeyError as e:
+            return {"error": e.args[0]}
+        except EditConflictError as e:
+            return {"error": str(e), "conflicts": e.uris}
+        except OSError as e:
+            return {"error": f"Failed to write files: {e}"}
+        return {"status": "ok", "undone": transaction.to_dict()}
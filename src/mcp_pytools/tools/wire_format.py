@@ -0,0 +1,88 @@
+# src/mcp_pytools/tools/wire_format.py
+
+from typing import Any, Dict, List, Sequence, Union
+
+from ..astutils.parser import Range
+
+# The arguments of the tools whose results can be encoded compactly.
+WIRE_FORMAT_PROPERTIES: Dict[str, Any] = {
+    "compact": {
+        "type": "boolean",
+        "default": False,
+        "description": "Encode each result as a row of values, in the order given by the "
+        "`fields` of the response, with ranges as [start line, start column, end line, "
+        "end column] and URIs as indexes into the `uris` of the response.",
+    },
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only return these fields of each result, e.g. [\"uri\", \"range\"].",
+    },
+}
+
+
+class ResultEncoder:
+    """
+    Encodes the results of a tool from its internal values, either as
+    dicts, or in compact mode as rows of values under a shared header,
+    with a table of the URIs they refer to.
+
+    Only the requested fields are encoded; tools can skip computing the
+    others by checking `wants`.
+    """
+
+    def __init__(self, fields: Sequence[str], arguments: Dict[str, Any]):
+        requested = arguments.get("fields")
+        self.fields = [name for name in fields if not requested or name in requested]
+        self.compact = bool(arguments.get("compact"))
+        self._uri_ids: Dict[str, int] = {}
+
+    def wants(self, field: str) -> bool:
+        return field in self.fields
+
+    def encode(self, **values: Any) -> Union[Dict[str, Any], List[Any]]:
+        """Encodes one result from the values of its fields.
+
+        A range is given as a `Range`, or as a tuple of its start line, start
+        column, end line and end column.
+        """
+        if self.compact:
+            return [self._compact_value(name, values.get(name)) for name in self.fields]
+        return {name: _plain_value(values.get(name)) for name in self.fields}
+
+    def finish(
+        self, result: Union[List[Any], Dict[str, Any]]
+    ) -> Union[List[Any], Dict[str, Any]]:
+        """Adds the header and URI table to encoded results, in compact mode.
+
+        Args:
+            result: The encoded results, or a page of them (see `paginate`).
+        """
+        if not self.compact:
+            return result
+        page = result if isinstance(result, dict) else {"results": result}
+        return {"fields": self.fields, "uris": list(self._uri_ids), **page}
+
+    def _compact_value(self, name: str, value: Any) -> Any:
+        if name == "uri":
+            uri_id = self._uri_ids.get(value)
+            if uri_id is None:
+                uri_id = self._uri_ids[value] = len(self._uri_ids)
+            return uri_id
+        if isinstance(value, Range):
+            return [value.start.line, value.start.column, value.end.line, value.end.column]
+        if isinstance(value, tuple):
+            return list(value)
+        return value
+
+
+def _plain_value(value: Any) -> Any:
+    if isinstance(value, Range):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        start_line, start_column, end_line, end_column = value
+        return {
+            "start": {"line": start_line, "column": start_column},
+            "end": {"line": end_line, "column": end_column},
+        }
+    return value
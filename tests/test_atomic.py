@@ -0,0 +1,31 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from mcp_pytools.fs.atomic import replace_files
+
+
+def test_replace_files_writes_all(tmp_path: Path):
+    existing = tmp_path / "existing.py"
+    existing.write_text("old\n")
+    os.chmod(existing, 0o640)
+    new = tmp_path / "new.py"
+
+    replace_files({existing: "updated\n", new: "created\n"})
+
+    assert existing.read_text() == "updated\n"
+    assert new.read_text() == "created\n"
+    assert existing.stat().st_mode & 0o777 == 0o640
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["existing.py", "new.py"]
+
+
+def test_replace_files_changes_nothing_on_failure(tmp_path: Path):
+    existing = tmp_path / "existing.py"
+    existing.write_text("old\n")
+
+    with pytest.raises(OSError):
+        replace_files({existing: "updated\n", tmp_path / "missing" / "new.py": "created\n"})
+
+    assert existing.read_text() == "old\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["existing.py"]
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.tools.batch import BatchTool
+
+from .helpers import MockToolContext
+
+
+@pytest.fixture
+def batch_project(tmp_path: Path) -> Path:
+    (tmp_path / "a.py").write_text("def first():\n    pass\n")
+    (tmp_path / "b.py").write_text("class Second:\n    pass\n")
+    return tmp_path
+
+
+@pytest.mark.anyio
+async def test_batch_returns_results_in_order(batch_project: Path):
+    indexer = ProjectIndex(batch_project)
+    indexer.build()
+    context = MockToolContext(indexer)
+    a_uri = (batch_project / "a.py").as_uri()
+    b_uri = (batch_project / "b.py").as_uri()
+
+    response = await BatchTool().handle(
+        context,
+        calls=[
+            {"tool": "document_symbols", "arguments": {"uri": a_uri}},
+            {"tool": "document_symbols", "arguments": {"uri": b_uri}},
+            {"tool": "find_definition", "arguments": {"symbol": "Second"}},
+            {"tool": "no_such_tool"},
+            {"tool": "document_symbols", "arguments": {}},
+            {"tool": "batch", "arguments": {"calls": []}},
+        ],
+    )
+
+    results = response["results"]
+    assert response["generation"] == indexer.generation
+    assert [s["name"] for s in results[0]["result"]] == ["first"]
+    assert [s["name"] for s in results[1]["result"]] == ["Second"]
+    assert results[2]["result"][0]["uri"] == b_uri
+    assert "no_such_tool" in results[3]["error"]["message"]
+    assert "KeyError" in results[4]["error"]["message"]
+    assert "nested" in results[5]["error"]["message"]
+
+
+@pytest.mark.anyio
+async def test_batch_calls_see_earlier_writes(batch_project: Path):
+    indexer = ProjectIndex(batch_project)
+    indexer.build()
+    context = MockToolContext(indexer)
+    a_uri = (batch_project / "a.py").as_uri()
+    generation = indexer.generation
+
+    response = await BatchTool().handle(
+        context,
+        calls=[
+            {"tool": "document_symbols", "arguments": {"uri": a_uri}},
+            {"tool": "document_open", "arguments": {"uri": a_uri, "text": "def renamed(): pass\n"}},
+            {"tool": "document_symbols", "arguments": {"uri": a_uri}},
+        ],
+    )
+
+    results = response["results"]
+    assert [s["name"] for s in results[0]["result"]] == ["first"]
+    assert results[1]["result"]["status"] == "ok"
+    assert [s["name"] for s in results[2]["result"]] == ["renamed"]
+    # Each result reports the generation it read
+    assert results[0]["generation"] == generation
+    assert results[1]["generation"] == results[2]["generation"] == indexer.generation
+    assert response["generation"] == indexer.generation > generation
+
+
+def test_batch_indexed_uris():
+    tool = BatchTool()
+    calls = [
+        {"tool": "document_symbols", "arguments": {"uri": "file:///a.py"}},
+        {"tool": "index_status"},
+    ]
+    assert tool.indexed_uris({"calls": calls}) == ["file:///a.py"]
+    calls.append({"tool": "find_references", "arguments": {"symbol": "x"}})
+    assert tool.indexed_uris({"calls": calls}) is None
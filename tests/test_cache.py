@@ -1,6 +1,7 @@
 # tests/test_cache.py
 
-
+import concurrent.futures
+import os
 from pathlib import Path
 
 import pytest
@@ -92,3 +93,115 @@ def test_file_cache_sha256(cache_test_project: Path):
     # Second access should be cached
     sha2 = cache.get_sha256(path)
     assert sha1 == sha2
+
+def test_file_cache_sha256_does_not_load_content(cache_test_project: Path):
+    cache = FileCache()
+    path = cache_test_project / "file1.txt"
+
+    cache.get_sha256(path)
+
+    record = cache.stat(path)
+    assert record._content_bytes is None
+    assert record._content_text is None
+
+def test_file_cache_fingerprint(cache_test_project: Path):
+    cache = FileCache()
+    path = cache_test_project / "file1.txt"
+
+    fp1 = cache.get_fingerprint(path)
+    assert fp1 == cache.get_fingerprint(path)
+    assert cache.stat(path)._content_bytes is None
+
+    path.write_text("world")
+    cache.invalidate(path)
+    fp2 = cache.get_fingerprint(path)
+    assert fp1 != fp2
+
+def test_file_cache_fingerprint_many(cache_test_project: Path):
+    cache = FileCache()
+    paths = [
+        cache_test_project / "file1.txt",
+        cache_test_project / "file2.bin",
+        cache_test_project / "missing.txt",
+    ]
+
+    fingerprints = cache.fingerprint_many(paths)
+    assert set(fingerprints) == set(paths[:2])
+    assert fingerprints[paths[0]] == cache.get_fingerprint(paths[0])
+
+    hashes = cache.fingerprint_many(paths[:1], cryptographic=True)
+    assert hashes[paths[0]] == (
+        "2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824"
+    )
+
+def test_file_cache_mmap_text(cache_test_project: Path):
+    cache = FileCache(mmap_threshold=1)
+    path = cache_test_project / "file1.txt"
+
+    assert cache.prefers_buffer(path)
+    with cache.open_buffer(path) as buffer:
+        assert buffer[:] == b"hello"
+
+    assert cache.get_text(path) == "hello"
+    record = cache.stat(path)
+    assert record._content_bytes is None
+    assert not cache.prefers_buffer(path)
+
+
+def test_file_cache_mmap_bytes_are_not_cached(cache_test_project: Path):
+    cache = FileCache(mmap_threshold=1)
+    path = cache_test_project / "file1.txt"
+
+    assert cache.get_bytes(path) == b"hello"
+    assert cache.stat(path)._content_bytes is None
+    assert cache.cached_contents() == []
+
+
+def test_file_cache_open_buffer_small_file(cache_test_project: Path):
+    cache = FileCache()
+    path = cache_test_project / "file2.bin"
+
+    assert not cache.prefers_buffer(path)
+    with cache.open_buffer(path) as buffer:
+        assert buffer == b"\x01\x02\x03"
+
+def test_file_cache_stat_ttl(cache_test_project: Path):
+    cache = FileCache(stat_ttl_ms=60_000)
+    path = cache_test_project / "file1.txt"
+
+    assert cache.get_text(path) == "hello"
+
+    # Within the trust window the cached stat is reused
+    path.write_text("hello, world")
+    assert cache.get_text(path) == "hello"
+
+    cache.invalidate(path)
+    assert cache.get_text(path) == "hello, world"
+
+def test_file_cache_detects_size_change(cache_test_project: Path):
+    cache = FileCache()
+    path = cache_test_project / "file1.txt"
+    record = cache.stat(path)
+
+    path.write_text("hello, world")
+    os.utime(path, ns=(record.mtime_ns, record.mtime_ns))
+
+    assert cache.get_text(path) == "hello, world"
+
+def test_file_cache_concurrent_readers(tmp_path: Path):
+    paths = []
+    for i in range(50):
+        path = tmp_path / f"file{i}.txt"
+        path.write_text(f"content {i}")
+        paths.append(path)
+    cache = FileCache()
+
+    def read_all(offset: int):
+        return [cache.get_text(paths[(i + offset) % len(paths)]) for i in range(len(paths))]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(read_all, range(8)))
+
+    for offset, texts in enumerate(results):
+        assert texts == [f"content {(i + offset) % len(paths)}" for i in range(len(paths))]
+    assert all(cache.stat(path) is cache.stat(path) for path in paths)
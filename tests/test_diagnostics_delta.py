@@ -0,0 +1,129 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from mcp_pytools.index import project
+from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.tools.diagnostics_delta import DiagnosticsDeltaTool
+
+from .helpers import MockToolContext
+
+
+@pytest.fixture
+def delta_project(tmp_path: Path) -> Path:
+    (tmp_path / "clean.py").write_text('"""Clean module."""\n')
+    (tmp_path / "lints.py").write_text(
+        '"""Module."""\n\ndef func(items=[]):\n    return items\n'
+    )
+    return tmp_path
+
+@pytest.mark.anyio
+async def test_diagnostics_delta_publishes_changes(delta_project: Path):
+    root = delta_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = DiagnosticsDeltaTool()
+
+    result = await tool.handle(context)
+    assert result["reset"] is False
+    assert sorted(d["message"] for d in result["added"]) == [
+        "Missing docstring for 'func'",
+        "Mutable default argument",
+    ]
+    generation = result["generation"]
+
+    result = await tool.handle(context, since=generation)
+    assert (result["added"], result["removed"], result["generation"]) == ([], [], generation)
+
+    (root / "lints.py").write_text('"""Module."""\n\ndef func(items=None):\n    return items\n')
+    (root / "clean.py").write_text('"""Clean module."""\n\nclass Added:\n    pass\n')
+    indexer.rebuild((root / "lints.py").as_uri())
+    indexer.rebuild((root / "clean.py").as_uri())
+    stats = indexer.result_cache.stats
+    misses = stats.misses
+
+    result = await tool.handle(context, since=generation)
+    assert stats.misses == misses + 2
+    assert [(d["uri"], d["message"]) for d in result["added"]] == [
+        ((root / "clean.py").as_uri(), "Missing docstring for 'Added'")
+    ]
+    assert [d["message"] for d in result["removed"]] == ["Mutable default argument"]
+
+@pytest.mark.anyio
+async def test_diagnostics_delta_removes_deleted_files(delta_project: Path):
+    root = delta_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = DiagnosticsDeltaTool()
+    generation = (await tool.handle(context))["generation"]
+
+    (root / "lints.py").unlink()
+    indexer.build()
+    result = await tool.handle(context, since=generation)
+
+    assert result["added"] == []
+    assert len(result["removed"]) == 2
+
+@pytest.mark.anyio
+async def test_diagnostics_delta_during_a_progressive_build(delta_project: Path, monkeypatch):
+    root = delta_project
+    (root / "clean.py").write_text("class Undocumented:\n    pass\n")
+    uris = {(root / "clean.py").as_uri(), (root / "lints.py").as_uri()}
+    # Each indexed file is published at once
+    monkeypatch.setattr(project, "PUBLISH_INTERVAL", 0)
+    indexer = ProjectIndex(root)
+    context = MockToolContext(indexer)
+    tool = DiagnosticsDeltaTool()
+
+    # The first build is superseded after one file, leaving a partial generation
+    cancel = threading.Event()
+    index_file = ProjectIndex._index_file
+
+    def cancelling_index_file(self, snapshot, file_path):
+        index_file(self, snapshot, file_path)
+        cancel.set()
+
+    monkeypatch.setattr(ProjectIndex, "_index_file", cancelling_index_file)
+    assert indexer.build(cancel) is False
+    [first] = indexer.get_all_uris()
+    [second] = uris - {first}
+    result = await tool.handle(context)
+    generation = result["generation"]
+    assert {d["uri"] for d in result["added"]} == {first}
+
+    # The next build indexes the other file first, then waits
+    paused = threading.Event()
+    resume = threading.Event()
+    calls = []
+
+    def slow_index_file(self, snapshot, file_path):
+        calls.append(file_path)
+        if len(calls) == 2:
+            paused.set()
+            resume.wait(5)
+        index_file(self, snapshot, file_path)
+
+    monkeypatch.setattr(ProjectIndex, "_index_file", slow_index_file)
+    assert not indexer.ensure_indexed([second], timeout=0)
+    builder = threading.Thread(target=indexer.build)
+    builder.start()
+    try:
+        assert paused.wait(5)
+        assert indexer.get_all_uris() == [second]
+        # The file the build has yet to index keeps its diagnostics
+        result = await tool.handle(context, since=generation)
+        assert {d["uri"] for d in result["added"]} == {second}
+        assert result["removed"] == []
+        generation = result["generation"]
+    finally:
+        resume.set()
+        builder.join()
+
+    assert indexer.snapshot().complete
+    result = await tool.handle(context, since=generation)
+    assert (result["added"], result["removed"]) == ([], [])
+    for uri in uris:
+        assert indexer.diagnostics.get(uri)
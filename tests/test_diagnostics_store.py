@@ -0,0 +1,60 @@
+from mcp_pytools.index.diagnostics_store import DiagnosticsStore
+
+
+def _diagnostic(line: int, message: str) -> dict:
+    position = {"line": line, "column": 0}
+    return {"range": {"start": position, "end": position}, "message": message, "severity": 2}
+
+
+def test_delta_returns_only_changes():
+    store = DiagnosticsStore()
+    first = _diagnostic(1, "first")
+    second = _diagnostic(2, "second")
+    assert store.set("file:///a.py", [first]) == 1
+    generation = store.set("file:///b.py", [second])
+
+    # Unchanged diagnostics do not start a new generation
+    assert store.set("file:///a.py", [first]) == generation
+
+    store.set("file:///a.py", [first, _diagnostic(3, "third")])
+    store.remove("file:///b.py")
+    delta = store.delta(generation)
+    assert delta["reset"] is False
+    assert delta["generation"] == generation + 2
+    assert [d["message"] for d in delta["added"]] == ["third"]
+    assert [(d["uri"], d["message"]) for d in delta["removed"]] == [("file:///b.py", "second")]
+
+    assert store.delta(delta["generation"])["added"] == []
+
+
+def test_delta_cancels_transient_changes():
+    store = DiagnosticsStore()
+    diagnostic = _diagnostic(1, "flapping")
+    generation = store.set("file:///a.py", [diagnostic])
+    store.remove("file:///a.py")
+    store.set("file:///a.py", [diagnostic])
+
+    delta = store.delta(generation)
+    assert delta["added"] == [] and delta["removed"] == []
+
+
+def test_delta_resets_when_log_was_trimmed():
+    store = DiagnosticsStore(max_log_size=2)
+    store.set("file:///a.py", [_diagnostic(1, "a")])
+    store.set("file:///b.py", [_diagnostic(1, "b")])
+    store.set("file:///c.py", [_diagnostic(1, "c")])
+
+    delta = store.delta(0)
+    assert delta["reset"] is True
+    assert sorted(d["message"] for d in delta["added"]) == ["a", "b", "c"]
+    assert store.delta(1)["reset"] is False
+    assert store.delta(99)["reset"] is True
+
+
+def test_dirty_marks():
+    store = DiagnosticsStore()
+    store.set("file:///a.py", [_diagnostic(1, "a")])
+    store.mark_dirty("file:///b.py")
+    store.mark_all_dirty()
+    assert sorted(store.take_dirty()) == ["file:///a.py", "file:///b.py"]
+    assert store.take_dirty() == []
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.tools.document_close import DocumentCloseTool
+from mcp_pytools.tools.document_open import DocumentOpenTool
+from mcp_pytools.tools.document_symbols import DocumentSymbolsTool
+from mcp_pytools.tools.document_update import DocumentUpdateTool
+from mcp_pytools.tools.search_text import SearchTextTool
+
+from .helpers import MockToolContext
+
+
+@pytest.fixture
+def document_project(tmp_path: Path) -> Path:
+    (tmp_path / "module.py").write_text("def saved():\n    pass\n")
+    return tmp_path
+
+@pytest.mark.anyio
+async def test_document_tools_round_trip(document_project: Path):
+    root = document_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    uri = (root / "module.py").as_uri()
+    symbols_tool = DocumentSymbolsTool()
+
+    result = await DocumentOpenTool().handle(
+        context, uri=uri, text="def unsaved():\n    pass\n", version=1
+    )
+    assert result == {"status": "ok", "uri": uri, "version": 1}
+    symbols = await symbols_tool.handle(context, uri=uri)
+    assert [s["name"] for s in symbols] == ["unsaved"]
+
+    result = await DocumentUpdateTool().handle(
+        context, uri=uri, text="def updated():\n    pass\n"
+    )
+    assert result["version"] == 2
+    symbols = await symbols_tool.handle(context, uri=uri)
+    assert [s["name"] for s in symbols] == ["updated"]
+
+    matches = await SearchTextTool().handle(context, pattern="updated")
+    assert len(matches) == 1
+
+    result = await DocumentCloseTool().handle(context, uri=uri)
+    assert result["status"] == "ok"
+    symbols = await symbols_tool.handle(context, uri=uri)
+    assert [s["name"] for s in symbols] == ["saved"]
+
+@pytest.mark.anyio
+async def test_document_tools_require_open_document(document_project: Path):
+    indexer = ProjectIndex(document_project)
+    indexer.build()
+    context = MockToolContext(indexer)
+    uri = (document_project / "module.py").as_uri()
+
+    result = await DocumentUpdateTool().handle(context, uri=uri, text="x = 1\n")
+    assert "error" in result
+    result = await DocumentCloseTool().handle(context, uri=uri)
+    assert "error" in result
+
+@pytest.mark.anyio
+async def test_document_update_with_changes(document_project: Path):
+    indexer = ProjectIndex(document_project)
+    indexer.build()
+    context = MockToolContext(indexer)
+    uri = (document_project / "module.py").as_uri()
+    await DocumentOpenTool().handle(context, uri=uri, text="def saved():\n    pass\n")
+
+    change = {
+        "range": {"start": {"line": 0, "column": 4}, "end": {"line": 0, "column": 9}},
+        "text": "renamed",
+    }
+    result = await DocumentUpdateTool().handle(context, uri=uri, changes=[change])
+
+    assert result["version"] == 1
+    assert indexer.overlays.get(document_project / "module.py").text.startswith("def renamed")
+    symbols = await DocumentSymbolsTool().handle(context, uri=uri)
+    assert [s["name"] for s in symbols] == ["renamed"]
+
+    result = await DocumentUpdateTool().handle(context, uri=uri)
+    assert "error" in result
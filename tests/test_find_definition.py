@@ -102,3 +102,18 @@ async def test_find_definition_tool_not_found(find_def_project: Path):
     locations = await tool.handle(context, symbol="non_existent_symbol")
 
     assert not locations
+
+@pytest.mark.anyio
+async def test_find_definition_text_matches_indexed_ranges(find_def_project: Path):
+    root = find_def_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+
+    # Not re-indexed: the range refers to the old text
+    path = root / "module_a.py"
+    path.write_text(path.read_text().replace("x = 10", "x = 20"))
+    [location] = await FindDefinitionTool().handle(context, symbol="top_level_func")
+
+    assert location["range"]["start"]["line"] == 5
+    assert location["text"] == "def top_level_func():\n    x = 10"
@@ -84,3 +84,38 @@ async def test_find_references_tool_not_found(find_refs_project: Path):
     references = await tool.handle(context, symbol="non_existent_symbol")
 
     assert len(references) == 0
+
+@pytest.mark.anyio
+async def test_find_references_tool_pagination(find_refs_project: Path):
+    indexer = ProjectIndex(find_refs_project)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = FindReferencesTool()
+    everything = await tool.handle(context, symbol="MyClass")
+
+    pages = []
+    cursor = None
+    while True:
+        page = await tool.handle(context, symbol="MyClass", limit=2, cursor=cursor)
+        pages.append(page["results"])
+        cursor = page["next_cursor"]
+        assert page["truncated"] == (cursor is not None)
+        if cursor is None:
+            break
+
+    assert [len(results) for results in pages] == [2, 2, 1]
+    assert sorted(sum(pages, []), key=str) == sorted(everything, key=str)
+
+@pytest.mark.anyio
+async def test_find_references_text_matches_indexed_ranges(find_refs_project: Path):
+    root = find_refs_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+
+    # Not re-indexed: the ranges refer to the old text
+    (root / "module_b.py").write_text("# Shifted\n" * 3 + (root / "module_b.py").read_text())
+    result = await FindReferencesTool().handle(context, symbol="MyClass")
+
+    module_b = (root / "module_b.py").as_uri()
+    assert {ref["text"] for ref in result if ref["uri"] == module_b} == {"MyClass"}
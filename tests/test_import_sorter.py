@@ -0,0 +1,117 @@
+from pathlib import Path
+
+from mcp_pytools.analysis.import_sorter import (
+    FIRST_PARTY,
+    LOCAL,
+    STDLIB,
+    THIRD_PARTY,
+    SortSettings,
+    sort_imports,
+)
+from mcp_pytools.astutils.parser import parse_module
+
+
+def _sort(text: str, settings: SortSettings = None) -> str:
+    return sort_imports(parse_module(text, "file:///project/module.py"), settings)
+
+
+def test_sort_imports_groups_sections():
+    text = (
+        "import requests\n"
+        "from . import sibling\n"
+        "import os, sys\n"
+        "from __future__ import annotations\n"
+        "from collections import deque, OrderedDict\n"
+        "from collections import abc as cabc\n"
+        "x = 1\n"
+    )
+    assert _sort(text) == (
+        "from __future__ import annotations\n"
+        "\n"
+        "import os\n"
+        "import sys\n"
+        "from collections import OrderedDict, deque\n"
+        "from collections import abc as cabc\n"
+        "\n"
+        "import requests\n"
+        "\n"
+        "from . import sibling\n"
+        "\n"
+        "x = 1\n"
+    )
+
+
+def test_sort_imports_merges_and_deduplicates():
+    text = "import os\nimport os\nfrom typing import List\nfrom typing import Any, List\n"
+    assert _sort(text) == "import os\nfrom typing import Any, List\n"
+
+
+def test_sort_imports_orders_members_by_type():
+    text = "from mod import func, Thing, CONST, T\n"
+    assert _sort(text) == "from mod import CONST, T, Thing, func\n"
+
+
+def test_sort_imports_wraps_long_lines():
+    settings = SortSettings(line_length=30)
+    text = "from typing import Dict, List, Optional\nfrom a import (\n    b,\n)\n"
+    assert _sort(text, settings) == (
+        "from typing import (\n"
+        "    Dict,\n"
+        "    List,\n"
+        "    Optional,\n"
+        ")\n"
+        "\n"
+        "from a import (\n"
+        "    b,\n"
+        ")\n"
+    )
+
+
+def test_sort_imports_blank_lines_before_definitions():
+    text = "import sys\nimport os\ndef f():\n    import zlib\n    import abc\n    return 1\n"
+    assert _sort(text) == (
+        "import os\nimport sys\n\n\ndef f():\n    import abc\n    import zlib\n    return 1\n"
+    )
+
+
+def test_sort_imports_leaves_commented_blocks():
+    text = "import sys\n# keep me here\nimport os\n"
+    assert _sort(text) == text
+    text = "import sys; import os\n"
+    assert _sort(text) == text
+
+
+def test_sort_imports_leaves_imports_joined_by_semicolons():
+    # ruff reports these blocks but does not fix them
+    text = "import b; import a\nimport os\n"
+    assert _sort(text) == text
+    # A semicolon ending an import alone is dropped
+    assert _sort("import sys;\nimport os\n") == "import os\nimport sys\n"
+
+
+def test_sort_imports_adds_final_newline():
+    assert _sort("import sys\nimport os") == "import os\nimport sys\n"
+    assert _sort("import sys\r\nimport os") == "import os\r\nimport sys\r\n"
+    assert _sort("import os\nx = 1") == "import os\n\nx = 1"
+
+
+def test_sort_imports_preserves_crlf():
+    assert _sort("import sys\r\nimport os\r\n") == "import os\r\nimport sys\r\n"
+
+
+def test_section_classification(tmp_path: Path):
+    (tmp_path / "src" / "mypkg").mkdir(parents=True)
+    (tmp_path / "localmod.py").write_text("")
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.ruff]\nline-length = 100\n\n[tool.ruff.lint.isort]\nknown-first-party = ["corp"]\n'
+    )
+    settings = SortSettings.from_project(tmp_path)
+
+    assert settings.line_length == 100
+    assert settings.section("os.path", 0) == STDLIB
+    assert settings.section("requests", 0) == THIRD_PARTY
+    assert settings.section("mypkg", 0) == FIRST_PARTY
+    assert settings.section("localmod", 0) == FIRST_PARTY
+    assert settings.section("corp.utils", 0) == FIRST_PARTY
+    assert settings.section("requests", 0, package="requests") == FIRST_PARTY
+    assert settings.section("anything", 1) == LOCAL
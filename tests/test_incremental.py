@@ -0,0 +1,119 @@
+# tests/test_incremental.py
+
+import ast
+
+import pytest
+
+from mcp_pytools.analysis.symbols import document_symbols
+from mcp_pytools.astutils.incremental import TextEdit, apply_text_edit, reparse_edit
+from mcp_pytools.astutils.parser import Position, Range, parse_module
+
+SOURCE = '''"""Module docstring."""
+import os
+
+
+@decorator
+def first(a):
+    return a + 1  # type: ignore
+
+
+class Second:
+    def method(self):
+        value = os.getcwd()
+        return value
+
+# A comment between blocks
+
+CONSTANT = 3
+'''
+
+
+def _edit(start_line, start_col, end_line, end_col, text) -> TextEdit:
+    return TextEdit(
+        range=Range(
+            start=Position(line=start_line, column=start_col),
+            end=Position(line=end_line, column=end_col),
+        ),
+        new_text=text,
+    )
+
+
+def _dump(module) -> str:
+    return ast.dump(module.tree, include_attributes=True)
+
+
+def _ranges(module):
+    return [
+        (type(node).__name__, node._range)
+        for node in ast.walk(module.tree)
+        if hasattr(node, "_range")
+    ]
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        # Same-line change inside a function body
+        _edit(6, 15, 6, 16, "2"),
+        # New line inside a method, shifting everything after it
+        _edit(11, 27, 11, 27, "\n        other = value"),
+        # New function in the gap between two blocks
+        _edit(14, 26, 14, 26, "\ndef added():\n    pass\n"),
+        # Removal of a whole decorated function
+        _edit(4, 0, 7, 0, ""),
+        # Edit of a decorator line
+        _edit(4, 1, 4, 10, "other_decorator"),
+        # Append at the end of the file
+        _edit(17, 0, 17, 0, "LAST = 4\n"),
+    ],
+)
+def test_reparse_edit_matches_full_parse(edit: TextEdit):
+    module = parse_module(SOURCE, "file:///module.py")
+    expected = parse_module(apply_text_edit(SOURCE, edit), "file:///module.py")
+
+    dump, ranges = _dump(module), _ranges(module)
+
+    update = reparse_edit(module, edit)
+
+    assert update is not None
+    # The original module is left as it was
+    assert module.text == SOURCE
+    assert (_dump(module), _ranges(module)) == (dump, ranges)
+    assert update.module.text == expected.text
+    assert update.module.lines == expected.lines
+    assert _dump(update.module) == _dump(expected)
+    assert _ranges(update.module) == _ranges(expected)
+    assert document_symbols(update.module) == document_symbols(expected)
+
+
+def test_reparse_edit_reports_block_and_delta():
+    module = parse_module(SOURCE, "file:///module.py")
+
+    update = reparse_edit(module, _edit(11, 27, 11, 27, "\n        other = value"))
+
+    assert (update.start_line, update.end_line) == (9, 12)
+    assert update.line_delta == 1
+    assert [type(s).__name__ for s in update.statements] == ["ClassDef"]
+
+
+def test_reparse_edit_unbalanced_block_needs_full_parse():
+    module = parse_module(SOURCE, "file:///module.py")
+
+    assert reparse_edit(module, _edit(6, 11, 6, 11, "(")) is None
+    # The module is left untouched
+    assert module.text == SOURCE
+
+
+def test_reparse_edit_after_unterminated_last_line_needs_full_parse():
+    text = "def f():\n    pass\nw"
+    module = parse_module(text, "file:///module.py")
+    edit = _edit(3, 0, 3, 0, "def g():\n    pass\n")
+
+    # The insertion joins the last line, as `apply_text_edit` places it
+    assert apply_text_edit(text, edit) == "def f():\n    pass\nwdef g():\n    pass\n"
+    assert reparse_edit(module, edit) is None
+    # With a final newline, it starts a new line in both
+    module = parse_module(text + "\n", "file:///module.py")
+    update = reparse_edit(module, edit)
+    assert update.module.text == apply_text_edit(text + "\n", edit)
+    assert update.module.lines == update.module.text.splitlines()
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import pytest
+
+from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.tools import lint_project as lint_project_module
+from mcp_pytools.tools.lint_project import LintProjectTool
+
+from .helpers import MockToolContext
+
+
+@pytest.fixture
+def lint_project(tmp_path: Path) -> Path:
+    (tmp_path / "clean.py").write_text('"""Clean module."""\n')
+    (tmp_path / "lints.py").write_text(
+        '"""Module."""\n\ndef func(items=[]):\n    return items\n'
+    )
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "other.py").write_text("class Undocumented:\n    pass\n")
+    return tmp_path
+
+@pytest.mark.anyio
+async def test_lint_project_runs_all_lints(lint_project: Path):
+    root = lint_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = LintProjectTool()
+
+    result = await tool.handle(context)
+
+    assert result["files_checked"] == 3
+    by_uri = {f["uri"]: [d["message"] for d in f["diagnostics"]] for f in result["files"]}
+    assert set(by_uri) == {(root / "lints.py").as_uri(), (root / "pkg" / "other.py").as_uri()}
+    assert sorted(by_uri[(root / "lints.py").as_uri()]) == [
+        "Missing docstring for 'func'",
+        "Mutable default argument",
+    ]
+
+@pytest.mark.anyio
+async def test_lint_project_globs(lint_project: Path):
+    root = lint_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = LintProjectTool()
+
+    result = await tool.handle(context, includeGlobs=["*/pkg/*"])
+    assert result["files_checked"] == 1
+
+    result = await tool.handle(context, excludeGlobs=["*/pkg/*"])
+    assert result["files_checked"] == 2
+
+@pytest.mark.anyio
+async def test_lint_project_reuses_cached_results(lint_project: Path):
+    root = lint_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = LintProjectTool()
+    await tool.handle(context)
+    stats = indexer.result_cache.stats
+    assert (stats.hits, stats.misses) == (0, 3)
+
+    (root / "clean.py").write_text('"""Clean module."""\n\ndef changed():\n    pass\n')
+    indexer.rebuild((root / "clean.py").as_uri())
+    result = await tool.handle(context)
+
+    # Only the changed file was linted again
+    assert (stats.hits, stats.misses) == (2, 4)
+    messages = [d["message"] for f in result["files"] for d in f["diagnostics"]]
+    assert "Missing docstring for 'changed'" in messages
+
+@pytest.mark.anyio
+async def test_lint_project_in_process_pool(lint_project: Path, monkeypatch):
+    root = lint_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = LintProjectTool()
+    expected = await tool.handle(context)
+    indexer.result_cache.clear()
+
+    monkeypatch.setattr(lint_project_module, "_MIN_FILES_FOR_PROCESS_POOL", 1)
+    assert await tool.handle(context) == expected
+
+@pytest.mark.anyio
+async def test_lint_project_keys_results_by_indexed_text(lint_project: Path):
+    root = lint_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = LintProjectTool()
+    uri = (root / "clean.py").as_uri()
+    await tool.handle(context)
+
+    # The open document is linted, not the unchanged file on disk
+    indexer.open_document(uri, '"""Clean module."""\n\ndef unsaved():\n    pass\n')
+    result = await tool.handle(context)
+    by_uri = {f["uri"]: [d["message"] for d in f["diagnostics"]] for f in result["files"]}
+    assert by_uri[uri] == ["Missing docstring for 'unsaved'"]
+
+@pytest.mark.anyio
+async def test_lint_project_pages_files(lint_project: Path):
+    root = lint_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = LintProjectTool()
+
+    first = await tool.handle(context, limit=1)
+    assert first["truncated"]
+    second = await tool.handle(context, limit=1, cursor=first["next_cursor"])
+    assert not second["truncated"]
+    assert [f["uri"] for f in first["files"] + second["files"]] == sorted(
+        [(root / "lints.py").as_uri(), (root / "pkg" / "other.py").as_uri()]
+    )
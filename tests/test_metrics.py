@@ -0,0 +1,159 @@
+# tests/test_metrics.py
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mcp_pytools.server import ServerContext, create_tool_handler
+from mcp_pytools.telemetry.metrics import LatencyHistogram, ToolMetrics
+from mcp_pytools.telemetry.profiler import CallProfiler
+from mcp_pytools.telemetry.slow_log import SlowRequestLog
+from mcp_pytools.tools.response_cache import ResponseCache
+from mcp_pytools.tools.tool import Tool
+
+
+class EchoTool(Tool):
+    @property
+    def name(self) -> str:
+        return "echo"
+
+    @property
+    def description(self) -> str:
+        return "Returns its text, or fails if there is none."
+
+    @property
+    def schema(self):
+        return {"type": "object", "properties": {"text": {"type": "string"}}}
+
+    @property
+    def requires_index(self) -> bool:
+        return False
+
+    async def handle(self, context: Any, **kwargs: Any):
+        return {"text": kwargs["text"]}
+
+
+class CountingTool(EchoTool):
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "counting"
+
+    @property
+    def cacheable(self) -> bool:
+        return True
+
+    async def handle(self, context: Any, **kwargs: Any):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for _ in range(90):
+        histogram.record(0.005)
+    for _ in range(10):
+        histogram.record(0.5)
+
+    assert histogram.count == 100
+    assert 0 < histogram.percentile(0.5) <= 0.01
+    assert 0.1 < histogram.percentile(0.95) <= 0.5
+    assert histogram.percentile(0.99) <= histogram.max == 0.5
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_tool_metrics_prometheus_format():
+    metrics = ToolMetrics()
+    metrics.record("echo", 0.002, result_bytes=10, error=False)
+    metrics.record("echo", 3.0, result_bytes=30, error=True)
+
+    text = metrics.to_prometheus()
+    assert 'mcp_tool_calls_total{tool="echo"} 2' in text
+    assert 'mcp_tool_errors_total{tool="echo"} 1' in text
+    assert 'mcp_tool_result_bytes_total{tool="echo"} 40' in text
+    assert 'mcp_tool_latency_seconds_bucket{tool="echo",le="0.0025"} 1' in text
+    assert 'mcp_tool_latency_seconds_bucket{tool="echo",le="+Inf"} 2' in text
+    assert 'mcp_tool_latency_seconds_count{tool="echo"} 2' in text
+
+
+@pytest.mark.anyio
+async def test_tool_handler_records_calls(tmp_path: Path):
+    metrics = ToolMetrics()
+    handler = create_tool_handler(EchoTool(), ServerContext(tmp_path), metrics=metrics)
+
+    assert await handler(text="hello") == {"text": "hello"}
+    assert "error" in await handler()
+
+    echo = metrics.to_dict()["echo"]
+    assert echo["calls"] == 2
+    assert echo["errors"] == 1
+    assert echo["result_bytes"] > len('{"text":"hello"}')
+    assert echo["latency_seconds"]["count"] == 2
+
+
+@pytest.mark.anyio
+async def test_tool_handler_logs_slow_calls(tmp_path: Path):
+    log_path = tmp_path / "slow.jsonl"
+    slow_log = SlowRequestLog(threshold=0.0, path=log_path)
+    context = ServerContext(tmp_path)
+    handler = create_tool_handler(EchoTool(), context, metrics=ToolMetrics(), slow_log=slow_log)
+
+    await handler(text="x" * 1000)
+
+    [entry] = slow_log.entries()
+    assert entry["tool"] == "echo"
+    assert entry["generation"] == context.project_index.generation
+    assert entry["arguments"]["text"].endswith("(1000 characters)")
+    assert len(log_path.read_text().splitlines()) == 1
+    assert SlowRequestLog(threshold=10.0).record("echo", {}, 0, 0.5) is False
+
+
+@pytest.mark.anyio
+async def test_tool_handler_profiles_armed_calls(tmp_path: Path):
+    profiler = CallProfiler(directory=tmp_path / "profiles")
+    handler = create_tool_handler(
+        EchoTool(),
+        ServerContext(tmp_path),
+        metrics=ToolMetrics(),
+        slow_log=SlowRequestLog(threshold=10.0),
+        profiler=profiler,
+    )
+
+    await handler(text="unprofiled")
+    assert profiler.status()["saved"] == []
+
+    profiler.arm(calls=1, memory=True)
+    await handler(text="profiled")
+    await handler(text="unprofiled")
+    saved = sorted(Path(path).suffix for path in profiler.status()["saved"])
+    assert saved == [".prof", ".tracemalloc"]
+    assert profiler.status()["remaining_calls"] == 0
+
+    # In slow mode, only the profiles of slow calls are kept
+    profiler.arm(slow=True)
+    await handler(text="fast")
+    assert len(profiler.status()["saved"]) == 2
+
+
+@pytest.mark.anyio
+async def test_tool_handler_caches_results_per_generation(tmp_path: Path):
+    tool = CountingTool()
+    cache = ResponseCache()
+    context = ServerContext(tmp_path)
+    handler = create_tool_handler(tool, context, metrics=ToolMetrics(), response_cache=cache)
+
+    assert await handler(text="a") == {"calls": 1}
+    assert await handler(text="a", extra=None) == {"calls": 1}
+    assert await handler(text="b") == {"calls": 2}
+    assert cache.stats.hits == 1
+
+    # Any write to the index publishes a new generation
+    context.project_index.open_document((tmp_path / "new.py").as_uri(), "x = 1\n")
+    assert await handler(text="a") == {"calls": 3}
+
+    uncached = create_tool_handler(EchoTool(), context, metrics=ToolMetrics(), response_cache=cache)
+    await uncached(text="a")
+    assert len(cache) == 3
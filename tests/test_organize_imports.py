@@ -87,3 +87,102 @@ async def test_organize_imports_apply(organize_imports_project: Path):
     assert modified_content.find("import sys") < modified_content.find(
         "from collections import defaultdict"
     )
+
+
+@pytest.mark.anyio
+async def test_organize_imports_backends_agree(organize_imports_project: Path):
+    root = organize_imports_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = OrganizeImportsTool()
+
+    module_uri = (root / "module_to_organize.py").as_uri()
+    builtin = await tool.handle(context, uri=module_uri, backend="builtin")
+    ruff = await tool.handle(context, uri=module_uri, backend="ruff")
+
+    assert builtin["diff"] == ruff["diff"]
+
+
+@pytest.fixture
+def many_files_project(organize_imports_project: Path) -> Path:
+    root = organize_imports_project
+    (root / "pkg").mkdir()
+    (root / "pkg" / "a.py").write_text("import sys\nimport os\n")
+    (root / "pkg" / "b.py").write_text("from typing import List\nfrom typing import Any\n")
+    (root / "pkg" / "sorted.py").write_text("import os\n")
+    return root
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("backend", ["builtin", "ruff"])
+async def test_organize_imports_many_files_dry_run(many_files_project: Path, backend: str):
+    root = many_files_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = OrganizeImportsTool()
+
+    result = await tool.handle(context, includeGlobs=["*/pkg/*"], backend=backend)
+
+    assert result["files_checked"] == 3
+    assert result["errors"] == []
+    assert [f["uri"] for f in result["files"]] == [
+        (root / "pkg" / "a.py").as_uri(),
+        (root / "pkg" / "b.py").as_uri(),
+    ]
+    assert "+from typing import Any, List" in result["files"][1]["diff"]
+    assert (root / "pkg" / "a.py").read_text() == "import sys\nimport os\n"
+
+
+@pytest.mark.anyio
+async def test_organize_imports_many_files_apply(many_files_project: Path):
+    root = many_files_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = OrganizeImportsTool()
+    uris = [(root / "pkg" / name).as_uri() for name in ("a.py", "b.py", "sorted.py")]
+
+    result = await tool.handle(context, uris=uris, apply=True)
+
+    assert result["status"] == "ok"
+    assert result["files_changed"] == uris[:2]
+    assert (root / "pkg" / "a.py").read_text() == "import os\nimport sys\n"
+    assert (root / "pkg" / "b.py").read_text() == "from typing import Any, List\n"
+    # The index was updated for the changed files
+    assert indexer.modules[uris[0]].text == "import os\nimport sys\n"
+
+
+@pytest.mark.anyio
+async def test_organize_imports_many_files_all_or_nothing(many_files_project: Path):
+    root = many_files_project
+    (root / "pkg" / "broken.py").write_text("import (\n")
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = OrganizeImportsTool()
+    uris = [(root / "pkg" / name).as_uri() for name in ("a.py", "broken.py")]
+
+    result = await tool.handle(context, uris=uris, apply=True)
+
+    assert [e["uri"] for e in result["errors"]] == [uris[1]]
+    assert (root / "pkg" / "a.py").read_text() == "import sys\nimport os\n"
+
+
+@pytest.mark.anyio
+async def test_organize_imports_ruff_only_sorts_imports(tmp_path: Path):
+    (tmp_path / "pyproject.toml").write_text('[tool.ruff.lint]\nselect = ["F", "I"]\n')
+    (tmp_path / "a.py").write_text("import sys\nimport os\n")
+    indexer = ProjectIndex(tmp_path)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = OrganizeImportsTool()
+    uri = (tmp_path / "a.py").as_uri()
+
+    single = await tool.handle(context, uri=uri, backend="ruff")
+    batch = await tool.handle(context, uris=[uri], backend="ruff")
+
+    # The unused imports are sorted, not removed, whether alone or in a batch
+    assert single["diff"].splitlines()[-3:] == ["+import os", " import sys", "-import os"]
+    assert batch["files"][0]["diff"] == single["diff"]
@@ -0,0 +1,87 @@
+# tests/test_overlay.py
+
+from pathlib import Path
+
+import pytest
+
+from mcp_pytools.fs.cache import FileCache
+from mcp_pytools.fs.overlay import OverlayStore
+from mcp_pytools.index.project import ProjectIndex
+
+
+@pytest.fixture
+def overlay_project(tmp_path: Path) -> Path:
+    """Creates a temporary project for testing overlays."""
+    (tmp_path / "module.py").write_text("def on_disk():\n    pass\n")
+    return tmp_path
+
+def test_overlay_store_versions(overlay_project: Path):
+    store = OverlayStore()
+    path = overlay_project / "module.py"
+
+    assert store.get(path) is None
+    store.open(path, "a = 1\n", version=3)
+    assert store.update(path, "a = 2\n").version == 4
+    assert store.update(path, "a = 3\n", version=10).version == 10
+    assert path in store
+
+    closed = store.close(path)
+    assert closed.text == "a = 3\n"
+    assert store.close(path) is None
+
+    with pytest.raises(KeyError):
+        store.update(path, "a = 4\n")
+
+def test_file_cache_prefers_overlay(overlay_project: Path):
+    store = OverlayStore()
+    cache = FileCache(overlays=store)
+    path = overlay_project / "module.py"
+    disk_sha = cache.get_sha256(path)
+
+    store.open(path, "x = 'unsaved'\n")
+    assert cache.get_text(path) == "x = 'unsaved'\n"
+    assert cache.get_bytes(path) == b"x = 'unsaved'\n"
+    assert cache.get_sha256(path) != disk_sha
+
+    store.close(path)
+    assert cache.get_text(path) == "def on_disk():\n    pass\n"
+    assert cache.get_sha256(path) == disk_sha
+
+def test_file_cache_overlay_without_file(overlay_project: Path):
+    store = OverlayStore()
+    cache = FileCache(overlays=store)
+    path = overlay_project / "new_module.py"
+
+    assert not cache.exists(path)
+    store.open(path, "y = 1\n")
+    assert cache.exists(path)
+    assert cache.get_text(path) == "y = 1\n"
+
+def test_project_index_overlay_lifecycle(overlay_project: Path):
+    indexer = ProjectIndex(overlay_project)
+    indexer.build()
+    uri = (overlay_project / "module.py").as_uri()
+    assert "on_disk" in indexer.defs_by_name
+
+    indexer.open_document(uri, "def in_memory():\n    pass\n")
+    assert "on_disk" not in indexer.defs_by_name
+    assert "in_memory" in indexer.defs_by_name
+    # The file on disk is untouched
+    assert "on_disk" in (overlay_project / "module.py").read_text()
+
+    overlay = indexer.update_document(uri, "def edited():\n    pass\n")
+    assert overlay.version == 1
+    assert "edited" in indexer.defs_by_name
+
+    assert indexer.close_document(uri)
+    assert "on_disk" in indexer.defs_by_name
+    assert not indexer.close_document(uri)
+
+def test_project_index_build_includes_unsaved_documents(overlay_project: Path):
+    indexer = ProjectIndex(overlay_project)
+    uri = (overlay_project / "unsaved.py").as_uri()
+    indexer.open_document(uri, "class Unsaved:\n    pass\n")
+
+    indexer.build()
+    assert uri in indexer.modules
+    assert "Unsaved" in indexer.defs_by_name
@@ -0,0 +1,51 @@
+# tests/test_pagination.py
+
+import pytest
+
+from mcp_pytools.tools import pagination
+from mcp_pytools.tools.pagination import paginate
+
+
+def test_paginate_stops_searching_when_page_is_full():
+    searched = []
+
+    def find(source):
+        searched.append(source)
+        return [f"{source}{i}" for i in range(3)]
+
+    page = paginate(["a", "b", "c", "d"], find, {"limit": 4})
+    assert page["results"] == ["a0", "a1", "a2", "b0"]
+    assert page["truncated"]
+    assert searched == ["a", "b"]
+
+    searched.clear()
+    page = paginate(["a", "b", "c", "d"], find, {"limit": 4, "cursor": page["next_cursor"]})
+    assert page["results"] == ["b1", "b2", "c0", "c1"]
+    assert searched == ["b", "c"]
+
+    page = paginate(["a", "b", "c", "d"], find, {"limit": 4, "cursor": page["next_cursor"]})
+    assert page == {"results": ["c2", "d0", "d1", "d2"], "truncated": False, "next_cursor": None}
+
+
+def test_paginate_caps_unpaged_results(monkeypatch):
+    monkeypatch.setattr(pagination, "DEFAULT_MAX_RESULTS", 2)
+
+    assert paginate(["a"], lambda s: [1, 2], {}) == [1, 2]
+    page = paginate(["a"], lambda s: [1, 2, 3], {})
+    assert page["results"] == [1, 2]
+    assert page["truncated"]
+
+    with pytest.raises(ValueError):
+        paginate(["a"], lambda s: [1], {"cursor": "not a cursor"})
+
+
+def test_paginate_rejects_cursors_of_other_queries():
+    sources = ["a", "b"]
+    page = paginate(sources, lambda s: [1, 2], {"query": "x", "limit": 1})
+    cursor = page["next_cursor"]
+
+    assert paginate(sources, lambda s: [1, 2], {"query": "x", "limit": 3, "cursor": cursor})
+    with pytest.raises(ValueError, match="another query"):
+        paginate(sources, lambda s: [1, 2], {"query": "y", "limit": 1, "cursor": cursor})
+    with pytest.raises(ValueError, match="another query"):
+        paginate(["new", *sources], lambda s: [1, 2], {"query": "x", "cursor": cursor})
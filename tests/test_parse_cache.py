@@ -0,0 +1,65 @@
+# tests/test_parse_cache.py
+
+from pathlib import Path
+
+import pytest
+
+from mcp_pytools.astutils.incremental import TextEdit
+from mcp_pytools.astutils.parse_cache import ParseCache
+from mcp_pytools.astutils.parser import Position, Range, StructuredSyntaxError
+from mcp_pytools.index.project import ProjectIndex
+
+
+def test_parse_cache_shares_identical_content():
+    cache = ParseCache()
+    first = cache.parse("x = 1\n", "file:///a.py")
+    second = cache.parse("x = 1\n", "file:///b.py")
+
+    assert second.tree is first.tree
+    assert second.uri == "file:///b.py"
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+    cache.parse("x = 2\n", "file:///a.py")
+    assert cache.stats.misses == 2
+
+
+def test_parse_cache_caches_syntax_errors():
+    cache = ParseCache()
+    with pytest.raises(StructuredSyntaxError):
+        cache.parse("x = \n", "file:///a.py")
+    with pytest.raises(StructuredSyntaxError) as excinfo:
+        cache.parse("x = \n", "file:///b.py")
+
+    assert excinfo.value.filename == "file:///b.py"
+    assert excinfo.value.lineno == 1
+    assert cache.stats.hits == 1
+
+
+def test_parse_cache_evicts_least_recently_used():
+    cache = ParseCache(maxsize=1)
+    first = cache.parse("x = 1\n", "file:///a.py")
+    cache.parse("x = 2\n", "file:///a.py")
+
+    assert cache.parse("x = 1\n", "file:///a.py").tree is not first.tree
+    assert cache.stats.evictions == 2
+
+
+def test_editing_open_document_leaves_shared_trees_alone(tmp_path: Path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("x = 1\n")
+    indexer = ProjectIndex(tmp_path)
+    indexer.build()
+    a = (tmp_path / "a.py").as_uri()
+    b = (tmp_path / "b.py").as_uri()
+    assert indexer.modules[a].tree is indexer.modules[b].tree
+
+    indexer.open_document(a, "x = 1\n")
+    edit = TextEdit(
+        range=Range(start=Position(line=0, column=0), end=Position(line=0, column=1)),
+        new_text="y",
+    )
+    indexer.apply_edits(a, [edit])
+
+    assert indexer.modules[a].tree.body[0].targets[0].id == "y"
+    assert indexer.modules[b].tree.body[0].targets[0].id == "x"
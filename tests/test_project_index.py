@@ -4,6 +4,10 @@ from pathlib import Path
 
 import pytest
 
+from mcp_pytools.astutils.incremental import TextEdit
+from mcp_pytools.astutils.parser import Position, Range
+from mcp_pytools.index.edit_journal import EditConflictError
+from mcp_pytools.index.memory import estimate_memory
 from mcp_pytools.index.project import ProjectIndex
 
 
@@ -87,3 +91,193 @@ def test_project_index_rebuild(sample_project: Path):
     assert "MyClass" not in indexer.defs_by_name
     assert "NewClass" in indexer.defs_by_name
     assert len(indexer.defs_by_name["NewClass"]) == 1
+
+
+def test_project_index_apply_edits(sample_project: Path):
+    """Tests that ranged edits update only the touched entries of the index."""
+    indexer = ProjectIndex(sample_project)
+    indexer.build()
+    module2_uri = (sample_project / "module2.py").as_uri()
+    indexer.open_document(module2_uri, (sample_project / "module2.py").read_text())
+    my_func = indexer.defs_by_name["my_func"][0]
+
+    # Insert a new function before my_func, shifting it down two lines
+    overlay = indexer.apply_edits(
+        module2_uri,
+        [
+            TextEdit(
+                range=Range(start=Position(line=2, column=0), end=Position(line=2, column=0)),
+                new_text="def helper():\n    import os\n",
+            )
+        ],
+    )
+
+    assert overlay.text.startswith("\nfrom module1 import MyClass\ndef helper():")
+    assert [s.range.start.line for s in indexer.defs_by_name["my_func"]] == [5]
+    # Symbols of older generations are left as they were
+    assert my_func.range.start.line == 3
+    assert "helper" in indexer.defs_by_name
+    assert [e.imported_name for e in indexer.imports[module2_uri]] == [
+        "module1.MyClass",
+        "os",
+    ]
+
+    # The incremental result matches a fresh index of the same content
+    fresh = ProjectIndex(sample_project)
+    fresh.open_document(module2_uri, overlay.text)
+    assert indexer.symbols[module2_uri] == fresh.symbols[module2_uri]
+    assert indexer.imports[module2_uri] == fresh.imports[module2_uri]
+
+
+def test_project_index_apply_edits_falls_back_to_full_parse(sample_project: Path):
+    """Tests that edits which cannot be re-parsed locally re-index the file."""
+    indexer = ProjectIndex(sample_project)
+    indexer.build()
+    module1_uri = (sample_project / "module1.py").as_uri()
+    indexer.open_document(module1_uri, (sample_project / "module1.py").read_text())
+
+    edit_range = Range(start=Position(line=1, column=0), end=Position(line=1, column=0))
+    indexer.apply_edits(module1_uri, [TextEdit(range=edit_range, new_text="x = (\n")])
+    assert module1_uri not in indexer.modules
+
+    indexer.apply_edits(module1_uri, [TextEdit(range=edit_range, new_text="y = 1\n")])
+    assert module1_uri not in indexer.modules
+    closing_range = Range(start=Position(line=2, column=5), end=Position(line=2, column=5))
+    indexer.apply_edits(module1_uri, [TextEdit(range=closing_range, new_text=")")])
+    assert module1_uri in indexer.modules
+    assert "MyClass" in indexer.defs_by_name
+
+
+def test_project_index_apply_edits_requires_open_document(sample_project: Path):
+    indexer = ProjectIndex(sample_project)
+    indexer.build()
+
+    with pytest.raises(KeyError):
+        indexer.apply_edits((sample_project / "module1.py").as_uri(), [])
+
+
+def test_project_index_identifier_postings(sample_project: Path):
+    indexer = ProjectIndex(sample_project)
+    indexer.build()
+    module1 = (sample_project / "module1.py").as_uri()
+    module2 = (sample_project / "module2.py").as_uri()
+
+    assert indexer.uris_with_identifier("MyClass") == sorted([module1, module2])
+    assert indexer.uris_with_identifier("my_func") == [module2]
+
+    (sample_project / "module2.py").write_text("def renamed():\n    pass\n")
+    indexer.rebuild(module2)
+    assert indexer.uris_with_identifier("MyClass") == [module1]
+    assert indexer.uris_with_identifier("my_func") == []
+    assert indexer.uris_with_identifier("renamed") == [module2]
+
+
+def test_project_index_apply_edits_updates_identifier_postings(sample_project: Path):
+    indexer = ProjectIndex(sample_project)
+    indexer.build()
+    module2 = (sample_project / "module2.py").as_uri()
+    indexer.open_document(module2, (sample_project / "module2.py").read_text())
+
+    def edit(line, start, end, text):
+        edit_range = Range(
+            start=Position(line=line, column=start), end=Position(line=line, column=end)
+        )
+        indexer.apply_edits(module2, [TextEdit(range=edit_range, new_text=text)])
+
+    edit(4, 11, 20, "MyClass(helper)")
+    assert indexer.uris_with_identifier("helper") == [module2]
+
+    # MyClass still occurs in the import, outside the edited block
+    edit(4, 11, 26, "helper")
+    assert module2 in indexer.uris_with_identifier("MyClass")
+    edit(4, 11, 17, "other")
+    assert indexer.uris_with_identifier("helper") == []
+    assert indexer.uris_with_identifier("other") == [module2]
+
+
+def test_project_index_apply_changes_and_undo(sample_project: Path):
+    indexer = ProjectIndex(sample_project)
+    indexer.build()
+    module1 = (sample_project / "module1.py").as_uri()
+    module2 = (sample_project / "module2.py").as_uri()
+    original = (sample_project / "module1.py").read_text()
+    indexer.open_document(module2, "def opened():\n    pass\n")
+
+    transaction = indexer.apply_changes(
+        {module1: "class Renamed:\n    pass\n", module2: "def edited():\n    pass\n"}
+    )
+    assert "Renamed" in (sample_project / "module1.py").read_text()
+    assert "edited" not in (sample_project / "module2.py").read_text()
+    assert indexer.defs_by_name["Renamed"] == indexer.symbols[module1]
+    assert "MyClass" not in indexer.defs_by_name
+    assert [s.name for s in indexer.symbols[module2]] == ["edited"]
+
+    undone = indexer.undo()
+    assert undone.id == transaction.id
+    assert (sample_project / "module1.py").read_text() == original
+    assert [s.name for s in indexer.symbols[module2]] == ["opened"]
+    assert "Renamed" not in indexer.defs_by_name
+    with pytest.raises(KeyError):
+        indexer.undo()
+
+
+def test_project_index_undo_refuses_changed_documents(sample_project: Path):
+    indexer = ProjectIndex(sample_project)
+    indexer.build()
+    module1 = (sample_project / "module1.py").as_uri()
+    indexer.apply_changes({module1: "class Renamed:\n    pass\n"})
+    (sample_project / "module1.py").write_text("class Other:\n    pass\n")
+
+    with pytest.raises(EditConflictError):
+        indexer.undo()
+    assert "Other" in (sample_project / "module1.py").read_text()
+
+    indexer.undo(force=True)
+    assert "MyClass" in (sample_project / "module1.py").read_text()
+
+
+def test_project_index_compact_mode(sample_project: Path):
+    indexer = ProjectIndex(sample_project, compact=True)
+    indexer.build()
+    module1 = (sample_project / "module1.py").as_uri()
+    module2 = (sample_project / "module2.py").as_uri()
+
+    assert indexer.modules.resident_count() == 0
+    assert module1 in indexer.modules
+    assert indexer.modules[module1].tree.body[0].name == "MyClass"
+    assert indexer.modules.text(module1) == (sample_project / "module1.py").read_text()
+
+    # Open documents keep their trees, which incremental edits change in place
+    indexer.open_document(module2, "def my_func():\n    pass\n")
+    assert indexer.modules.resident_count() == 1
+    indexer.apply_edits(
+        module2,
+        [
+            TextEdit(
+                range=Range(start=Position(line=0, column=4), end=Position(line=0, column=11)),
+                new_text="renamed",
+            )
+        ],
+    )
+    assert indexer.modules[module2].tree.body[0].name == "renamed"
+    indexer.close_document(module2)
+    assert indexer.modules.resident_count() == 0
+
+
+def test_project_index_build_stats(sample_project: Path):
+    indexer = ProjectIndex(sample_project)
+    assert indexer.build_progress() is None
+    indexer.build()
+
+    stats = indexer.stats.to_dict()
+    assert stats["build_seconds"] > 0
+    assert stats["files_per_second"] > 0
+    assert set(stats["phases"]) == {"walk", "read", "parse", "symbols", "imports", "cross_maps"}
+    assert stats["phases"]["parse"]["wall_seconds"] > 0
+    assert indexer.build_progress() is None
+
+    memory = estimate_memory(indexer)
+    assert memory["syntax_trees"] > 0
+    assert memory["text"] > 0
+    assert memory["symbols"] > 0
+    assert estimate_memory(ProjectIndex(sample_project))["symbols"] == 0
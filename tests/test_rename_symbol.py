@@ -1,9 +1,15 @@
+import asyncio
+import threading
 from pathlib import Path
 
 import pytest
 
+from mcp_pytools.analysis.rename import RenameEngine
+from mcp_pytools.index import project
 from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.tools.find_references import FindReferencesTool
 from mcp_pytools.tools.rename_symbol import RenameSymbolTool
+from mcp_pytools.tools.undo_edit import UndoEditTool
 
 from .helpers import MockToolContext
 
@@ -316,3 +322,204 @@ async def test_rename_symbol_preserves_formatting(tmp_path: Path):
 
     assert result.get("status") == "ok"
     assert (root / "module.py").read_text() == expected_content
+
+
+@pytest.fixture
+def scoped_project(tmp_path: Path) -> Path:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("from .core import helper\n")
+    (tmp_path / "pkg" / "core.py").write_text(
+        "def helper(value):\n"
+        "    return value\n"
+        "\n"
+        "\n"
+        "class Store:\n"
+        "    def get(self):\n"
+        "        return helper(self)\n"
+        "\n"
+        "    def again(self):\n"
+        "        return self.get()\n"
+    )
+    (tmp_path / "app.py").write_text(
+        "import pkg.core\n"
+        "from pkg import helper as h\n"
+        "from pkg.core import Store\n"
+        "\n"
+        "\n"
+        "def run(helper):\n"
+        "    store = Store()\n"
+        "    return helper, h(1), pkg.core.helper(2), store.get(), {}.get(1)\n"
+        "\n"
+        "\n"
+        "def other(thing):\n"
+        "    return thing.get()\n"
+    )
+    return tmp_path
+
+
+@pytest.mark.anyio
+async def test_rename_symbol_is_scope_aware(scoped_project: Path):
+    root = scoped_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = RenameSymbolTool()
+
+    result = await tool.handle(
+        context, uri=(root / "pkg" / "core.py").as_uri(), old_name="helper", new_name="assist",
+        apply=True,
+    )
+
+    assert result["status"] == "ok"
+    assert (root / "pkg" / "__init__.py").read_text() == "from .core import assist\n"
+    assert "return assist(self)" in (root / "pkg" / "core.py").read_text()
+    app = (root / "app.py").read_text()
+    # The parameter named 'helper' is a different binding; the alias 'h' stays
+    assert "from pkg import assist as h\n" in app
+    assert "def run(helper):\n" in app
+    assert "return helper, h(1), pkg.core.assist(2)," in app
+    # The index was updated
+    assert "assist" in indexer.defs_by_name
+
+
+@pytest.mark.anyio
+async def test_rename_symbol_method_by_position(scoped_project: Path):
+    root = scoped_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = RenameSymbolTool()
+    app_uri = (root / "app.py").as_uri()
+
+    # 'get' in 'store.get()' of app.py
+    result = await tool.handle(context, uri=app_uri, line=7, column=52, new_name="fetch")
+
+    changes = result["edit"]["changes"]
+    core_uri = (root / "pkg" / "core.py").as_uri()
+    assert [e["range"]["start"] for e in changes[core_uri]] == [
+        {"line": 5, "column": 8},
+        {"line": 9, "column": 20},
+    ]
+    assert [e["range"]["start"] for e in changes[app_uri]] == [{"line": 7, "column": 51}]
+    # 'thing.get()' may or may not be a Store, so it is only reported
+    assert result["unresolved"] == [
+        {"uri": app_uri, "range": {"start": {"line": 11, "column": 17},
+                                   "end": {"line": 11, "column": 20}}}
+    ]
+
+
+@pytest.mark.anyio
+async def test_rename_symbol_apply_can_be_undone(rename_project: Path):
+    root = rename_project
+    originals = {path: path.read_text() for path in root.glob("*.py")}
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+
+    result = await RenameSymbolTool().handle(
+        context, old_name="my_function", new_name="renamed", apply=True
+    )
+    assert result["status"] == "ok"
+    assert "renamed" in indexer.defs_by_name
+
+    undone = await UndoEditTool().handle(context, transaction_id=result["transaction_id"])
+    assert undone["status"] == "ok"
+    assert {path: path.read_text() for path in root.glob("*.py")} == originals
+    assert "renamed" not in indexer.defs_by_name
+    assert "my_function" in indexer.defs_by_name
+
+    result = await UndoEditTool().handle(context)
+    assert "error" in result
+
+
+@pytest.mark.anyio
+async def test_rename_symbol_apply_after_file_changed_on_disk(tmp_path: Path):
+    (tmp_path / "module.py").write_text("def foo():\n    pass\n\nx = foo()\n")
+    indexer = ProjectIndex(tmp_path)
+    indexer.build()
+    context = MockToolContext(indexer)
+
+    # Not re-indexed: the index still has the old text
+    (tmp_path / "module.py").write_text("import os\n\ndef foo():\n    pass\n\nx = foo()\n")
+    result = await RenameSymbolTool().handle(
+        context, old_name="foo", new_name="bar", apply=True
+    )
+
+    assert result["status"] == "ok"
+    assert (tmp_path / "module.py").read_text() == (
+        "import os\n\ndef bar():\n    pass\n\nx = bar()\n"
+    )
+
+
+@pytest.mark.anyio
+async def test_rename_symbol_during_a_rebuild_sees_the_whole_project(
+    rename_project: Path, monkeypatch
+):
+    root = rename_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    references = await FindReferencesTool().handle(context, symbol="my_function")
+    dry_run = await RenameSymbolTool().handle(context, old_name="my_function", new_name="renamed")
+
+    # Would publish after every file, if the rebuild published partial generations
+    monkeypatch.setattr(project, "PUBLISH_INTERVAL", 0)
+    paused = threading.Event()
+    resume = threading.Event()
+    index_file = ProjectIndex._index_file
+    calls = []
+
+    def slow_index_file(self, snapshot, file_path):
+        calls.append(file_path)
+        if len(calls) == 2:
+            paused.set()
+            resume.wait(5)
+        index_file(self, snapshot, file_path)
+
+    planned = threading.Event()
+    plan = RenameEngine.plan
+
+    def planning(self, definition, new_name):
+        try:
+            return plan(self, definition, new_name)
+        finally:
+            planned.set()
+
+    monkeypatch.setattr(ProjectIndex, "_index_file", slow_index_file)
+    monkeypatch.setattr(RenameEngine, "plan", planning)
+    builder = threading.Thread(target=indexer.build)
+    builder.start()
+    applied = {}
+    try:
+        assert paused.wait(5)
+        assert indexer.snapshot().complete
+        assert await FindReferencesTool().handle(context, symbol="my_function") == references
+        result = await RenameSymbolTool().handle(
+            context, old_name="my_function", new_name="renamed"
+        )
+        assert result == dry_run
+
+        # Planned during the rebuild, applied once it finished
+        planned.clear()
+        renamer = threading.Thread(
+            target=lambda: applied.update(
+                asyncio.run(
+                    RenameSymbolTool().handle(
+                        context, old_name="my_function", new_name="renamed", apply=True
+                    )
+                )
+            )
+        )
+        renamer.start()
+        assert planned.wait(5)
+    finally:
+        resume.set()
+        builder.join()
+    renamer.join(5)
+
+    assert applied["status"] == "ok"
+    assert len(applied["modified_files"]) == 2
+    for name in ("module1.py", "module2.py"):
+        text = (root / name).read_text()
+        assert "renamed" in text
+        assert "my_function" not in text
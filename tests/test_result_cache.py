@@ -0,0 +1,35 @@
+# tests/test_result_cache.py
+
+from mcp_pytools.cache import ResultCache
+
+
+def test_result_cache_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+def test_result_cache_get_or_compute():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [1, 2, 3]
+
+    assert cache.get_or_compute(("key", 1), compute) == [1, 2, 3]
+    assert cache.get_or_compute(("key", 1), compute) == [1, 2, 3]
+    assert len(calls) == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+    cache.discard(("key", 1))
+    assert len(cache) == 0
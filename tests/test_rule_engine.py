@@ -0,0 +1,64 @@
+import ast
+from typing import Tuple, Type
+
+from mcp_pytools.astutils.parser import parse_module
+from mcp_pytools.tools.docstring_lints import MissingDocstringRule
+from mcp_pytools.tools.mutability_check import MutableDefaultRule
+from mcp_pytools.tools.rule_engine import LintRule, RuleContext, RuleEngine
+
+SOURCE = '''"""Module."""
+
+def outer(items=[]):
+    def _inner():
+        pass
+    return lambda: items
+
+class Thing:
+    """Documented."""
+'''
+
+
+class RecordingRule(LintRule):
+    def __init__(self, node_types: Tuple[Type[ast.AST], ...]):
+        self._node_types = node_types
+        self.seen = []
+
+    @property
+    def code(self) -> str:
+        return "recording"
+
+    @property
+    def node_types(self) -> Tuple[Type[ast.AST], ...]:
+        return self._node_types
+
+    def check(self, node: ast.AST, context: RuleContext) -> None:
+        self.seen.append(type(node).__name__)
+
+
+def test_rule_engine_dispatches_by_node_type():
+    module = parse_module(SOURCE, "file:///module.py")
+    functions = RecordingRule((ast.FunctionDef, ast.Lambda))
+    statements = RecordingRule((ast.stmt,))
+    engine = RuleEngine([functions, statements])
+
+    engine.run(module)
+
+    # Depth-first, in source order, like ast.NodeVisitor
+    assert functions.seen == ["FunctionDef", "FunctionDef", "Lambda"]
+    # Base classes match all their subclasses
+    assert statements.seen == [
+        "Expr", "FunctionDef", "FunctionDef", "Pass", "Return", "ClassDef", "Expr"
+    ]
+
+
+def test_rule_engine_runs_rules_in_one_pass():
+    module = parse_module(SOURCE, "file:///module.py")
+    engine = RuleEngine([MissingDocstringRule(), MutableDefaultRule()])
+
+    diagnostics = engine.run(module, ignore_private=True)
+
+    assert [d.message for d in diagnostics] == [
+        "Missing docstring for 'outer'",
+        "Mutable default argument",
+    ]
+    assert engine.version == "missing-docstring:1,mutable-default:1"
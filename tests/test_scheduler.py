@@ -0,0 +1,95 @@
+import threading
+from pathlib import Path
+
+from mcp_pytools.index.project import ProjectIndex
+
+
+def test_new_build_cancels_running_build(tmp_path: Path, monkeypatch):
+    for name in "abcd":
+        (tmp_path / f"{name}.py").write_text(f"{name} = 1\n")
+    indexer = ProjectIndex(tmp_path)
+    started = threading.Event()
+    resume = threading.Event()
+    index_file = ProjectIndex._index_file
+
+    def slow_index_file(self, snapshot, file_path):
+        started.set()
+        resume.wait(5)
+        index_file(self, snapshot, file_path)
+
+    monkeypatch.setattr(ProjectIndex, "_index_file", slow_index_file)
+    first = indexer.scheduler.request_build()
+    assert started.wait(5)
+    second = indexer.scheduler.request_build()
+    assert indexer.scheduler.status()["builds_queued"] == 1
+    resume.set()
+
+    first.result(timeout=5)
+    second.result(timeout=5)
+    status = indexer.scheduler.status()
+    assert status["builds_cancelled"] == 1
+    assert status["builds_queued"] == 0
+    assert indexer.snapshot().complete
+    assert len(indexer.modules) == 4
+
+
+def test_queued_files_are_rebuilt_in_one_batch(tmp_path: Path, monkeypatch):
+    uris = []
+    for name in "abcd":
+        (tmp_path / f"{name}.py").write_text(f"{name} = 1\n")
+        uris.append((tmp_path / f"{name}.py").as_uri())
+    indexer = ProjectIndex(tmp_path)
+    indexer.build()
+
+    batches = []
+    started = threading.Event()
+    resume = threading.Event()
+    rebuild_many = ProjectIndex.rebuild_many
+
+    def slow_rebuild_many(self, batch):
+        batches.append(list(batch))
+        started.set()
+        resume.wait(5)
+        rebuild_many(self, batch)
+
+    monkeypatch.setattr(ProjectIndex, "rebuild_many", slow_rebuild_many)
+    futures = [indexer.scheduler.request_rebuild([uris[0]])]
+    assert started.wait(5)
+    futures += [indexer.scheduler.request_rebuild([uri]) for uri in uris[1:] + uris[1:2]]
+    assert indexer.scheduler.status()["files_queued"] == 3
+    resume.set()
+
+    for future in futures:
+        future.result(timeout=5)
+    assert batches == [uris[:1], uris[1:]]
+
+
+def test_build_progress_estimates_remaining_time(tmp_path: Path, monkeypatch):
+    for name in "abcd":
+        (tmp_path / f"{name}.py").write_text(f"{name} = 1\n")
+    indexer = ProjectIndex(tmp_path)
+    second_file = threading.Event()
+    resume = threading.Event()
+    index_file = ProjectIndex._index_file
+    calls = []
+
+    def slow_index_file(self, snapshot, file_path):
+        calls.append(file_path)
+        if len(calls) == 2:
+            second_file.set()
+            resume.wait(5)
+        index_file(self, snapshot, file_path)
+
+    monkeypatch.setattr(ProjectIndex, "_index_file", slow_index_file)
+    future = indexer.scheduler.request_build()
+    try:
+        assert second_file.wait(5)
+        progress = indexer.build_progress()
+        assert progress["files_total"] == 4
+        assert progress["files_done"] == 1
+        assert progress["percent"] == 25.0
+        assert progress["eta_seconds"] > 0
+    finally:
+        resume.set()
+        future.result(timeout=5)
+    assert indexer.build_progress() is None
@@ -0,0 +1,61 @@
+from mcp_pytools.analysis.scopes import BindingKey, analyze_scopes
+from mcp_pytools.astutils.parser import parse_module
+
+
+def _bindings(text: str, name: str):
+    scopes = analyze_scopes(parse_module(text, "file:///module.py"))
+    return [
+        (o.range.start.line, o.range.start.column, o.binding.scope, o.is_definition)
+        for o in scopes.occurrences
+        if o.name == name
+    ]
+
+
+def test_function_locals_shadow_globals():
+    text = "x = 1\ndef f(x):\n    return x\ndef g():\n    return x\n"
+    assert _bindings(text, "x") == [
+        (0, 0, (), True),
+        (1, 6, ("f:2:0",), True),
+        (2, 11, ("f:2:0",), False),
+        (4, 11, (), False),
+    ]
+
+
+def test_global_nonlocal_and_comprehensions():
+    text = (
+        "def f():\n"
+        "    global y\n"
+        "    y = 1\n"
+        "    z = 2\n"
+        "    def g():\n"
+        "        nonlocal z\n"
+        "        return [z for z in range(z)]\n"
+    )
+    assert _bindings(text, "y") == [(1, 11, (), False), (2, 4, (), True)]
+    assert _bindings(text, "z") == [
+        (3, 4, ("f:1:0",), True),
+        (5, 17, ("f:1:0",), False),
+        (6, 33, ("f:1:0",), False),
+        (6, 22, ("f:1:0", "g:5:4", "listcomp:7:15"), True),
+        (6, 16, ("f:1:0", "g:5:4", "listcomp:7:15"), False),
+    ]
+
+
+def test_class_scope_and_self():
+    text = "class C:\n    x = 1\n    def m(self):\n        return self.x, x\n"
+    scopes = analyze_scopes(parse_module(text, "file:///module.py"))
+    assert _bindings(text, "x") == [(1, 4, ("C:1:0",), True), (3, 23, (), False)]
+    assert scopes.class_scopes == {BindingKey((), "C"): ("C:1:0",)}
+    assert scopes.self_bindings == {BindingKey(("C:1:0", "m:3:4"), "self"): ("C:1:0",)}
+    (attribute,) = scopes.attributes
+    assert (attribute.range.start.column, attribute.range.end.column) == (20, 21)
+
+
+def test_import_tokens():
+    text = "import os.path as osp\nfrom .mod import a as b, c\n"
+    scopes = analyze_scopes(parse_module(text, "file:///module.py"))
+    b = scopes.imports[BindingKey((), "b")]
+    assert (b.module, b.level, b.member) == ("mod", 1, "a")
+    assert b.member_range.start.column == 17
+    assert _bindings(text, "b") == [(1, 22, (), True)]
+    assert scopes.imports[BindingKey((), "osp")].module == "os.path"
@@ -102,3 +102,57 @@ async def test_search_text_tool_no_match(search_text_project: Path):
     matches = await tool.handle(context, pattern=r"non_existent_pattern")
 
     assert len(matches) == 0
+
+@pytest.fixture
+def large_file_project(tmp_path: Path) -> Path:
+    """Creates a project with a file searched through the mmap path."""
+    lines = [f"value_{i} = {i}" for i in range(200)]
+    lines[57] = "café = 'needle'  # needle again"
+    lines[150] = "needle_end = 1"
+    (tmp_path / "big.py").write_text("\n".join(lines) + "\n")
+    (tmp_path / "formfeed.py").write_text("a = 1\n\x0c\nneedle = 2\n")
+    return tmp_path
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "pattern", [r"needle", r"again$", r"^needle_\w+", r"= 'needle'", r"value_1[0-9]+ "]
+)
+async def test_search_text_buffer_path_matches_text_path(
+    large_file_project: Path, pattern: str
+):
+    root = large_file_project
+    indexer = ProjectIndex(root)
+    context = MockToolContext(indexer)
+    tool = SearchTextTool()
+
+    expected = await tool.handle(context, pattern=pattern)
+
+    mapped_indexer = ProjectIndex(root)
+    mapped_indexer.file_cache.mmap_threshold = 1
+    mapped_context = MockToolContext(mapped_indexer)
+    actual = await tool.handle(mapped_context, pattern=pattern)
+
+    assert actual == expected
+    assert len(actual) > 0
+    # The mapped scan never copies the whole file into the cache.
+    assert mapped_indexer.file_cache.stat(root / "big.py")._content_bytes is None
+
+@pytest.mark.anyio
+async def test_search_text_tool_compact_format(search_text_project: Path):
+    root = search_text_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    tool = SearchTextTool()
+
+    plain = await tool.handle(context, pattern=r"function", fields=["uri", "range"])
+    assert all(set(match) == {"uri", "range"} for match in plain)
+
+    compact = await tool.handle(context, pattern=r"function|x", compact=True, limit=2)
+    assert compact["fields"] == ["uri", "range", "line"]
+    assert compact["truncated"]
+    uris = compact["uris"]
+    for uri_id, (start_line, start_column, end_line, end_column), line in compact["results"]:
+        assert uris[uri_id].endswith(".py") or uris[uri_id].endswith(".txt")
+        assert start_line == end_line
+        assert line[start_column:end_column] in ("function", "x")
@@ -0,0 +1,183 @@
+# tests/test_snapshot.py
+
+import ast
+import threading
+from pathlib import Path
+
+from mcp_pytools.analysis.imports import import_edges
+from mcp_pytools.analysis.symbols import document_symbols
+from mcp_pytools.astutils.incremental import TextEdit
+from mcp_pytools.astutils.parser import Position, Range, parse_module
+from mcp_pytools.index.layered_dict import LayeredDict
+from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.index.snapshot import IndexSnapshot
+
+
+def _index(snapshot: IndexSnapshot, uri: str, text: str):
+    module = parse_module(text, uri)
+    snapshot.set_file(uri, module, document_symbols(module), import_edges(module))
+
+
+def test_layered_dict_derive_is_independent():
+    base = LayeredDict({"a": 1, "b": 2})
+    base["c"] = 3
+    derived = base.derive()
+    derived["a"] = 10
+    del derived["b"]
+    derived["d"] = 4
+
+    assert dict(base) == {"a": 1, "b": 2, "c": 3}
+    assert dict(derived) == {"a": 10, "c": 3, "d": 4}
+    assert len(derived) == 3
+    assert "b" not in derived
+    assert derived.get("b", 0) == 0
+    assert dict(derived.derive()) == dict(derived)
+
+
+def test_derived_snapshot_copies_on_write():
+    base = IndexSnapshot()
+    _index(base, "file:///a.py", "def f():\n    pass\n")
+    _index(base, "file:///b.py", "def f():\n    pass\n")
+
+    derived = base.derive()
+    derived.remove_file("file:///a.py")
+    _index(derived, "file:///c.py", "print(f)\n")
+
+    assert derived.generation == base.generation + 1
+    assert len(base.defs_by_name["f"]) == 2
+    assert len(derived.defs_by_name["f"]) == 1
+    assert base.uris_with_identifier("f") == ["file:///a.py", "file:///b.py"]
+    assert derived.uris_with_identifier("f") == ["file:///b.py", "file:///c.py"]
+    assert "file:///a.py" in base.modules
+    assert "file:///a.py" not in derived.modules
+
+
+def test_pinned_reads_see_one_generation(tmp_path: Path):
+    (tmp_path / "a.py").write_text("def f():\n    pass\n")
+    indexer = ProjectIndex(tmp_path)
+    indexer.build()
+    uri = (tmp_path / "a.py").as_uri()
+
+    with indexer.pinned():
+        generation = indexer.generation
+
+        def write():
+            (tmp_path / "a.py").write_text("def g():\n    pass\n")
+            indexer.rebuild(uri)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        thread.join()
+
+        assert indexer.generation == generation
+        assert "f" in indexer.defs_by_name
+        assert "g" not in indexer.defs_by_name
+
+        # A context sees its own writes
+        indexer.invalidate(uri)
+        assert uri not in indexer.modules
+        assert "g" not in indexer.defs_by_name
+
+    assert indexer.generation == generation + 2
+
+
+def test_pinned_generation_keeps_its_tree_across_edits(tmp_path: Path):
+    text = "def f():\n    pass\n\n\nclass C:\n    x = 1\n"
+    (tmp_path / "a.py").write_text(text)
+    indexer = ProjectIndex(tmp_path)
+    indexer.build()
+    uri = (tmp_path / "a.py").as_uri()
+    indexer.open_document(uri, text)
+
+    def ranges(module):
+        return [
+            (node.lineno, getattr(node, "_range", None))
+            for node in ast.walk(module.tree)
+            if "lineno" in node._attributes
+        ]
+
+    result = {}
+
+    def edit():
+        # Adds a line to the first block, shifting the class down
+        edit_range = Range(start=Position(line=1, column=8), end=Position(line=1, column=8))
+        indexer.apply_edits(uri, [TextEdit(range=edit_range, new_text="\n    y = 2")])
+        result["module"] = indexer.modules[uri]
+
+    with indexer.pinned():
+        module = indexer.modules[uri]
+        dump, before = ast.dump(module.tree, include_attributes=True), ranges(module)
+
+        thread = threading.Thread(target=edit)
+        thread.start()
+        thread.join()
+
+        assert indexer.modules[uri] is module
+        assert module.text == text
+        assert ast.dump(module.tree, include_attributes=True) == dump
+        assert ranges(module) == before
+
+    edited = result["module"]
+    assert edited.tree is not module.tree
+    assert ranges(edited) == ranges(parse_module(edited.text, uri))
+
+
+def test_reads_do_not_wait_for_a_build(tmp_path: Path, monkeypatch):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_text("y = 2\n")
+    indexer = ProjectIndex(tmp_path)
+    indexer.build()
+
+    started = threading.Event()
+    resume = threading.Event()
+    index_file = ProjectIndex._index_file
+
+    def slow_index_file(self, snapshot, file_path):
+        started.set()
+        resume.wait(5)
+        index_file(self, snapshot, file_path)
+
+    monkeypatch.setattr(ProjectIndex, "_index_file", slow_index_file)
+    builder = threading.Thread(target=indexer.build)
+    builder.start()
+    try:
+        assert started.wait(5)
+        # The build holds the write lock, and has not indexed anything yet
+        assert len(indexer.modules) == 2
+        assert indexer.uris_with_identifier("y") == [(tmp_path / "b.py").as_uri()]
+    finally:
+        resume.set()
+        builder.join()
+    assert len(indexer.modules) == 2
+
+
+def test_build_indexes_requested_files_first(tmp_path: Path, monkeypatch):
+    for name in "abcdef":
+        (tmp_path / f"{name}.py").write_text(f"{name} = 1\n")
+    indexer = ProjectIndex(tmp_path)
+    resume = threading.Event()
+    index_file = ProjectIndex._index_file
+
+    def slow_index_file(self, snapshot, file_path):
+        if file_path.name != "f.py":
+            resume.wait(0.2)
+        index_file(self, snapshot, file_path)
+
+    monkeypatch.setattr(ProjectIndex, "_index_file", slow_index_file)
+    indexer.announce_build()
+    builder = threading.Thread(target=indexer.build)
+    builder.start()
+    try:
+        requested = (tmp_path / "f.py").as_uri()
+        assert indexer.ensure_indexed([requested], timeout=5)
+        with indexer.pinned() as snapshot:
+            assert not snapshot.complete
+            assert requested in indexer.modules
+            assert indexer.pending_count() >= 3
+    finally:
+        resume.set()
+        builder.join()
+
+    assert indexer.snapshot().complete
+    assert len(indexer.modules) == 6
+    assert indexer.ensure_indexed([(tmp_path / "a.py").as_uri()], timeout=0)
@@ -3,6 +3,7 @@ from pathlib import Path
 import pytest
 
 from mcp_pytools.index.project import ProjectIndex
+from mcp_pytools.tools import syntax_check
 from mcp_pytools.tools.syntax_check import SyntaxCheckTool
 
 from .helpers import MockToolContext
@@ -41,3 +42,51 @@ async def test_syntax_check_bad_file(syntax_check_project: Path):
     diagnostic = diagnostics[0]
     assert diagnostic['severity'] == 'ERROR'
     assert "invalid syntax" in diagnostic['message']
+
+
+@pytest.mark.anyio
+async def test_syntax_check_project(syntax_check_project: Path, monkeypatch):
+    root = syntax_check_project
+    (root / "pkg").mkdir()
+    (root / "pkg" / "worse.py").write_text("def f(:\n")
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    # Exercise the process pool even for a handful of files
+    monkeypatch.setattr(syntax_check, "_MIN_FILES_FOR_PROCESS_POOL", 1)
+
+    result = await SyntaxCheckTool().handle(context)
+
+    assert result["files_checked"] == 3
+    assert [f["uri"] for f in result["files"]] == [
+        (root / "bad_module.py").as_uri(),
+        (root / "pkg" / "worse.py").as_uri(),
+    ]
+    assert result["files"][1]["diagnostics"][0]["range"]["start"]["line"] == 0
+
+    result = await SyntaxCheckTool().handle(context, excludeGlobs=["*/pkg/*"])
+    assert [f["uri"] for f in result["files"]] == [(root / "bad_module.py").as_uri()]
+
+    result = await SyntaxCheckTool().handle(context, limit=1)
+    assert [f["uri"] for f in result["files"]] == [(root / "bad_module.py").as_uri()]
+    result = await SyntaxCheckTool().handle(context, limit=1, cursor=result["next_cursor"])
+    assert [f["uri"] for f in result["files"]] == [(root / "pkg" / "worse.py").as_uri()]
+    assert not result["truncated"]
+
+
+def test_check_syntax_many_reuses_results(syntax_check_project: Path):
+    root = syntax_check_project
+    indexer = ProjectIndex(root)
+    indexer.build()
+    context = MockToolContext(indexer)
+    good = (root / "good_module.py").as_uri()
+    bad = (root / "bad_module.py").as_uri()
+
+    results = syntax_check.check_syntax_many(context, [good, bad])
+    assert results[good] is None
+    assert results[bad][1:] == (2, 5)
+    # The indexed module proves the good file valid without a cache lookup
+    assert indexer.result_cache.stats.misses == 1
+
+    assert syntax_check.check_syntax_many(context, [bad]) == {bad: results[bad]}
+    assert indexer.result_cache.stats.hits == 1